@@ -0,0 +1,62 @@
+"""
+Benchmark DataFrame memory: default object columns vs compact (categorical) storage.
+
+Reports deep memory usage of the generated bulk sheet for each tier and checks
+that the CSV export is identical in both modes.
+Run from the repository root: python benchmarks/bench_memory.py [--rows 100000 1000000]
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+DEFAULT_ROWS = [100000, 1000000]
+SKU_COUNT = 10
+ROWS_PER_CAMPAIGN = 4  # Campaign, Ad Group, Product Ad, Keyword
+
+
+def make_job(rows: int):
+    """Deterministic synthetic keywords, SKUs and settings producing about `rows` rows"""
+    from amazon_bulk_generator.core.generator import CampaignSettings
+
+    keyword_count = max(1, rows // (SKU_COUNT * ROWS_PER_CAMPAIGN))
+    keywords = [f"keyword {i}" for i in range(keyword_count)]
+    skus = [f"SKU{i:05d}" for i in range(SKU_COUNT)]
+    settings = CampaignSettings(
+        daily_budget=10.0,
+        start_date=datetime.today() + timedelta(days=1),
+        match_types=['exact'],
+        bids={'exact': 0.75}
+    )
+    return keywords, skus, settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS)
+    parser.add_argument('--skip-export-check', action='store_true', help="Don't compare CSV exports")
+    args = parser.parse_args()
+
+    from amazon_bulk_generator.core.generator import BulkSheetGenerator
+
+    print(f"{'rows':>10} {'object MB':>10} {'compact MB':>11} {'reduction':>10} {'csv equal':>10}")
+    for rows in args.rows:
+        keywords, skus, settings = make_job(rows)
+        default_df = BulkSheetGenerator(engine='columnar').generate_bulk_sheet(keywords, skus, settings)
+        compact_df = BulkSheetGenerator(engine='columnar', compact_storage=True).generate_bulk_sheet(
+            keywords, skus, settings
+        )
+        default_mb = default_df.memory_usage(deep=True).sum() / 1024 / 1024
+        compact_mb = compact_df.memory_usage(deep=True).sum() / 1024 / 1024
+        csv_equal = (
+            'skipped' if args.skip_export_check
+            else str(default_df.to_csv(index=False) == compact_df.to_csv(index=False))
+        )
+        print(f"{len(default_df):>10} {default_mb:>10.1f} {compact_mb:>11.1f} "
+              f"{1 - compact_mb / default_mb:>10.1%} {csv_equal:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+"""
+Benchmark suite for the generation pipeline.
+
+Drives BulkSheetGenerator.generate_bulk_sheet, BulkSheetGenerator._format_dataframe,
+FileHandler._save_csv / _save_excel and every core.validators function across
+scale tiers with deterministic synthetic keywords and SKUs. Each case runs in a
+fresh subprocess and reports wall time of the measured call, peak RSS of the
+process, the peak RSS added by the measured call, and rows (or items) per second.
+
+Run from the repository root:
+
+    python benchmarks/bench_suite.py                          # 1k and 100k tiers, all cases
+    python benchmarks/bench_suite.py --tiers 1M 10M --cases generate save_csv --engine columnar
+    python benchmarks/bench_suite.py --save-baseline          # store results in benchmarks/baselines.json
+    python benchmarks/bench_suite.py --compare                # compare against the stored baselines
+
+With --compare the exit status is 1 if any case is slower or uses more memory
+than its baseline by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+TIERS = {'1k': 1000, '100k': 100000, '1M': 1000000, '10M': 10000000}
+DEFAULT_TIERS = ['1k', '100k']
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baselines.json'
+DEFAULT_TOLERANCE = 0.25
+
+SEED = 20250423
+SKU_COUNT = 10
+MATCH_TYPES = ['exact', 'phrase']
+ROWS_PER_CAMPAIGN = 4  # Campaign, Ad Group, Product Ad, Keyword
+START_DATE = date(2035, 1, 1)  # Fixed, and far enough ahead for validate_date
+EXCEL_MAX_DATA_ROWS = 1048575
+VOCABULARY = [
+    'wireless', 'gaming', 'keyboard', 'mouse', 'laptop', 'stand', 'usb', 'charger', 'cable', 'fast',
+    'portable', 'ergonomic', 'mechanical', 'rgb', 'office', 'desk', 'lamp', 'led', 'monitor', 'hub',
+    'bluetooth', 'speaker', 'headphones', 'noise', 'cancelling', 'kids', 'travel', 'case', 'cover', 'pro'
+]
+
+GENERATE_CASES = ['generate', 'format', 'save_csv', 'save_excel']
+VALIDATOR_CASES = [
+    'validate_keywords', 'validate_skus', 'validate_match_types', 'validate_name_template',
+    'validate_numeric_input', 'validate_date', 'validate_bid_adjustment', 'validate_campaign_settings'
+]
+ALL_CASES = GENERATE_CASES + VALIDATOR_CASES
+
+
+def make_keywords(count: int) -> list:
+    """Deterministic synthetic keywords of one to three vocabulary words"""
+    rng = random.Random(SEED)
+    return [f"{' '.join(rng.sample(VOCABULARY, rng.randint(1, 3)))} {i}" for i in range(count)]
+
+
+def make_skus(count: int) -> list:
+    """Deterministic synthetic SKUs"""
+    rng = random.Random(SEED + 1)
+    return [f"SKU-{rng.randrange(16 ** 6):06X}-{i:03d}" for i in range(count)]
+
+
+def make_job(rows: int):
+    """Deterministic synthetic keywords, SKUs and settings producing about `rows` rows"""
+    from amazon_bulk_generator.core.generator import CampaignSettings
+
+    keywords = make_keywords(max(1, rows // (SKU_COUNT * len(MATCH_TYPES) * ROWS_PER_CAMPAIGN)))
+    skus = make_skus(SKU_COUNT)
+    settings = CampaignSettings(
+        daily_budget=10.0,
+        start_date=START_DATE,
+        match_types=MATCH_TYPES,
+        bids={'exact': 0.75, 'phrase': 0.6},
+        campaign_name_template='SP_[SKU]_match_type_250423',
+        ad_group_name_template='AG_[SKU]_match_type'
+    )
+    return keywords, skus, settings
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(case: str, tier: str, engine: str) -> dict:
+    """Run one case in this process and return its measurements"""
+    import logging
+    logging.disable(logging.INFO)
+    from amazon_bulk_generator.core import validators
+    from amazon_bulk_generator.core.generator import BulkSheetGenerator
+    from amazon_bulk_generator.utils.file_handlers import FileHandler
+
+    keywords, skus, settings = make_job(TIERS[tier])
+    generator = BulkSheetGenerator(engine=engine)
+    output_dir = tempfile.mkdtemp()
+    # Validators get one input per tier row: the keyword/SKU lists or repeated calls
+    items, unit = TIERS[tier], 'items'
+    if case in ('validate_keywords', 'validate_skus'):
+        inputs = make_keywords(items) if case == 'validate_keywords' else make_skus(items)
+    if case == 'validate_name_template':
+        # validate_name_template is memoized; a distinct template per call measures
+        # validation itself rather than cache hits
+        templates = [f"{settings.campaign_name_template}_v{i}" for i in range(items)]
+    repeats = range(items)
+
+    # Setup: everything the measured call needs, outside the timed region
+    if case in GENERATE_CASES and case != 'generate':
+        df = generator.generate_bulk_sheet(keywords, skus, settings)
+        items, unit = len(df), 'rows'
+        if case == 'save_excel' and len(df) > EXCEL_MAX_DATA_ROWS:
+            return {'case': case, 'tier': tier, 'skipped': f'{len(df)} rows exceed the Excel sheet limit'}
+        if case == 'format':
+            for column in ('Daily Budget', 'Ad Group Default Bid', 'Bid'):
+                df[column] = df[column].astype(float)
+        handler = FileHandler(output_dir)
+
+    calls = {
+        'validate_keywords': lambda: validators.validate_keywords(inputs),
+        'validate_skus': lambda: validators.validate_skus(inputs),
+        'validate_match_types': lambda: [validators.validate_match_types(settings.match_types) for _ in repeats],
+        'validate_name_template': lambda: [
+            validators.validate_name_template(template, 'campaign') for template in templates
+        ],
+        'validate_numeric_input': lambda: [
+            validators.validate_numeric_input(settings.bids['exact'], 'Bid') for _ in repeats
+        ],
+        'validate_date': lambda: [validators.validate_date(settings.start_date) for _ in repeats],
+        'validate_bid_adjustment': lambda: [
+            validators.validate_bid_adjustment('50%', 'top-of-search') for _ in repeats
+        ],
+        'validate_campaign_settings': lambda: [validators.validate_campaign_settings(settings) for _ in repeats]
+    }
+
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    if case == 'generate':
+        items, unit = len(generator.generate_bulk_sheet(keywords, skus, settings)), 'rows'
+    elif case == 'format':
+        generator._format_dataframe(df)
+    elif case == 'save_csv':
+        handler._save_csv(df, output_dir, 'bench')
+    elif case == 'save_excel':
+        handler._save_excel(df, output_dir, 'bench')
+    else:
+        calls[case]()
+    elapsed = time.perf_counter() - start
+    rss_after = peak_rss_mb()
+
+    return {
+        'case': case,
+        'tier': tier,
+        'items': items,
+        'unit': unit,
+        'seconds': round(elapsed, 6),
+        'per_sec': round(items / elapsed) if elapsed else None,
+        'peak_rss_mb': round(rss_after, 1),
+        'added_rss_mb': round(rss_after - rss_before, 1)
+    }
+
+
+def environment() -> dict:
+    """Versions and machine the results were measured on"""
+    import numpy
+    import pandas
+    return {
+        'python': platform.python_version(),
+        'pandas': pandas.__version__,
+        'numpy': numpy.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count()
+    }
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    """Metrics of a result that regressed beyond the tolerance"""
+    regressions = []
+    for metric in ('seconds', 'peak_rss_mb'):
+        if baseline.get(metric) and result[metric] > baseline[metric] * (1 + tolerance):
+            regressions.append(f"{metric} {baseline[metric]} -> {result[metric]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tiers', nargs='+', choices=list(TIERS), default=DEFAULT_TIERS)
+    parser.add_argument('--cases', nargs='+', choices=ALL_CASES, default=ALL_CASES)
+    parser.add_argument('--engine', default='rows', help="BulkSheetGenerator engine (rows, columnar, parallel)")
+    parser.add_argument('--save-baseline', nargs='?', const=str(DEFAULT_BASELINE), metavar='PATH',
+                        help="Store the results as baselines (default: benchmarks/baselines.json)")
+    parser.add_argument('--compare', nargs='?', const=str(DEFAULT_BASELINE), metavar='PATH',
+                        help="Compare the results with stored baselines")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative slowdown / memory growth before a case counts as a regression")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON lines")
+    parser.add_argument('--case', nargs=3, metavar=('CASE', 'TIER', 'ENGINE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(*args.case)))
+        return
+
+    baselines = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baselines = json.load(f)['results']
+
+    results, regressions = {}, 0
+    if not args.json:
+        print(f"{'case':<28} {'tier':>5} {'items':>10} {'seconds':>9} {'per sec':>11} "
+              f"{'peak RSS MB':>12} {'added MB':>9}  baseline")
+    for tier in args.tiers:
+        for case in args.cases:
+            output = subprocess.run(
+                [sys.executable, __file__, '--case', case, tier, args.engine],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            key = f"{case}/{tier}/{args.engine}"
+            if args.json:
+                print(json.dumps(result))
+            if 'skipped' in result:
+                if not args.json:
+                    print(f"{case:<28} {tier:>5}  skipped: {result['skipped']}")
+                continue
+            results[key] = result
+
+            status = ''
+            if key in baselines:
+                failed = compare(result, baselines[key], args.tolerance)
+                regressions += bool(failed)
+                ratio = result['seconds'] / baselines[key]['seconds'] if baselines[key]['seconds'] else 1
+                status = f"{ratio:.2f}x" + (f"  REGRESSION: {'; '.join(failed)}" if failed else '')
+            elif args.compare:
+                status = 'no baseline'
+            if not args.json:
+                print(f"{case:<28} {tier:>5} {result['items']:>10} {result['seconds']:>9} "
+                      f"{result['per_sec']:>11} {result['peak_rss_mb']:>12} {result['added_rss_mb']:>9}  {status}")
+
+    if args.save_baseline:
+        stored = {'environment': environment(), 'results': {}}
+        if os.path.exists(args.save_baseline):
+            with open(args.save_baseline) as f:
+                stored['results'] = json.load(f).get('results', {})
+        stored['results'].update(results)
+        with open(args.save_baseline, 'w') as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Saved {len(results)} baselines to {args.save_baseline}")
+
+    if args.compare and regressions:
+        print(f"{regressions} case(s) regressed beyond {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark XLSX export: FileHandler._save_excel vs the streaming XlsxBulkWriter path.
+
+Each case runs in a fresh subprocess so peak RSS is measured per case.
+Run from the repository root: python benchmarks/bench_xlsx.py [--rows 100000 1000000]
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+DEFAULT_ROWS = [100000, 1000000]
+SKU_COUNT = 10
+ROWS_PER_CAMPAIGN = 4  # Campaign, Ad Group, Product Ad, Keyword
+
+
+def make_job(rows: int):
+    """Deterministic synthetic keywords, SKUs and settings producing about `rows` rows"""
+    from amazon_bulk_generator.core.generator import CampaignSettings
+
+    keyword_count = max(1, rows // (SKU_COUNT * ROWS_PER_CAMPAIGN))
+    keywords = [f"keyword {i}" for i in range(keyword_count)]
+    skus = [f"SKU{i:05d}" for i in range(SKU_COUNT)]
+    settings = CampaignSettings(
+        daily_budget=10.0,
+        start_date=datetime.today() + timedelta(days=1),
+        match_types=['exact'],
+        bids={'exact': 0.75}
+    )
+    return keywords, skus, settings
+
+
+def run_case(mode: str, rows: int) -> dict:
+    """Run one export in this process and return its measurements"""
+    import logging
+    logging.disable(logging.INFO)
+    from amazon_bulk_generator.core.generator import BulkSheetGenerator
+    from amazon_bulk_generator.utils.file_handlers import FileHandler
+
+    keywords, skus, settings = make_job(rows)
+    generator = BulkSheetGenerator()
+    output_dir = tempfile.mkdtemp()
+    handler = FileHandler(output_dir)
+
+    start = time.perf_counter()
+    if mode == 'dataframe':
+        df = generator.generate_bulk_sheet(keywords, skus, settings)
+        row_count = len(df)
+        path = handler._save_excel(df, output_dir, 'bench')
+    else:
+        rows_iter = generator.iter_bulk_rows(keywords, skus, settings, chunk_size=10000)
+        path = handler._stream_excel(rows_iter, generator.headers, output_dir, 'bench')
+        row_count = None
+    elapsed = time.perf_counter() - start
+
+    return {
+        'mode': mode,
+        'rows': row_count or rows,
+        'seconds': round(elapsed, 3),
+        'rows_per_sec': round((row_count or rows) / elapsed),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'file_mb': round(os.path.getsize(path) / 1024 / 1024, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS)
+    parser.add_argument('--modes', nargs='+', default=['dataframe', 'streaming'])
+    parser.add_argument('--case', nargs=2, metavar=('MODE', 'ROWS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(args.case[0], int(args.case[1]))))
+        return
+
+    print(f"{'mode':<10} {'rows':>10} {'seconds':>9} {'rows/sec':>10} {'peak RSS MB':>12} {'file MB':>8}")
+    for rows in args.rows:
+        for mode in args.modes:
+            output = subprocess.run(
+                [sys.executable, __file__, '--case', mode, str(rows)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{result['mode']:<10} {result['rows']:>10} {result['seconds']:>9} "
+                  f"{result['rows_per_sec']:>10} {result['peak_rss_mb']:>12} {result['file_mb']:>8}")
+
+
+if __name__ == '__main__':
+    main()
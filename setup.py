@@ -12,9 +12,17 @@ setup(
     install_requires=[
         "streamlit>=1.31.0",
         "pandas>=2.0.0",
+        "numpy>=1.22.0",
         "openpyxl>=3.1.5",
+        "xlsxwriter>=3.0.0",
         "streamlit-aggrid==0.3.5",
         "python-decouple>=3.8",
     ],
+    extras_require={
+        # Parquet / Arrow IPC export and faster CSV parsing of keyword bid files
+        "arrow": ["pyarrow>=12.0.0"],
+        # Test suite (python -m pytest tests)
+        "test": ["pytest>=7.0.0"],
+    },
     python_requires=">=3.8",
 )
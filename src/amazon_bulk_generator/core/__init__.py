@@ -1,9 +1,14 @@
 """Core functionality for Amazon Bulk Campaign Generator"""
 
 from .generator import BulkSheetGenerator, CampaignSettings
+from .planner import JobLimits, JobPlan, JobTooLargeError
+from .validation_cache import IncrementalValidator, ValidationCache
 from .validators import (
+    ValidationReport,
     validate_keywords,
+    validate_keywords_batch,
     validate_skus,
+    validate_skus_batch,
     validate_campaign_settings,
     validate_name_template
 )
@@ -11,8 +16,16 @@ from .validators import (
 __all__ = [
     'BulkSheetGenerator',
     'CampaignSettings',
+    'JobLimits',
+    'JobPlan',
+    'JobTooLargeError',
+    'ValidationCache',
+    'IncrementalValidator',
+    'ValidationReport',
     'validate_keywords',
+    'validate_keywords_batch',
     'validate_skus',
+    'validate_skus_batch',
     'validate_campaign_settings',
     'validate_name_template'
 ]
@@ -0,0 +1,66 @@
+"""Per-job tables of values derived from the input keywords"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from .bids import KeywordBidTable, as_bid_table
+from .templates import clean_name_part, keyword_root
+from ..utils.formatters import DataFormatter
+
+
+@dataclass
+class KeywordArtifacts:
+    """Derived values for every input keyword, indexed by keyword position.
+
+    Built once per job so campaign rendering never re-cleans keywords or
+    re-resolves bids per (SKU group x match type) iteration.
+    """
+    keywords: np.ndarray  # Keyword text, in input order
+    identifiers: np.ndarray  # Cleaned keyword used in campaign IDs and names
+    roots: np.ndarray  # Cleaned first word of the keyword
+    match_types: List[str]  # Lowercased; columns of the bid tables
+    bids: np.ndarray  # Resolved bid per (keyword, match type), as floats
+    bid_strings: np.ndarray  # Bids formatted for the bulk sheet
+
+    @classmethod
+    def build(cls, keywords: List[str], match_types: List[str], default_bids: Dict[str, float],
+              keyword_bids: Union[None, Dict[str, float], KeywordBidTable] = None,
+              resolved_bids: Optional[np.ndarray] = None) -> 'KeywordArtifacts':
+        """
+        Build the table for one job
+
+        Args:
+            keywords: Keywords in input order
+            match_types: Match types of the job (any case)
+            default_bids: Default bid per lowercase match type
+            keyword_bids: Optional keyword-specific bids overriding the defaults, as a
+                dict (exact keyword match) or a KeywordBidTable
+            resolved_bids: Bids already resolved for these keywords and match types
+                (JobPlan.keyword_bids), used instead of resolving them again
+
+        Returns:
+            KeywordArtifacts with one row per keyword
+        """
+        match_types = [match_type.lower() for match_type in match_types]
+        n_keywords = len(keywords)
+
+        # One indexed join for the whole job instead of a lookup per keyword row
+        if resolved_bids is not None:
+            bids = resolved_bids
+        else:
+            bids = as_bid_table(keyword_bids).resolve(keywords, match_types, default_bids)
+        bid_strings = DataFormatter.format_amount_column(bids.ravel()).reshape(bids.shape)
+
+        return cls(
+            keywords=np.array(keywords, dtype=object).reshape(n_keywords),
+            identifiers=np.array([clean_name_part(keyword) for keyword in keywords], dtype=object).reshape(n_keywords),
+            roots=np.array([keyword_root(keyword) for keyword in keywords], dtype=object).reshape(n_keywords),
+            match_types=match_types,
+            bids=bids,
+            bid_strings=bid_strings
+        )
+
+    def match_type_index(self, match_type: str) -> int:
+        """Column of a match type in the bid tables"""
+        return self.match_types.index(match_type.lower())
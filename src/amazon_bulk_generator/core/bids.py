@@ -0,0 +1,510 @@
+"""
+Keyword-specific bids.
+
+A KeywordBidTable holds one bid column per match type (plus an optional
+column applying to every match type) aligned with a sorted array of 64-bit
+keyword hashes. A job resolves all of its bids with one vectorized join,
+keyword x match type -> bid, instead of a dictionary lookup per generated
+keyword row. The keywords themselves are kept next to the hashes as one
+UTF-8 byte buffer with per-row offsets, and every hash match is confirmed
+against them, so a hash collision can never apply another keyword's bid.
+
+Bid files are read with only the keyword and bid columns, bids typed as
+floats, using the pyarrow CSV reader when it is installed or in chunks
+otherwise. Cells are read as text first, so keywords such as 'NA', 'null' or
+'007' keep their text instead of being parsed as missing values or numbers. A parsed table can be saved as .npy arrays and reopened
+memory-mapped, so repeated jobs skip the CSV entirely.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from .bulk_index import normalize_keyword_column
+
+try:
+    import pyarrow
+    import pyarrow.csv
+except ImportError:  # pragma: no cover - optional, falls back to the C engine
+    pyarrow = None
+
+# Column key of bids that apply to every match type
+ANY_MATCH_TYPE = 'any'
+MATCH_TYPES = ['exact', 'phrase', 'broad']
+
+# Default keyword column of bid files (see BulkSheetGenerator.load_keyword_bids)
+KEYWORD_COLUMN = 'Keyword'
+
+# Rows per chunk when a bid file is read with the C engine
+DEFAULT_BID_CHUNK_ROWS = 1000000
+
+# Files of a saved table
+_META_FILE = 'meta.json'
+_HASHES_FILE = 'hashes.npy'
+_KEY_DATA_FILE = 'key_data.npy'
+_KEY_OFFSETS_FILE = 'key_offsets.npy'
+_KEY_ROWS_FILE = 'key_rows.npy'
+_CACHE_VERSION = 2
+
+
+def bid_column_match_type(column: str) -> Optional[str]:
+    """
+    Match type a bid file column holds bids for
+
+    Args:
+        column: Column header, e.g. 'Bid', 'Exact Bid', 'phrase_bid' or 'Broad'
+
+    Returns:
+        A lowercase match type, ANY_MATCH_TYPE for a plain 'Bid' column, or None
+        for columns that hold no bids
+    """
+    name = column.strip().lower().replace('_', ' ')
+    if name == 'bid':
+        return ANY_MATCH_TYPE
+    if name.endswith(' bid'):
+        name = name[:-len(' bid')].strip()
+    return name if name in MATCH_TYPES else None
+
+
+def match_keys(keywords: Iterable[str], normalize: bool = True) -> np.ndarray:
+    """
+    Keywords as compared by a KeywordBidTable
+
+    Args:
+        keywords: Keywords
+        normalize: Lowercase and collapse whitespace (case- and spacing-insensitive matching)
+
+    Returns:
+        Object array of strings
+    """
+    keywords = pd.Series(keywords, dtype=object)
+    keys = normalize_keyword_column(keywords) if normalize else keywords.astype(str)
+    return keys.to_numpy(dtype=object)
+
+
+def hash_keywords(keywords: Iterable[str], normalize: bool = True) -> np.ndarray:
+    """
+    64-bit hash of each keyword, as used to key a KeywordBidTable
+
+    Args:
+        keywords: Keywords
+        normalize: Hash the normalized keyword (case- and spacing-insensitive)
+
+    Returns:
+        uint64 array
+    """
+    return pd.util.hash_array(match_keys(keywords, normalize), categorize=False)
+
+
+def _encode_keys(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """UTF-8 bytes of all keys in one uint8 buffer, and the offset of each key (len(keys) + 1 offsets)"""
+    text = ''.join(keys)
+    data = text.encode('utf-8', 'surrogatepass')
+    if len(data) == len(text):
+        # ASCII only: byte lengths are the string lengths
+        lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+    else:
+        encoded = [key.encode('utf-8', 'surrogatepass') for key in keys]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return np.frombuffer(data, dtype=np.uint8), offsets
+
+
+def _bid_columns(header: Iterable[str], keyword_column: str) -> Dict[str, str]:
+    """Match type of each bid column in a header"""
+    columns = {}
+    for column in header:
+        match_type = bid_column_match_type(str(column)) if column != keyword_column else None
+        if match_type is not None:
+            columns[column] = match_type
+    return columns
+
+
+def read_text_columns(csv_path: str, columns: List[str]) -> pd.DataFrame:
+    """
+    Read columns of a CSV file as text, with the pyarrow CSV reader when it is installed
+
+    No cell is parsed as a missing value or a number: blank cells are '' and every
+    other cell keeps its text, the same as pandas' C engine with dtype=str and
+    keep_default_na=False.
+
+    Args:
+        csv_path: Path of the CSV file
+        columns: Columns to read
+
+    Returns:
+        DataFrame of the columns as object arrays of str
+    """
+    if pyarrow is None:
+        return pd.read_csv(csv_path, usecols=columns, dtype=str, keep_default_na=False)[columns]
+    convert_options = pyarrow.csv.ConvertOptions(
+        include_columns=columns, column_types={column: pyarrow.string() for column in columns},
+        strings_can_be_null=False, quoted_strings_can_be_null=False
+    )
+    table = pyarrow.csv.read_csv(csv_path, convert_options=convert_options)
+    return pd.DataFrame({column: table.column(column).to_numpy() for column in columns})
+
+
+def _chunk_arrays(chunk: pd.DataFrame, keyword_column: str, bid_columns: Dict[str, str],
+                  normalize: bool) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Match keys and float bid columns of a chunk, without rows that have no keyword or no bid at all"""
+    bids = {
+        match_type: pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        for column, match_type in bid_columns.items()
+    }
+    keep = ~np.logical_and.reduce([np.isnan(values) for values in bids.values()])
+    keywords = chunk[keyword_column].to_numpy(dtype=object)
+    keep &= pd.notna(keywords) & (keywords != '')
+    keywords = keywords[keep]
+    return match_keys(keywords, normalize), {key: values[keep] for key, values in bids.items()}
+
+
+class KeywordBidTable:
+    """Keyword bids indexed by keyword hash, one float column per match type"""
+
+    def __init__(self, keys: Iterable[str], columns: Dict[str, np.ndarray], normalize: bool = True):
+        """
+        Initialize KeywordBidTable
+
+        Args:
+            keys: Match key of each bid row (see match_keys)
+            columns: Float bid column per match type (or ANY_MATCH_TYPE), aligned with
+                keys; NaN means "no bid". For duplicate keywords the last row wins.
+            normalize: Whether the keys are normalized keywords; lookups compare the
+                same way
+        """
+        self.normalize = normalize
+        keys = np.asarray(keys, dtype=object)
+        hashes = pd.util.hash_array(keys, categorize=False)
+        # Sorted by hash; within equal hashes the later rows come first
+        reversed_rows = np.arange(len(keys))[::-1]
+        order = reversed_rows[np.argsort(hashes[reversed_rows], kind='stable')]
+        sorted_hashes = hashes[order]
+        keep = np.ones(len(order), dtype=bool)
+        run_keys, previous = set(), -2
+        # Runs of equal hashes are duplicate keywords (keep the last row) or, rarely, collisions
+        for position in np.flatnonzero(sorted_hashes[1:] == sorted_hashes[:-1]) + 1:
+            if position != previous + 1:
+                run_keys = {keys[order[position - 1]]}
+            key = keys[order[position]]
+            if key in run_keys:
+                keep[position] = False
+            run_keys.add(key)
+            previous = position
+        order = order[keep]
+
+        self.hashes = sorted_hashes[keep]
+        # Keys stay in input order; key_rows maps each sorted row to its key
+        self.key_data, self.key_offsets = _encode_keys(keys)
+        self.key_rows = order
+        self.columns = {key: np.asarray(values, dtype=float)[order] for key, values in columns.items()}
+
+    @classmethod
+    def _from_arrays(cls, hashes: np.ndarray, key_data: np.ndarray, key_offsets: np.ndarray, key_rows: np.ndarray,
+                     columns: Dict[str, np.ndarray], normalize: bool) -> 'KeywordBidTable':
+        """Table from already sorted and deduplicated arrays (a saved table)"""
+        table = cls.__new__(cls)
+        table.normalize = normalize
+        table.hashes = hashes
+        table.key_data = key_data
+        table.key_offsets = key_offsets
+        table.key_rows = key_rows
+        table.columns = columns
+        return table
+
+    @classmethod
+    def from_keywords(cls, keywords: Iterable[str], bids: Dict[str, Iterable], normalize: bool = True) -> 'KeywordBidTable':
+        """
+        Build a table from keyword and bid columns
+
+        Args:
+            keywords: Keyword of each bid row
+            bids: Bid column per match type (or ANY_MATCH_TYPE); empty and non-numeric
+                values mean "no bid", and rows without any bid are dropped
+            normalize: Match keywords case- and spacing-insensitively; otherwise
+                keywords must match exactly
+
+        Returns:
+            KeywordBidTable
+        """
+        frame = pd.DataFrame({'keyword': pd.Series(list(keywords), dtype=object)})
+        for key, values in bids.items():
+            frame[key] = pd.Series(list(values), dtype=object)
+        keys, columns = _chunk_arrays(frame, 'keyword', {key: key for key in bids}, normalize)
+        return cls(keys, columns, normalize)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, keyword_column: str = KEYWORD_COLUMN,
+                       normalize: bool = True) -> 'KeywordBidTable':
+        """
+        Build a table from a bid file DataFrame
+
+        Args:
+            df: Keyword column plus a 'Bid' column and/or per-match-type columns
+                ('Exact Bid', 'Phrase Bid', 'Broad Bid')
+            keyword_column: Name of the keyword column
+            normalize: See from_keywords
+
+        Returns:
+            KeywordBidTable
+
+        Raises:
+            ValueError: If the keyword column or every bid column is missing
+        """
+        if keyword_column not in df.columns:
+            raise ValueError(f"Bid table must contain a '{keyword_column}' column")
+        bid_columns = _bid_columns(df.columns, keyword_column)
+        if not bid_columns:
+            raise ValueError("Bid table must contain a 'Bid' column or per-match-type bid columns")
+        return cls.from_keywords(df[keyword_column], {match_type: df[column] for column, match_type in bid_columns.items()}, normalize)
+
+    @classmethod
+    def from_dict(cls, bids: Dict[str, float], normalize: bool = False) -> 'KeywordBidTable':
+        """Build a table from a keyword -> bid mapping (exact keyword matching by default)"""
+        # Job keywords are strings, so other keys could never match a dict lookup either
+        bids = {keyword: bid for keyword, bid in bids.items() if isinstance(keyword, str)}
+        return cls.from_keywords(list(bids.keys()), {ANY_MATCH_TYPE: list(bids.values())}, normalize)
+
+    @classmethod
+    def from_csv(cls, csv_path: str, keyword_column: str = KEYWORD_COLUMN, normalize: bool = True,
+                 chunk_rows: Optional[int] = None, cache_dir: Optional[str] = None) -> 'KeywordBidTable':
+        """
+        Build a table from a bid CSV file
+
+        Only the keyword and bid columns are read, as text (see read_text_columns),
+        with bids coerced to floats. Without chunk_rows the file is parsed by the
+        pyarrow CSV reader when it is installed; otherwise it is read in chunks of
+        chunk_rows rows (DEFAULT_BID_CHUNK_ROWS), and each chunk is reduced to
+        hashes and floats before the next one is read.
+
+        Args:
+            csv_path: Path of the CSV file
+            keyword_column: Name of the keyword column
+            normalize: See from_keywords
+            chunk_rows: Rows per chunk; forces chunked reading
+            cache_dir: Directory of a saved table. A table saved there from the same
+                file (same size and modification time) and options is reopened
+                memory-mapped instead of parsing the CSV; otherwise the parsed table
+                is saved there.
+
+        Returns:
+            KeywordBidTable
+
+        Raises:
+            ValueError: If the keyword column or every bid column is missing
+        """
+        if cache_dir is not None:
+            cached = cls.load(cache_dir, source=csv_path, keyword_column=keyword_column, normalize=normalize)
+            if cached is not None:
+                return cached
+
+        header = pd.read_csv(csv_path, nrows=0).columns
+        if keyword_column not in header:
+            raise ValueError(f"CSV must contain a '{keyword_column}' column")
+        bid_columns = _bid_columns(header, keyword_column)
+        if not bid_columns:
+            raise ValueError("CSV must contain a 'Bid' column or per-match-type bid columns")
+        usecols = [keyword_column] + list(bid_columns)
+
+        # Both branches read text and let _chunk_arrays coerce the bids (invalid bids become NaN)
+        if chunk_rows is None and pyarrow is not None:
+            df = read_text_columns(csv_path, usecols)
+            parts = [_chunk_arrays(df, keyword_column, bid_columns, normalize)]
+            del df
+        else:
+            reader = pd.read_csv(
+                csv_path, usecols=usecols, dtype=str, keep_default_na=False,
+                chunksize=chunk_rows or DEFAULT_BID_CHUNK_ROWS
+            )
+            with reader:
+                parts = [_chunk_arrays(chunk, keyword_column, bid_columns, normalize) for chunk in reader]
+
+        match_types = list(dict.fromkeys(bid_columns.values()))
+        keys = np.concatenate([part[0] for part in parts]) if parts else np.zeros(0, dtype=object)
+        columns = {
+            match_type: np.concatenate([part[1][match_type] for part in parts]) if parts else np.zeros(0)
+            for match_type in match_types
+        }
+        table = cls(keys, columns, normalize)
+        if cache_dir is not None:
+            table.save(cache_dir, source=csv_path, keyword_column=keyword_column)
+        return table
+
+    def save(self, directory: str, source: Optional[str] = None, keyword_column: str = KEYWORD_COLUMN) -> None:
+        """
+        Save the table as .npy arrays that load() can memory-map
+
+        Args:
+            directory: Target directory (created if missing)
+            source: CSV file the table was parsed from, recorded to detect changes
+            keyword_column: Keyword column of the source file
+        """
+        os.makedirs(directory, exist_ok=True)
+        # Removed first and written last: a table without meta.json is never loaded,
+        # so a save that fails halfway cannot pair old metadata with new arrays
+        meta_path = os.path.join(directory, _META_FILE)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        arrays = {
+            _HASHES_FILE: self.hashes,
+            _KEY_DATA_FILE: self.key_data,
+            _KEY_OFFSETS_FILE: self.key_offsets,
+            _KEY_ROWS_FILE: self.key_rows
+        }
+        arrays.update({f'{match_type}.npy': values for match_type, values in self.columns.items()})
+        for name, values in arrays.items():
+            _replace_file(os.path.join(directory, name), lambda f, values=values: np.save(f, values))
+        meta = {
+            'version': _CACHE_VERSION,
+            'normalize': self.normalize,
+            'keyword_column': keyword_column,
+            'columns': list(self.columns),
+            'rows': len(self.hashes),
+            'source': _source_signature(source) if source else None
+        }
+        _replace_file(meta_path, lambda f: f.write(json.dumps(meta).encode()))
+
+    @classmethod
+    def load(cls, directory: str, source: Optional[str] = None, keyword_column: str = KEYWORD_COLUMN,
+             normalize: Optional[bool] = None) -> Optional['KeywordBidTable']:
+        """
+        Reopen a saved table with memory-mapped arrays
+
+        Args:
+            directory: Directory passed to save()
+            source: When given, only load if the table was saved from this file unchanged
+            keyword_column: Only load if saved from this keyword column
+            normalize: Only load if saved with this normalize setting (any when None)
+
+        Returns:
+            KeywordBidTable, or None if there is no matching saved table
+        """
+        try:
+            with open(os.path.join(directory, _META_FILE)) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('version') != _CACHE_VERSION or meta.get('keyword_column') != keyword_column:
+            return None
+        if normalize is not None and meta.get('normalize') != normalize:
+            return None
+        if source is not None and meta.get('source') != _source_signature(source):
+            return None
+        try:
+            hashes, key_data, key_offsets, key_rows = (
+                np.load(os.path.join(directory, name), mmap_mode='r')
+                for name in (_HASHES_FILE, _KEY_DATA_FILE, _KEY_OFFSETS_FILE, _KEY_ROWS_FILE)
+            )
+            columns = {
+                match_type: np.load(os.path.join(directory, f'{match_type}.npy'), mmap_mode='r')
+                for match_type in meta['columns']
+            }
+        except (OSError, ValueError):
+            return None
+        if len(hashes) != meta['rows'] or len(key_rows) != len(hashes):
+            return None
+        return cls._from_arrays(hashes, key_data, key_offsets, key_rows, columns, meta['normalize'])
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def lookup(self, keywords: List[str]) -> np.ndarray:
+        """Row of each keyword in the table (-1 = no bid row)"""
+        keys = match_keys(keywords, self.normalize)
+        hashes = pd.util.hash_array(keys, categorize=False)
+        if not len(self.hashes):
+            return np.full(len(hashes), -1, dtype=np.int64)
+        rows = np.searchsorted(self.hashes, hashes).clip(max=len(self.hashes) - 1)
+        candidates = np.flatnonzero(self.hashes[rows] == hashes)
+        rows = np.full(len(hashes), -1, dtype=np.int64)
+        if not len(candidates):
+            return rows
+        encoded = [key.encode('utf-8', 'surrogatepass') for key in keys[candidates]]
+        table_rows = np.searchsorted(self.hashes, hashes[candidates])
+        equal = self._keys_equal(table_rows, encoded)
+        rows[candidates[equal]] = table_rows[equal]
+        # Same hash, different keyword: look through the other rows with that hash
+        for position in np.flatnonzero(~equal):
+            row = table_rows[position] + 1
+            while row < len(self.hashes) and self.hashes[row] == hashes[candidates[position]]:
+                if self._keys_equal(np.array([row]), [encoded[position]])[0]:
+                    rows[candidates[position]] = row
+                    break
+                row += 1
+        return rows
+
+    def _keys_equal(self, rows: np.ndarray, encoded: List[bytes]) -> np.ndarray:
+        """Whether the stored key of each table row equals the given UTF-8 key"""
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        key_rows = np.asarray(self.key_rows[rows])
+        starts = np.asarray(self.key_offsets[key_rows])
+        equal = (np.asarray(self.key_offsets[key_rows + 1]) - starts) == lengths
+        compared = np.flatnonzero(equal & (lengths > 0))
+        if not len(compared):
+            return equal
+        # Gather the stored bytes of every compared key and compare them with the given keys at once
+        compared_lengths = lengths[compared]
+        query = np.frombuffer(b''.join(encoded[i] for i in compared), dtype=np.uint8)
+        segment_starts = np.cumsum(compared_lengths) - compared_lengths
+        within = np.arange(len(query)) - np.repeat(segment_starts, compared_lengths)
+        stored = np.asarray(self.key_data[np.repeat(starts[compared], compared_lengths) + within])
+        mismatches = np.add.reduceat((stored != query).astype(np.int64), segment_starts)
+        equal[compared[mismatches > 0]] = False
+        return equal
+
+    def resolve(self, keywords: List[str], match_types: List[str], default_bids: Dict[str, float]) -> np.ndarray:
+        """
+        Resolve the bid of every keyword for every match type
+
+        The match type's own column takes precedence over the ANY_MATCH_TYPE column,
+        which takes precedence over the default bid of the match type.
+
+        Args:
+            keywords: Keywords in job order
+            match_types: Match types in job order (any case)
+            default_bids: Default bid per lowercase match type
+
+        Returns:
+            Float array of shape (len(keywords), len(match_types))
+        """
+        rows = self.lookup(keywords)
+        found = rows >= 0
+        safe_rows = np.where(found, rows, 0)
+        bids = np.empty((len(keywords), len(match_types)), dtype=float)
+        for m, match_type in enumerate(match_type.lower() for match_type in match_types):
+            column = np.full(len(keywords), np.nan)
+            for key in (match_type, ANY_MATCH_TYPE):
+                values = self.columns.get(key)
+                if values is not None and len(values):
+                    column = np.where(np.isnan(column) & found, values[safe_rows], column)
+            bids[:, m] = np.where(np.isnan(column), float(default_bids[match_type]), column)
+        return bids
+
+
+def _replace_file(path: str, write) -> None:
+    """Write a file under a temporary name and move it into place, so readers (and memory maps) never see it partly written"""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, 'wb') as f:
+            write(f)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def _source_signature(path: str) -> Dict[str, Union[str, int]]:
+    """Identity of a source file for cache invalidation"""
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def as_bid_table(keyword_bids: Union[None, Dict[str, float], KeywordBidTable]) -> KeywordBidTable:
+    """CampaignSettings.keyword_bids as a KeywordBidTable (dicts keep exact keyword matching)"""
+    if isinstance(keyword_bids, KeywordBidTable):
+        return keyword_bids
+    return KeywordBidTable.from_dict(keyword_bids or {})
@@ -0,0 +1,258 @@
+"""
+In-memory index of an existing bulk sheet.
+
+A bulk file is streamed chunk by chunk (see utils.readers) into one table per
+entity level. Every table is a DataFrame of column arrays; children hold the
+integer position of their parent instead of repeating its fields:
+
+    campaigns <- ad_groups (campaign) <- product_ads / keywords (ad_group, campaign)
+    campaigns <- bidding_adjustments (campaign)
+
+Lookups by campaign ID, SKU and keyword text go through hash indexes over
+those arrays, and one-to-many relations are stored as sorted position arrays
+with offsets, so every lookup is O(1) plus the size of its result.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..utils.readers import DEFAULT_READ_CHUNK_ROWS, iter_bulk_file
+
+ENTITY_CAMPAIGN = "Campaign"
+ENTITY_AD_GROUP = "Ad Group"
+ENTITY_BIDDING_ADJUSTMENT = "Bidding Adjustment"
+ENTITY_PRODUCT_AD = "Product Ad"
+ENTITY_KEYWORD = "Keyword"
+
+# Name columns on child rows of Amazon bulk downloads
+CAMPAIGN_NAME_INFO_COLUMN = 'Campaign Name (Informational only)'
+AD_GROUP_NAME_INFO_COLUMN = 'Ad Group Name (Informational only)'
+
+# Columns kept per entity level, in table order
+ENTITY_COLUMNS = {
+    ENTITY_CAMPAIGN: ['Campaign ID', 'Campaign Name', 'State', 'Daily Budget'],
+    ENTITY_AD_GROUP: ['Campaign ID', 'Ad Group ID', 'Ad Group Name', 'State', 'Ad Group Default Bid'],
+    ENTITY_PRODUCT_AD: ['Campaign ID', 'Ad Group ID', 'Ad ID', 'SKU', 'State'],
+    ENTITY_KEYWORD: ['Campaign ID', 'Ad Group ID', 'Keyword ID', 'Keyword Text', 'Match Type', 'State', 'Bid'],
+    ENTITY_BIDDING_ADJUSTMENT: ['Campaign ID', 'Placement', 'Percentage']
+}
+# Columns with few distinct values, stored as categoricals
+CATEGORY_COLUMNS = ['State', 'Match Type', 'Placement']
+
+# Every column the reader needs from the file
+INDEX_COLUMNS = sorted(
+    {'Entity', CAMPAIGN_NAME_INFO_COLUMN, AD_GROUP_NAME_INFO_COLUMN}
+    | {column for columns in ENTITY_COLUMNS.values() for column in columns}
+)
+
+def normalize_keyword(text: str) -> str:
+    """Keyword text as compared across files: lowercase, single-spaced, trimmed"""
+    return ' '.join(str(text).lower().split())
+
+
+def normalize_keyword_column(values: pd.Series) -> pd.Series:
+    """normalize_keyword for a whole column"""
+    # split/join per value is several times faster than pandas' regex string methods
+    return pd.Series([' '.join(value.lower().split()) for value in values.astype(str)], index=values.index, dtype=object)
+
+
+class _Grouping:
+    """Positions grouped by key: sorted position array plus per-key offsets"""
+
+    def __init__(self, codes: np.ndarray, n_keys: int, keys: Optional[pd.Index] = None):
+        """
+        Args:
+            codes: Key number of every position (-1 = no key)
+            n_keys: Number of distinct keys
+            keys: Key values, looked up by get; None when keys are positions themselves
+        """
+        valid = codes >= 0
+        self.order = np.flatnonzero(valid)[np.argsort(codes[valid], kind='stable')].astype(np.int64)
+        self.offsets = np.zeros(n_keys + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes[valid], minlength=n_keys), out=self.offsets[1:])
+        self.keys = keys
+
+    @classmethod
+    def from_values(cls, values: pd.Series) -> '_Grouping':
+        """Group positions by value ('' is not a key)"""
+        codes, uniques = pd.factorize(values.where(values != ''), use_na_sentinel=True)
+        return cls(codes, len(uniques), pd.Index(uniques))
+
+    def at(self, code: int) -> np.ndarray:
+        """Positions of a key number"""
+        return self.order[self.offsets[code]:self.offsets[code + 1]]
+
+    def get(self, key: Any) -> np.ndarray:
+        """Positions of a key value (empty when absent)"""
+        try:
+            code = self.keys.get_loc(key)
+        except KeyError:
+            return self.order[:0]
+        return self.at(code)
+
+
+def _parent_positions(parents: pd.DataFrame, children: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """Position of each child's parent, matched on the ID columns (-1 = not in the file)"""
+    if not len(children):
+        return np.zeros(0, dtype=np.int32)
+    if len(columns) == 1:
+        index = pd.Index(parents[columns[0]].astype(str))
+        keys = pd.Index(children[columns[0]].astype(str))
+    else:
+        index = pd.MultiIndex.from_arrays([parents[column].astype(str) for column in columns])
+        keys = pd.MultiIndex.from_arrays([children[column].astype(str) for column in columns])
+    if not index.is_unique:
+        index = index.drop_duplicates()  # Duplicate parent rows: first one wins
+    return index.get_indexer(keys).astype(np.int32)
+
+
+class BulkSheetIndex:
+    """Campaign -> ad group -> product ad / keyword hierarchy of a bulk sheet"""
+
+    def __init__(self, tables: Dict[str, pd.DataFrame], skipped_rows: int = 0):
+        """
+        Initialize BulkSheetIndex from per-entity tables
+
+        Args:
+            tables: Rows of each entity in ENTITY_COLUMNS, as strings
+            skipped_rows: Rows of other entities (negative keywords, targets, ...) left out
+        """
+        self.skipped_rows = skipped_rows
+        self.campaigns = tables[ENTITY_CAMPAIGN].reset_index(drop=True)
+        self.ad_groups = tables[ENTITY_AD_GROUP].reset_index(drop=True)
+        self.product_ads = tables[ENTITY_PRODUCT_AD].reset_index(drop=True)
+        self.keywords = tables[ENTITY_KEYWORD].reset_index(drop=True)
+        self.bidding_adjustments = tables[ENTITY_BIDDING_ADJUSTMENT].reset_index(drop=True)
+
+        # Parent links
+        self.ad_groups['campaign'] = _parent_positions(self.campaigns, self.ad_groups, ['Campaign ID'])
+        for table in (self.product_ads, self.keywords):
+            table['ad_group'] = _parent_positions(self.ad_groups, table, ['Campaign ID', 'Ad Group ID'])
+            table['campaign'] = _parent_positions(self.campaigns, table, ['Campaign ID'])
+        self.bidding_adjustments['campaign'] = _parent_positions(
+            self.campaigns, self.bidding_adjustments, ['Campaign ID']
+        )
+        self.keywords['normalized'] = normalize_keyword_column(self.keywords['Keyword Text'])
+
+        for table in (self.campaigns, self.ad_groups, self.product_ads, self.keywords, self.bidding_adjustments):
+            for column in CATEGORY_COLUMNS:
+                if column in table.columns:
+                    table[column] = table[column].astype('category')
+
+        # Lookups
+        self._campaign_ids = pd.Index(self.campaigns['Campaign ID'].astype(str))
+        if not self._campaign_ids.is_unique:
+            self._campaign_ids = self._campaign_ids.drop_duplicates()
+        self._ad_groups_by_campaign = _Grouping(self.ad_groups['campaign'].to_numpy(), len(self.campaigns))
+        self._product_ads_by_ad_group = _Grouping(self.product_ads['ad_group'].to_numpy(), len(self.ad_groups))
+        self._keywords_by_ad_group = _Grouping(self.keywords['ad_group'].to_numpy(), len(self.ad_groups))
+        self._product_ads_by_sku = _Grouping.from_values(self.product_ads['SKU'])
+        self._keywords_by_text = _Grouping.from_values(self.keywords['normalized'])
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame]) -> 'BulkSheetIndex':
+        """
+        Build the index from bulk sheet chunks
+
+        Args:
+            chunks: DataFrames of bulk sheet rows, e.g. from utils.readers.iter_bulk_file
+
+        Returns:
+            BulkSheetIndex over all chunks
+        """
+        parts = {entity: [] for entity in ENTITY_COLUMNS}
+        skipped_rows = 0
+        for chunk in chunks:
+            chunk = chunk.astype(object).where(chunk.notna(), '')
+            for column in INDEX_COLUMNS:
+                if column not in chunk.columns:
+                    chunk[column] = ''
+            # Amazon downloads carry the names of child rows' parents in informational columns
+            chunk['Campaign Name'] = chunk['Campaign Name'].where(
+                chunk['Campaign Name'] != '', chunk[CAMPAIGN_NAME_INFO_COLUMN]
+            )
+            chunk['Ad Group Name'] = chunk['Ad Group Name'].where(
+                chunk['Ad Group Name'] != '', chunk[AD_GROUP_NAME_INFO_COLUMN]
+            )
+            entity = chunk['Entity'].astype(str).str.strip()
+            indexed = entity.isin(list(ENTITY_COLUMNS))
+            skipped_rows += int((~indexed).sum())
+            for name, rows in chunk[indexed].groupby(entity[indexed], sort=False):
+                parts[name].append(rows[ENTITY_COLUMNS[name]].astype(str).apply(lambda column: column.str.strip()))
+
+        tables = {
+            entity: pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=ENTITY_COLUMNS[entity])
+            for entity, frames in parts.items()
+        }
+        return cls(tables, skipped_rows)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'BulkSheetIndex':
+        """Build the index from a bulk sheet DataFrame"""
+        return cls.from_chunks([df])
+
+    @classmethod
+    def from_file(cls, source: Any, chunk_rows: int = DEFAULT_READ_CHUNK_ROWS,
+                  sheet_name: Optional[str] = None) -> 'BulkSheetIndex':
+        """
+        Stream a CSV or XLSX bulk file into an index
+
+        Args:
+            source: Path or file-like object
+            chunk_rows: Rows read per chunk
+            sheet_name: Worksheet of an XLSX file; defaults to the first Sponsored Products sheet
+
+        Returns:
+            BulkSheetIndex of the file
+        """
+        return cls.from_chunks(iter_bulk_file(source, chunk_rows, usecols=INDEX_COLUMNS, sheet_name=sheet_name))
+
+    def get_campaign(self, campaign_id: str) -> Optional[int]:
+        """Position of a campaign in self.campaigns, or None"""
+        try:
+            return self._campaign_ids.get_loc(str(campaign_id))
+        except KeyError:
+            return None
+
+    def ad_groups_of(self, campaign: int) -> np.ndarray:
+        """Positions in self.ad_groups of a campaign's ad groups"""
+        return self._ad_groups_by_campaign.at(campaign)
+
+    def product_ads_of(self, ad_group: int) -> np.ndarray:
+        """Positions in self.product_ads of an ad group's product ads"""
+        return self._product_ads_by_ad_group.at(ad_group)
+
+    def keywords_of(self, ad_group: int) -> np.ndarray:
+        """Positions in self.keywords of an ad group's keywords"""
+        return self._keywords_by_ad_group.at(ad_group)
+
+    def find_sku(self, sku: str) -> np.ndarray:
+        """Positions in self.product_ads of every product ad for a SKU"""
+        return self._product_ads_by_sku.get(str(sku).strip())
+
+    def find_keyword(self, text: str) -> np.ndarray:
+        """Positions in self.keywords of every keyword with this text (any case/spacing, any match type)"""
+        return self._keywords_by_text.get(normalize_keyword(text))
+
+    def campaign_names(self) -> np.ndarray:
+        """Name of every campaign, falling back to its ID"""
+        names = self.campaigns['Campaign Name'].to_numpy(dtype=object)
+        ids = self.campaigns['Campaign ID'].astype(str).to_numpy(dtype=object)
+        return np.where(names != '', names, ids)
+
+    def ad_group_names(self) -> np.ndarray:
+        """Name of every ad group, falling back to its ID"""
+        names = self.ad_groups['Ad Group Name'].to_numpy(dtype=object)
+        ids = self.ad_groups['Ad Group ID'].astype(str).to_numpy(dtype=object)
+        return np.where(names != '', names, ids)
+
+    def summary(self) -> Dict[str, int]:
+        """Row count of each entity level"""
+        return {
+            ENTITY_CAMPAIGN: len(self.campaigns),
+            ENTITY_AD_GROUP: len(self.ad_groups),
+            ENTITY_BIDDING_ADJUSTMENT: len(self.bidding_adjustments),
+            ENTITY_PRODUCT_AD: len(self.product_ads),
+            ENTITY_KEYWORD: len(self.keywords)
+        }
@@ -0,0 +1,344 @@
+"""
+Incremental bulk sheets.
+
+Builds a hashed index of the entities already present in a previous bulk file
+(one generated by this tool or downloaded from Amazon) and filters a newly
+generated sheet down to the rows that do not exist there yet.
+
+Entities are identified by name rather than by ID, since Amazon replaces the
+text IDs of a generated file with numeric IDs once it is uploaded:
+
+- Campaign: campaign name
+- Ad Group: campaign name + ad group name
+- Product Ad: + SKU
+- Keyword: + keyword text and match type (case-insensitive)
+- Bidding Adjustment: campaign name + placement
+
+A name is ambiguous when rows with different IDs share it, e.g. campaign
+names from a template without [SKU] that repeat across SKU groups. Entities
+under an ambiguous campaign name (or ad group name within a campaign), in
+either file, are identified by Campaign ID / Ad Group ID instead, and are
+never pointed at another campaign's or ad group's existing ID.
+"""
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .bulk_index import (
+    AD_GROUP_NAME_INFO_COLUMN, CAMPAIGN_NAME_INFO_COLUMN, ENTITY_AD_GROUP, ENTITY_BIDDING_ADJUSTMENT,
+    ENTITY_CAMPAIGN, ENTITY_KEYWORD, ENTITY_PRODUCT_AD, BulkSheetIndex
+)
+
+# Columns that identify an entity within its ad group / campaign
+IDENTITY_COLUMNS = ['SKU', 'Keyword Text', 'Match Type', 'Placement', 'Product Targeting Expression']
+CASE_INSENSITIVE_COLUMNS = ['Keyword Text', 'Match Type', 'Placement']
+
+_KEY_SEPARATOR = '\x1f'
+_ID_MARKER = '\x1e'  # Prefix of the IDs used in place of ambiguous names in identity keys
+
+
+def _text_column(df: pd.DataFrame, column: str) -> pd.Series:
+    """Column as stripped strings, with '' for missing columns and empty cells"""
+    if column not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    values = df[column].astype(object)
+    return values.where(values.notna(), '').astype(str).str.strip()
+
+
+def _resolve_names(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+    """Campaign and ad group name of every row, resolved through the parent rows' IDs"""
+    entity = _text_column(df, 'Entity')
+    campaign_id = _text_column(df, 'Campaign ID')
+    ad_group_id = _text_column(df, 'Ad Group ID')
+
+    # Campaign ID -> name from Campaign rows, then informational column, then the ID itself
+    is_campaign = entity == ENTITY_CAMPAIGN
+    campaign_names = pd.Series(
+        _text_column(df, 'Campaign Name')[is_campaign].values, index=campaign_id[is_campaign].values
+    )
+    campaign_names = campaign_names[~campaign_names.index.duplicated()]
+    campaign = campaign_id.map(campaign_names)
+    campaign = campaign.where(campaign.notna() & (campaign != ''), _text_column(df, CAMPAIGN_NAME_INFO_COLUMN))
+    campaign = campaign.where(campaign != '', campaign_id)
+
+    # (Campaign ID, Ad Group ID) -> name from Ad Group rows
+    group_key = campaign_id + _KEY_SEPARATOR + ad_group_id
+    is_ad_group = entity == ENTITY_AD_GROUP
+    ad_group_names = pd.Series(
+        _text_column(df, 'Ad Group Name')[is_ad_group].values, index=group_key[is_ad_group].values
+    )
+    ad_group_names = ad_group_names[~ad_group_names.index.duplicated()]
+    ad_group = group_key.map(ad_group_names)
+    ad_group = ad_group.where(ad_group.notna() & (ad_group != ''), _text_column(df, AD_GROUP_NAME_INFO_COLUMN))
+    ad_group = ad_group.where(ad_group != '', ad_group_id)
+    # Campaign-level entities sit outside any ad group
+    ad_group = ad_group.where(~(is_campaign | (entity == ENTITY_BIDDING_ADJUSTMENT)), '')
+
+    return campaign, ad_group
+
+
+def _hash_identities(entity: pd.Series, campaign: pd.Series, ad_group: pd.Series,
+                     identity: Dict[str, pd.Series]) -> np.ndarray:
+    """uint64 hash of each row's identity key; identity holds IDENTITY_COLUMNS values ('' if absent)"""
+    key = entity + _KEY_SEPARATOR + campaign + _KEY_SEPARATOR + ad_group
+    for column in IDENTITY_COLUMNS:
+        values = identity.get(column)
+        if values is None:
+            values = pd.Series('', index=entity.index, dtype=object)
+        elif column in CASE_INSENSITIVE_COLUMNS:
+            values = values.str.lower()
+        key = key + _KEY_SEPARATOR + values
+    return pd.util.hash_array(key.to_numpy(dtype=object), categorize=False)
+
+
+def _id_hashes(entity: pd.Series, campaign_id: pd.Series, ad_group_id: pd.Series, ad_group: pd.Series,
+               identity: Dict[str, pd.Series]) -> np.ndarray:
+    """Identity hashes with the campaign and ad group keyed by ID rather than by name"""
+    campaign_key = _ID_MARKER + campaign_id
+    ad_group_key = (_ID_MARKER + ad_group_id).where(ad_group != '', '')
+    return _hash_identities(entity, campaign_key, ad_group_key, identity)
+
+
+def _ambiguous_names(names: pd.Series, ids: pd.Series) -> FrozenSet[str]:
+    """Names shared by rows with different IDs"""
+    pairs = pd.DataFrame({'name': names.to_numpy(dtype=object), 'id': ids.to_numpy(dtype=object)})
+    counts = pairs.drop_duplicates()['name'].value_counts()
+    return frozenset(counts.index[counts > 1])
+
+
+def _ambiguities(campaign: pd.Series, ad_group: pd.Series, campaign_id: pd.Series,
+                 ad_group_id: pd.Series) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """Ambiguous campaign names, and ambiguous ad group names as campaign + separator + ad group"""
+    in_ad_group = ad_group != ''
+    return (
+        _ambiguous_names(campaign, campaign_id),
+        _ambiguous_names((campaign + _KEY_SEPARATOR + ad_group)[in_ad_group],
+                         (campaign_id + _KEY_SEPARATOR + ad_group_id)[in_ad_group])
+    )
+
+
+def _keyed_by_id(campaign: pd.Series, ad_group: pd.Series, ambiguous_campaigns: FrozenSet[str],
+                 ambiguous_ad_groups: FrozenSet[str]) -> np.ndarray:
+    """Mask of the rows whose campaign or ad group name is ambiguous"""
+    by_id = campaign.isin(ambiguous_campaigns).to_numpy()
+    if ambiguous_ad_groups:
+        by_id |= ((campaign + _KEY_SEPARATOR + ad_group).isin(ambiguous_ad_groups) & (ad_group != '')).to_numpy()
+    return by_id
+
+
+def _unambiguous_ids(names: pd.Series, ids: pd.Series, ambiguous: FrozenSet[str]) -> Dict[Any, str]:
+    """Existing ID per name, leaving out ambiguous names"""
+    keep = ~names.isin(ambiguous).to_numpy()
+    return dict(zip(names.to_numpy(dtype=object)[keep], ids.to_numpy(dtype=object)[keep]))
+
+
+def identity_keys(df: pd.DataFrame) -> Tuple[np.ndarray, pd.Series, pd.Series]:
+    """
+    Hash the identity of every row of a bulk sheet
+
+    Args:
+        df: Bulk sheet rows
+
+    Returns:
+        Tuple of (uint64 identity hash per row, campaign name per row, ad group name per row)
+    """
+    campaign, ad_group = _resolve_names(df)
+    identity = {column: _text_column(df, column) for column in IDENTITY_COLUMNS}
+    hashes = _hash_identities(_text_column(df, 'Entity'), campaign, ad_group, identity)
+    return hashes, campaign, ad_group
+
+
+def _parent_names(names: np.ndarray, positions: np.ndarray, ids: pd.Series) -> pd.Series:
+    """Name of each row's parent by position, or the row's parent ID when the parent is not indexed"""
+    ids = ids.astype(str).to_numpy(dtype=object)
+    if len(names):
+        resolved = np.where(positions >= 0, names[positions.clip(min=0)], ids)
+    else:
+        resolved = ids
+    return pd.Series(resolved, dtype=object)
+
+
+class BulkSheetIdentityIndex:
+    """Hashed index of the entities present in a bulk file"""
+
+    def __init__(self, hashes: np.ndarray, campaign_ids: Dict[str, str], ad_group_ids: Dict[Tuple[str, str], str],
+                 id_hashes: Optional[np.ndarray] = None, ambiguous_campaigns: FrozenSet[str] = frozenset(),
+                 ambiguous_ad_groups: FrozenSet[str] = frozenset()):
+        """
+        Initialize BulkSheetIdentityIndex
+
+        Args:
+            hashes: Identity hashes of the existing rows, keyed by campaign / ad group name
+            campaign_ids: Existing Campaign ID per unambiguous campaign name
+            ad_group_ids: Existing Ad Group ID per unambiguous (campaign name, ad group name)
+            id_hashes: Identity hashes of the existing rows, keyed by Campaign ID / Ad Group ID
+            ambiguous_campaigns: Campaign names used by more than one Campaign ID
+            ambiguous_ad_groups: Campaign name + separator + ad group name used by more than one ad group
+        """
+        self.hashes = np.unique(hashes)
+        self.id_hashes = np.unique(id_hashes) if id_hashes is not None else np.zeros(0, dtype=np.uint64)
+        self.campaign_ids = campaign_ids
+        self.ad_group_ids = ad_group_ids
+        self.ambiguous_campaigns = ambiguous_campaigns
+        self.ambiguous_ad_groups = ambiguous_ad_groups
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'BulkSheetIdentityIndex':
+        """Index the rows of a bulk sheet DataFrame"""
+        campaign, ad_group = _resolve_names(df)
+        entity = _text_column(df, 'Entity')
+        campaign_id = _text_column(df, 'Campaign ID')
+        ad_group_id = _text_column(df, 'Ad Group ID')
+        identity = {column: _text_column(df, column) for column in IDENTITY_COLUMNS}
+        ambiguous_campaigns, ambiguous_ad_groups = _ambiguities(campaign, ad_group, campaign_id, ad_group_id)
+
+        is_campaign = (entity == ENTITY_CAMPAIGN).to_numpy()
+        is_ad_group = (entity == ENTITY_AD_GROUP).to_numpy()
+        group_names = (campaign + _KEY_SEPARATOR + ad_group)[is_ad_group]
+        ad_group_ids = _unambiguous_ids(group_names, ad_group_id[is_ad_group], ambiguous_ad_groups)
+        return cls(
+            _hash_identities(entity, campaign, ad_group, identity),
+            _unambiguous_ids(campaign[is_campaign], campaign_id[is_campaign], ambiguous_campaigns),
+            {tuple(key.split(_KEY_SEPARATOR, 1)): value for key, value in ad_group_ids.items()},
+            _id_hashes(entity, campaign_id, ad_group_id, ad_group, identity),
+            ambiguous_campaigns,
+            ambiguous_ad_groups
+        )
+
+    @classmethod
+    def from_bulk_index(cls, index: BulkSheetIndex) -> 'BulkSheetIdentityIndex':
+        """Index the entities of a BulkSheetIndex"""
+        campaign_names = index.campaign_names()
+        ad_group_names = index.ad_group_names()
+
+        levels: List[Tuple[str, pd.DataFrame, Any, Any]] = [
+            (ENTITY_CAMPAIGN, index.campaigns, pd.Series(campaign_names, dtype=object), None),
+            (ENTITY_AD_GROUP, index.ad_groups,
+             _parent_names(campaign_names, index.ad_groups['campaign'].to_numpy(), index.ad_groups['Campaign ID']),
+             pd.Series(ad_group_names, dtype=object)),
+            (ENTITY_BIDDING_ADJUSTMENT, index.bidding_adjustments,
+             _parent_names(campaign_names, index.bidding_adjustments['campaign'].to_numpy(),
+                           index.bidding_adjustments['Campaign ID']), None),
+        ]
+        for entity, table in ((ENTITY_PRODUCT_AD, index.product_ads), (ENTITY_KEYWORD, index.keywords)):
+            levels.append((
+                entity, table,
+                _parent_names(campaign_names, table['campaign'].to_numpy(), table['Campaign ID']),
+                _parent_names(ad_group_names, table['ad_group'].to_numpy(), table['Ad Group ID'])
+            ))
+
+        rows = []
+        for entity, table, campaign, ad_group in levels:
+            if not len(table):
+                continue
+            if ad_group is None:
+                ad_group = pd.Series('', index=campaign.index, dtype=object)
+            identity = {
+                column: pd.Series(table[column].astype(str).to_numpy(dtype=object), dtype=object)
+                for column in IDENTITY_COLUMNS if column in table.columns
+            }
+            entities = pd.Series(entity, index=campaign.index, dtype=object)
+            campaign_id = pd.Series(_text_column(table, 'Campaign ID').to_numpy(dtype=object), dtype=object)
+            ad_group_id = pd.Series(_text_column(table, 'Ad Group ID').to_numpy(dtype=object), dtype=object)
+            rows.append((entities, campaign, ad_group, campaign_id, ad_group_id, identity))
+
+        if not rows:
+            empty = np.zeros(0, dtype=np.uint64)
+            return cls(empty, {}, {}, empty)
+
+        hashes = np.concatenate([_hash_identities(entity, campaign, ad_group, identity)
+                                 for entity, campaign, ad_group, _, _, identity in rows])
+        id_hashes = np.concatenate([_id_hashes(entity, campaign_id, ad_group_id, ad_group, identity)
+                                    for entity, _, ad_group, campaign_id, ad_group_id, identity in rows])
+        ambiguous_campaigns, ambiguous_ad_groups = _ambiguities(
+            *(pd.concat([row[position] for row in rows], ignore_index=True) for position in range(1, 5))
+        )
+
+        campaign_ids = _unambiguous_ids(pd.Series(campaign_names, dtype=object),
+                                        _text_column(index.campaigns, 'Campaign ID'), ambiguous_campaigns)
+        ad_group_campaigns = _parent_names(campaign_names, index.ad_groups['campaign'].to_numpy(),
+                                           index.ad_groups['Campaign ID'])
+        group_names = ad_group_campaigns + _KEY_SEPARATOR + pd.Series(ad_group_names, dtype=object)
+        ad_group_ids = _unambiguous_ids(group_names, _text_column(index.ad_groups, 'Ad Group ID'),
+                                        ambiguous_ad_groups)
+        return cls(
+            hashes,
+            campaign_ids,
+            {tuple(key.split(_KEY_SEPARATOR, 1)): value for key, value in ad_group_ids.items()},
+            id_hashes,
+            ambiguous_campaigns,
+            ambiguous_ad_groups
+        )
+
+    @classmethod
+    def from_file(cls, source, sheet_name: Optional[str] = None) -> 'BulkSheetIdentityIndex':
+        """Index a CSV or XLSX bulk file, streamed through BulkSheetIndex"""
+        return cls.from_bulk_index(BulkSheetIndex.from_file(source, sheet_name=sheet_name))
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Boolean mask of the name-keyed identity hashes present in the index"""
+        return _sorted_contains(self.hashes, hashes)
+
+    def contains_ids(self, id_hashes: np.ndarray) -> np.ndarray:
+        """Boolean mask of the ID-keyed identity hashes present in the index"""
+        return _sorted_contains(self.id_hashes, id_hashes)
+
+
+def _sorted_contains(sorted_hashes: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+    """Boolean mask of the hashes present in a sorted unique hash array"""
+    if not len(sorted_hashes):
+        return np.zeros(len(hashes), dtype=bool)
+    positions = np.searchsorted(sorted_hashes, hashes).clip(max=len(sorted_hashes) - 1)
+    return sorted_hashes[positions] == hashes
+
+
+def diff_bulk_sheet(df: pd.DataFrame, previous: BulkSheetIdentityIndex) -> pd.DataFrame:
+    """
+    Keep only the rows of a bulk sheet that are not in a previous bulk file
+
+    New rows under an existing campaign or ad group are pointed at the existing
+    Campaign ID / Ad Group ID, so they attach to it on upload. Rows under a name
+    that is ambiguous in either file are matched by ID and keep their own IDs.
+
+    Args:
+        df: Newly generated bulk sheet
+        previous: Index of the previous bulk file
+
+    Returns:
+        DataFrame with the new rows, in their original order
+    """
+    campaign, ad_group = _resolve_names(df)
+    entity = _text_column(df, 'Entity')
+    campaign_id = _text_column(df, 'Campaign ID')
+    ad_group_id = _text_column(df, 'Ad Group ID')
+    identity = {column: _text_column(df, column) for column in IDENTITY_COLUMNS}
+    ambiguous_campaigns, ambiguous_ad_groups = _ambiguities(campaign, ad_group, campaign_id, ad_group_id)
+    by_id = _keyed_by_id(campaign, ad_group, ambiguous_campaigns | previous.ambiguous_campaigns,
+                         ambiguous_ad_groups | previous.ambiguous_ad_groups)
+
+    is_new = ~previous.contains(_hash_identities(entity, campaign, ad_group, identity))
+    if by_id.any():
+        is_new[by_id] = ~previous.contains_ids(_id_hashes(
+            entity[by_id], campaign_id[by_id], ad_group_id[by_id], ad_group[by_id],
+            {column: values[by_id] for column, values in identity.items()}
+        ))
+    new_rows = df[is_new].reset_index(drop=True)
+    if not len(new_rows):
+        return new_rows
+
+    by_id = by_id[is_new]
+    campaign = campaign[is_new].reset_index(drop=True)
+    ad_group = ad_group[is_new].reset_index(drop=True)
+    existing_campaign_id = campaign.map(previous.campaign_ids).where(~by_id)
+    existing_ad_group_id = pd.Series(
+        [previous.ad_group_ids.get(key) for key in zip(campaign, ad_group)], dtype=object
+    ).where(~by_id)
+    has_id = (new_rows['Campaign ID'].notna() & existing_campaign_id.notna()).to_numpy()
+    new_rows['Campaign ID'] = new_rows['Campaign ID'].astype(object).where(~has_id, existing_campaign_id)
+    has_id = (new_rows['Ad Group ID'].notna() & existing_ad_group_id.notna()).to_numpy()
+    new_rows['Ad Group ID'] = new_rows['Ad Group ID'].astype(object).where(~has_id, existing_ad_group_id)
+    return new_rows
@@ -1,9 +1,40 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 from datetime import datetime
 from dataclasses import dataclass
-import re
+import os
 from itertools import zip_longest
+from concurrent.futures import ProcessPoolExecutor
+
+from .artifacts import KeywordArtifacts
+from .bids import KeywordBidTable, read_text_columns
+from .bulk_index import BulkSheetIndex
+from .diff import BulkSheetIdentityIndex, diff_bulk_sheet
+from .planner import JobLimits, JobPlan, check_limits, enforce_limits, plan_job, split_job
+from .templates import compile_name_template, format_sku_display
+from .updates import OPERATION_UPDATE, build_update_rows
+from ..utils.formatters import DataFormatter
+from ..utils.instrumentation import NULL_PROFILER, Profiler
+
+def _compact_column(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Dictionary-encode a column as (codes, uniques); None becomes code -1"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    return codes.astype(np.int32), np.asarray(uniques, dtype=object)
+
+def _expand_column(codes: np.ndarray, uniques: np.ndarray) -> np.ndarray:
+    """Inverse of _compact_column"""
+    # Code -1 picks the trailing None
+    return np.append(uniques, None)[codes]
+
+def _concat_ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Concatenate range(start, start + length) for every pair without a Python loop"""
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(offsets.size)
+
+def _plan_bids(plan: Optional[JobPlan]) -> Optional[np.ndarray]:
+    """Bids a plan already resolved for its job, if any"""
+    return plan.keyword_bids if plan is not None else None
 
 @dataclass
 class CampaignSettings:
@@ -12,7 +43,7 @@ class CampaignSettings:
     start_date: datetime
     match_types: List[str]  # Valid values: MATCH_TYPE_EXACT, MATCH_TYPE_PHRASE, MATCH_TYPE_BROAD
     bids: Dict[str, float]  # Default bids per match type
-    keyword_bids: Dict[str, float] = None  # Optional keyword-specific bids
+    keyword_bids: Union[Dict[str, float], KeywordBidTable] = None  # Optional keyword-specific bids
     bid_adjustment: str = ""  # No default bid adjustment
     campaign_name_template: str = "SP_match_type_KW_sku"
     ad_group_name_template: str = "AG_match_type_sku"
@@ -20,6 +51,28 @@ class CampaignSettings:
     keyword_group_size: int = None  # New field for keyword grouping
     sku_group_size: int = None  # New field for SKU grouping
 
+@dataclass
+class _GenerationJob:
+    """Grouped inputs and per-job values shared by every campaign block of a columnar build"""
+    sku_groups: List[List[str]]
+    keyword_groups: List[List[str]]
+    match_types: List[str]  # Lowercased, in settings order
+    start_date: str  # Formatted with BulkSheetGenerator.DATE_FORMAT
+    all_skus: np.ndarray  # SKUs flattened in group order
+    sku_sizes: np.ndarray
+    keyword_sizes: np.ndarray
+    sku_offsets: np.ndarray  # Position of each SKU group in all_skus
+    keyword_offsets: np.ndarray  # Position of each keyword group in the keyword table
+    combined_skus: List[str]  # "_".join of each SKU group
+    sku_displays: List[str]  # Each SKU group as shown in names
+    group_identifiers: List[str]  # Cleaned first keyword of each keyword group
+    group_roots: List[str]  # Root term of each group's first keyword
+    keywords: KeywordArtifacts  # Per-keyword values; keyword groups are contiguous slices of it
+
+    @property
+    def n_campaigns(self) -> int:
+        return len(self.sku_groups) * len(self.keyword_groups) * len(self.match_types)
+
 class BulkSheetGenerator:
     """Class to handle the generation of Amazon Ads bulk sheets"""
     
@@ -29,6 +82,7 @@ class BulkSheetGenerator:
     BIDDING_STRATEGY = "Dynamic bids - down only"
     STATE = "enabled"
     OPERATION = "Create"
+    OPERATION_UPDATE = OPERATION_UPDATE
     PRODUCT = "Sponsored Products"
     DATE_FORMAT = "%Y%m%d"
 
@@ -43,8 +97,55 @@ class BulkSheetGenerator:
     MATCH_TYPE_EXACT = "exact"
     MATCH_TYPE_PHRASE = "phrase"
     MATCH_TYPE_BROAD = "broad"
+
+    # Generation engines
+    ENGINE_ROWS = "rows"  # One dict per row, formatted after the DataFrame is built
+    ENGINE_COLUMNAR = "columnar"  # Column arrays built per campaign block, formatted up front
+    ENGINE_PARALLEL = "parallel"  # Columnar tiles built in a process pool and reassembled in order
+
+    # Approximate rows built per batch when streaming without a chunk size
+    STREAM_BATCH_ROWS = 10000
+    # Approximate rows per tile handed to a worker process by the parallel engine
+    PARALLEL_TILE_ROWS = 200000
+    
+    # Columns with a handful of distinct values, stored as categoricals in compact mode
+    LOW_CARDINALITY_COLUMNS = [
+        'Product',
+        'Entity',
+        'Operation',
+        'Start Date',
+        'Targeting Type',
+        'State',
+        'Daily Budget',
+        'Ad Group Default Bid',
+        'Match Type',
+        'Bidding Strategy',
+        'Placement',
+        'Percentage'
+    ]
+    # Columns the generator never fills, stored as empty categoricals in compact mode
+    EMPTY_COLUMNS = [
+        'Portfolio ID',
+        'Ad ID',
+        'Keyword ID',
+        'Product Targeting ID',
+        'End Date',
+        'Native Language Keyword',
+        'Native Language Locale',
+        'Product Targeting Expression'
+    ]
     
-    def __init__(self):
+    def __init__(self, engine: str = ENGINE_ROWS, max_workers: Optional[int] = None,
+                 compact_storage: bool = False, limits: Optional[JobLimits] = None,
+                 profiler: Optional[Profiler] = None):
+        if engine not in (self.ENGINE_ROWS, self.ENGINE_COLUMNAR, self.ENGINE_PARALLEL):
+            raise ValueError(f"Unsupported engine: {engine}")
+        self.engine = engine
+        self.max_workers = max_workers  # Worker processes for the parallel engine (None = CPU count)
+        self.compact_storage = compact_storage  # Categorical storage for repetitive/empty columns
+        self.limits = limits  # Hard job size limits checked before generation (None = unlimited)
+        self.profiler = profiler or NULL_PROFILER  # Per-stage timings (disabled by default)
+
         # Headers exactly as provided by Amazon
         self.headers = [
             'Product',
@@ -100,8 +201,91 @@ class BulkSheetGenerator:
             sku_groups.append(group)
         return sku_groups
 
-    def generate_bulk_sheet(self, keywords: List[str], skus: List[str], settings: CampaignSettings) -> pd.DataFrame:
-        """Generate bulk sheet from inputs"""
+    def plan_bulk_sheet(self, keywords: List[str], skus: List[str], settings: CampaignSettings) -> JobPlan:
+        """Compute exact row counts and size estimates for a job without generating rows"""
+        return plan_job(keywords, skus, settings)
+
+    def dry_run(self, keywords: List[str], skus: List[str], settings: CampaignSettings) -> JobPlan:
+        """Plan a job and check it against self.limits without generating rows.
+
+        The returned plan lists any exceeded limits in ``violations`` and the number of
+        sub-jobs generate_bulk_sheets would split it into in ``parts``.
+        """
+        return check_limits(plan_job(keywords, skus, settings), self.limits)
+
+    def generate_bulk_sheet(self, keywords: List[str], skus: List[str], settings: CampaignSettings,
+                            plan: Optional[JobPlan] = None) -> pd.DataFrame:
+        """Generate bulk sheet from inputs
+
+        ``plan`` is an optional plan of the same job from dry_run / plan_bulk_sheet;
+        it is checked instead of planning again and its resolved bids are reused.
+
+        Raises:
+            JobTooLargeError: If the job exceeds self.limits
+        """
+        with self.profiler.span('generate') as span:
+            if self.limits is not None:
+                with self.profiler.span('generate.plan'):
+                    plan = enforce_limits(plan or plan_job(keywords, skus, settings), self.limits)
+            df = self._generate_dataframe(keywords, skus, settings, _plan_bids(plan))
+            if self.compact_storage:
+                df = self._compact_dataframe(df)
+            span.record(rows=len(df))
+        return df
+
+    def generate_incremental_bulk_sheet(self, keywords: List[str], skus: List[str], settings: CampaignSettings,
+                                        previous: BulkSheetIdentityIndex,
+                                        plan: Optional[JobPlan] = None) -> pd.DataFrame:
+        """Generate only the rows that are not already in a previous bulk file (see core.diff)"""
+        with self.profiler.span('generate') as span:
+            df = self._generate_dataframe(keywords, skus, settings, _plan_bids(plan))
+            with self.profiler.span('generate.diff', rows=len(df)) as diff_span:
+                df = diff_bulk_sheet(df, previous)
+                diff_span.record(rows=len(df))
+            if self.compact_storage:
+                df = self._compact_dataframe(df)
+            span.record(rows=len(df))
+        return df
+
+    def generate_bid_updates(self, index: BulkSheetIndex, keyword_bids: Optional[pd.DataFrame] = None,
+                             ad_group_bids: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Generate Update rows for the keyword / ad group bids that differ from an existing bulk sheet (see core.updates)"""
+        return build_update_rows(index, self.headers, self.PRODUCT, keyword_bids, ad_group_bids)
+
+    def generate_bulk_sheets(self, keywords: List[str], skus: List[str],
+                             settings: CampaignSettings) -> Iterator[pd.DataFrame]:
+        """Generate a job as one or more bulk sheets that each stay within self.limits.
+
+        The job is split before generation at SKU group / keyword group boundaries;
+        concatenating the yielded sheets gives the same rows as generate_bulk_sheet.
+
+        Raises:
+            JobTooLargeError: If one keyword group of one SKU group is larger than the limits allow
+        """
+        parts = split_job(keywords, skus, settings, self.limits) if self.limits else [(keywords, skus)]
+        for part_keywords, part_skus in parts:
+            df = self._generate_dataframe(part_keywords, part_skus, settings)
+            if self.compact_storage:
+                df = self._compact_dataframe(df)
+            yield df
+
+    def _generate_dataframe(self, keywords: List[str], skus: List[str], settings: CampaignSettings,
+                            bids: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """Generate the formatted bulk sheet DataFrame with the configured engine (bids: JobPlan.keyword_bids)"""
+        profiler = self.profiler
+        if self.engine in (self.ENGINE_COLUMNAR, self.ENGINE_PARALLEL):
+            with profiler.span('generate.prepare'):
+                job = self._prepare_job(keywords, skus, settings, bids)
+            if job.n_campaigns:
+                with profiler.span('generate.build') as span:
+                    if self.engine == self.ENGINE_PARALLEL:
+                        columns = self._build_columns_parallel(job, settings)
+                    else:
+                        columns = self._build_columns(job, settings)
+                    span.record(rows=len(columns['Entity']))
+                with profiler.span('generate.dataframe'):
+                    return pd.DataFrame(columns, columns=self.headers)
+
         rows = []
         start_date = settings.start_date.strftime(self.DATE_FORMAT)
         
@@ -110,70 +294,124 @@ class BulkSheetGenerator:
         
         # Group SKUs if group size is specified
         sku_groups = self._group_skus(skus, settings.sku_group_size)
+
+        # Derive per-keyword values once for the whole job
+        with profiler.span('generate.prepare'):
+            artifacts = KeywordArtifacts.build(keywords, settings.match_types, settings.bids, settings.keyword_bids,
+                                               resolved_bids=bids)
         
-        for sku_group in sku_groups:
-            for keyword_group in keyword_groups:
-                for match_type in settings.match_types:
-                    # Generate campaign rows for the entire keyword group and sku group
-                    group_rows = self._generate_campaign_rows(
-                        sku_group=sku_group,
-                        keywords=keyword_group,
-                        match_type=match_type.lower(),
-                        start_date=start_date,
-                        settings=settings
-                    )
-                    rows.extend(group_rows)
+        with profiler.span('generate.build') as span:
+            for sku_group in sku_groups:
+                keyword_offset = 0
+                for keyword_group in keyword_groups:
+                    for match_type in settings.match_types:
+                        # Generate campaign rows for the entire keyword group and sku group
+                        group_rows = self._generate_campaign_rows(
+                            sku_group=sku_group,
+                            keywords=keyword_group,
+                            match_type=match_type.lower(),
+                            start_date=start_date,
+                            settings=settings,
+                            artifacts=artifacts,
+                            keyword_offset=keyword_offset
+                        )
+                        rows.extend(group_rows)
+                    keyword_offset += len(keyword_group)
+            span.record(rows=len(rows))
         
-        df = pd.DataFrame(rows, columns=self.headers)
-        return self._format_dataframe(df)
+        with profiler.span('generate.dataframe'):
+            df = pd.DataFrame(rows, columns=self.headers)
+        with profiler.span('generate.format', rows=len(df)):
+            return self._format_dataframe(df)
+
+    def iter_bulk_rows(self, keywords: List[str], skus: List[str], settings: CampaignSettings,
+                       chunk_size: Optional[int] = None) -> Iterator[Union[Tuple, List[Tuple]]]:
+        """Stream bulk sheet rows in Amazon's parent-before-child order.
+
+        Rows are tuples in ``self.headers`` order holding the same values as the DataFrame
+        returned by generate_bulk_sheet. When chunk_size is given, lists of up to chunk_size
+        rows are yielded instead of single rows. Rows are built a batch of campaigns at a
+        time, so memory is bounded by the batch/chunk size rather than the job size.
+
+        Args:
+            keywords: Keywords to generate campaigns for
+            skus: SKUs to advertise
+            settings: Campaign settings
+            chunk_size: Number of rows per yielded chunk, or None to yield single rows
+
+        Raises:
+            JobTooLargeError: If the job exceeds self.limits (checked before any row is built)
+        """
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+
+        # Size campaign batches so one batch holds roughly one chunk of rows
+        chunk = []
+        for columns in self.iter_bulk_columns(keywords, skus, settings, chunk_size):
+            rows = zip(*columns.values())
+            if chunk_size is None:
+                yield from rows
+                continue
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    def iter_bulk_columns(self, keywords: List[str], skus: List[str], settings: CampaignSettings,
+                          batch_rows: Optional[int] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """Stream the bulk sheet as column batches of whole campaigns.
+
+        Each batch maps every header, in ``self.headers`` order, to an object array of
+        already formatted values (None for empty cells) covering roughly batch_rows rows.
+        This is the columnar engine's native output, so columnar writers (Parquet, Arrow)
+        can consume it without building rows.
+
+        Raises:
+            JobTooLargeError: If the job exceeds self.limits (checked before any row is built)
+        """
+        if batch_rows is not None and batch_rows <= 0:
+            raise ValueError("batch_rows must be a positive integer")
+        plan = None
+        if self.limits is not None:
+            plan = enforce_limits(plan_job(keywords, skus, settings), self.limits)
 
-    def _generate_campaign_name(self, template: str, sku: str, match_type: str, start_date: str) -> str:
+        job = self._prepare_job(keywords, skus, settings, _plan_bids(plan))
+        if not job.n_campaigns:
+            return
+
+        for campaigns in self._campaign_batches(job, settings, batch_rows or self.STREAM_BATCH_ROWS):
+            columns = self._build_columns(job, settings, campaigns)
+            yield {header: columns[header] for header in self.headers}
+
+    def _generate_campaign_name(self, template: str, sku: str, match_type: str, start_date: str,
+                                keyword: str = '', root: str = '') -> str:
         """Generate campaign name using template"""
-        # Map of placeholders to their values
-        # Handle SKU placeholder specially to avoid overly long names with grouped SKUs
-        sku_parts = sku.split('_')
-        if len(sku_parts) > 1:
-            # For grouped SKUs, use first SKU + count
-            sku_display = f"{sku_parts[0]}+{len(sku_parts)-1}"
-        else:
-            sku_display = sku
-
-        replacements = {
-            '[SKU]': sku_display,
-            'SP': 'SP',
-            'match_type': match_type,
-            '[Root]': '[Root]',
-            '[KW]': '[KW]'
-        }
-        
-        # Handle date formats
-        date_obj = datetime.strptime(start_date, '%Y%m%d')
-        date_formats = {
-            '250423': date_obj.strftime('%d%m%y'),
-            '04/23/2025': date_obj.strftime('%m/%d/%Y'),
-            '23-04-2025': date_obj.strftime('%d-%m-%Y'),
-            'Apr 23, 2025': date_obj.strftime('%b %d, %Y')
-        }
-        
-        # Replace date format if present
-        for date_format in date_formats:
-            if date_format in template:
-                template = template.replace(date_format, date_formats[date_format])
-        
-        # Replace other placeholders
-        for placeholder, value in replacements.items():
-            template = template.replace(placeholder, value)
-        
-        return template
+        # Templates are compiled once per (template, start date) and cached
+        render = compile_name_template(template, start_date)
+        return render(sku=format_sku_display(sku), match_type=match_type, keyword=keyword, root=root)
 
     def _generate_campaign_rows(self, sku_group: List[str], keywords: List[str], match_type: str, 
-                              start_date: str, settings: CampaignSettings) -> List[Dict[str, Any]]:
-        """Generate all rows for a single campaign with multiple keywords and SKUs"""
+                              start_date: str, settings: CampaignSettings,
+                              artifacts: Optional[KeywordArtifacts] = None,
+                              keyword_offset: int = 0) -> List[Dict[str, Any]]:
+        """Generate all rows for a single campaign with multiple keywords and SKUs
+
+        ``keywords`` are rows keyword_offset onwards of the job's keyword artifact table;
+        without a table, one is built for just these keywords.
+        """
         rows = []
+
+        if artifacts is None:
+            artifacts = KeywordArtifacts.build(keywords, [match_type], settings.bids, settings.keyword_bids)
+            keyword_offset = 0
+        match_index = artifacts.match_type_index(match_type)
         
-        # Clean keywords for use in names
-        clean_keywords = [re.sub(r'[^a-zA-Z0-9]', '_', kw).lower() for kw in keywords]
-        group_identifier = clean_keywords[0]  # Use first keyword as group identifier
+        # Cleaned keywords for use in names
+        group_identifier = artifacts.identifiers[keyword_offset]  # Use first keyword as group identifier
+        group_root = artifacts.roots[keyword_offset]
         
         # Create a combined SKU string for the group
         combined_sku = "_".join(sku_group)
@@ -186,14 +424,18 @@ class BulkSheetGenerator:
             settings.campaign_name_template, 
             combined_sku, 
             match_type,
-            start_date
+            start_date,
+            keyword=group_identifier,
+            root=group_root
         )
         
         base_ad_group_name = self._generate_campaign_name(
             settings.ad_group_name_template,
             combined_sku,
             match_type,
-            start_date
+            start_date,
+            keyword=group_identifier,
+            root=group_root
         )
         
         # Base row template with all fields in correct order
@@ -275,9 +517,9 @@ class BulkSheetGenerator:
             rows.append(product_ad_row)
         
         # Keyword rows
-        for keyword in keywords:
-            # Get bid for this keyword (use default if no specific bid)
-            keyword_bid = settings.keyword_bids.get(keyword, settings.bids[match_type]) if settings.keyword_bids else settings.bids[match_type]
+        for position, keyword in enumerate(keywords, start=keyword_offset):
+            # Bid for this keyword (keyword-specific bid or match type default)
+            keyword_bid = artifacts.bids[position, match_index]
             
             keyword_row = base_row.copy()
             keyword_row.update({
@@ -292,19 +534,231 @@ class BulkSheetGenerator:
         
         return rows
 
+    def _prepare_job(self, keywords: List[str], skus: List[str], settings: CampaignSettings,
+                     bids: Optional[np.ndarray] = None) -> _GenerationJob:
+        """Group the inputs and precompute the per-job values shared by every campaign block"""
+        keyword_groups = self._group_keywords(keywords, settings.keyword_group_size)
+        sku_groups = self._group_skus(skus, settings.sku_group_size)
+        match_types = [match_type.lower() for match_type in settings.match_types]
+
+        sku_sizes = np.array([len(group) for group in sku_groups], dtype=np.int64)
+        keyword_sizes = np.array([len(group) for group in keyword_groups], dtype=np.int64)
+
+        keyword_offsets = np.cumsum(keyword_sizes) - keyword_sizes
+        combined_skus = ["_".join(group) for group in sku_groups]
+        artifacts = KeywordArtifacts.build(
+            [kw for group in keyword_groups for kw in group],
+            match_types,
+            settings.bids,
+            settings.keyword_bids,
+            resolved_bids=bids
+        )
+
+        return _GenerationJob(
+            sku_groups=sku_groups,
+            keyword_groups=keyword_groups,
+            match_types=match_types,
+            start_date=settings.start_date.strftime(self.DATE_FORMAT),
+            all_skus=np.array([sku for group in sku_groups for sku in group], dtype=object),
+            sku_offsets=np.cumsum(sku_sizes) - sku_sizes,
+            keyword_offsets=keyword_offsets,
+            sku_sizes=sku_sizes,
+            keyword_sizes=keyword_sizes,
+            combined_skus=combined_skus,
+            sku_displays=[format_sku_display(combined_sku) for combined_sku in combined_skus],
+            group_identifiers=artifacts.identifiers[keyword_offsets].tolist(),
+            group_roots=artifacts.roots[keyword_offsets].tolist(),
+            keywords=artifacts
+        )
+
+    def _campaign_batches(self, job: _GenerationJob, settings: CampaignSettings, batch_rows: int) -> List[range]:
+        """Split the job's campaigns into contiguous ranges of roughly batch_rows rows each"""
+        rows_per_campaign = (
+            2 + int(bool(settings.placement and settings.bid_adjustment))
+            + job.all_skus.size / len(job.sku_groups)
+            + job.keywords.keywords.size / len(job.keyword_groups)
+        )
+        campaigns_per_batch = max(1, int(batch_rows // rows_per_campaign))
+        return [
+            range(start, min(start + campaigns_per_batch, job.n_campaigns))
+            for start in range(0, job.n_campaigns, campaigns_per_batch)
+        ]
+
+    def _build_columns_parallel(self, job: _GenerationJob, settings: CampaignSettings) -> Dict[str, np.ndarray]:
+        """Build all columns by fanning campaign tiles out to a process pool.
+
+        Each worker receives the job once (pool initializer) and then only campaign ranges,
+        and returns dictionary-encoded columns. executor.map keeps tiles in submission
+        order, so the reassembled columns match the serial columnar engine exactly.
+        """
+        tiles = self._campaign_batches(job, settings, self.PARALLEL_TILE_ROWS)
+        workers = min(self.max_workers or os.cpu_count() or 1, len(tiles))
+        if workers <= 1:
+            return self._build_columns(job, settings)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_parallel_worker,
+                                 initargs=(self, job, settings)) as executor:
+            chunks = list(executor.map(_build_compact_tile, tiles))
+
+        return {
+            header: np.concatenate([_expand_column(*chunk[header]) for chunk in chunks])
+            for header in self.headers
+        }
+
+    def _build_columns(self, job: _GenerationJob, settings: CampaignSettings,
+                       campaigns: Optional[range] = None) -> Dict[str, np.ndarray]:
+        """Build bulk sheet columns as arrays, already formatted like _format_dataframe.
+
+        Campaigns are numbered in the same (sku group, keyword group, match type) order as the
+        row engine, and ``campaigns`` selects a contiguous range of them (all by default). Each
+        campaign is a block of Campaign, Ad Group, optional Bidding Adjustment, Product Ad and
+        Keyword rows; per-campaign values are computed once and scattered into the block
+        positions, and constant columns are broadcast.
+        """
+        if campaigns is None:
+            campaigns = range(job.n_campaigns)
+        match_types = job.match_types
+        has_adjustment = bool(settings.placement and settings.bid_adjustment)
+        start_date = job.start_date
+
+        # Decompose campaign numbers into (sku group, keyword group, match type)
+        n_keyword_groups, n_match_types = len(job.keyword_groups), len(match_types)
+        campaign_index = np.arange(campaigns.start, campaigns.stop, dtype=np.int64)
+        campaign_sku = campaign_index // (n_keyword_groups * n_match_types)
+        campaign_keyword = (campaign_index // n_match_types) % n_keyword_groups
+        campaign_match = campaign_index % n_match_types
+        campaign_keys = list(zip(campaign_sku.tolist(), campaign_keyword.tolist(), campaign_match.tolist()))
+
+        # Per-campaign values
+        render_campaign_name = compile_name_template(settings.campaign_name_template, start_date)
+        render_ad_group_name = compile_name_template(settings.ad_group_name_template, start_date)
+        campaign_ids = np.array([
+            f"{job.combined_skus[s]}_{match_types[m]}_{job.group_identifiers[k]}"
+            for s, k, m in campaign_keys
+        ], dtype=object)
+
+        # Block layout: Campaign, Ad Group, [Bidding Adjustment], Product Ads, Keywords
+        campaign_sku_sizes = job.sku_sizes[campaign_sku]
+        campaign_keyword_sizes = job.keyword_sizes[campaign_keyword]
+        n_campaigns = campaign_ids.size
+        entity_counts = np.column_stack([
+            np.ones(n_campaigns, dtype=np.int64),
+            np.ones(n_campaigns, dtype=np.int64),
+            np.full(n_campaigns, int(has_adjustment), dtype=np.int64),
+            campaign_sku_sizes,
+            campaign_keyword_sizes
+        ])
+        block_sizes = entity_counts.sum(axis=1)
+        n_rows = int(block_sizes.sum())
+        campaign_pos = np.cumsum(block_sizes) - block_sizes
+        ad_group_pos = campaign_pos + 1
+        adjustment_pos = campaign_pos + 2
+        product_ad_pos = _concat_ranges(campaign_pos + 2 + int(has_adjustment), campaign_sku_sizes)
+        keyword_pos = _concat_ranges(campaign_pos + 2 + int(has_adjustment) + campaign_sku_sizes,
+                                     campaign_keyword_sizes)
+
+        def constant(value: Any) -> np.ndarray:
+            return np.full(n_rows, value, dtype=object)
+
+        columns = {header: constant(None) for header in self.headers}
+        columns['Product'] = constant(self.PRODUCT)
+        columns['Operation'] = constant(self.OPERATION)
+        columns['State'] = constant(self.STATE)
+
+        entity_order = np.array([
+            self.ENTITY_CAMPAIGN,
+            self.ENTITY_AD_GROUP,
+            self.ENTITY_BIDDING_ADJUSTMENT,
+            self.ENTITY_PRODUCT_AD,
+            self.ENTITY_KEYWORD
+        ], dtype=object)
+        columns['Entity'] = np.repeat(np.tile(entity_order, n_campaigns), entity_counts.ravel())
+
+        columns['Campaign ID'] = np.repeat(campaign_ids, block_sizes)
+        columns['Ad Group ID'] = columns['Campaign ID'].copy()
+        columns['Ad Group ID'][campaign_pos] = None
+
+        # Campaign rows
+        columns['Campaign Name'][campaign_pos] = np.array([
+            render_campaign_name(sku=job.sku_displays[s], match_type=match_types[m],
+                                 keyword=job.group_identifiers[k], root=job.group_roots[k])
+            + "_" + job.group_identifiers[k]
+            for s, k, m in campaign_keys
+        ], dtype=object)
+        columns['Start Date'][campaign_pos] = start_date or None
+        columns['Targeting Type'][campaign_pos] = self.TARGETING_TYPE
+        columns['Daily Budget'][campaign_pos] = DataFormatter.format_amount(settings.daily_budget)
+        columns['Bidding Strategy'][campaign_pos] = self.BIDDING_STRATEGY
+
+        # Ad Group rows
+        columns['Ad Group Name'][ad_group_pos] = np.array([
+            render_ad_group_name(sku=job.sku_displays[s], match_type=match_types[m],
+                                 keyword=job.group_identifiers[k], root=job.group_roots[k])
+            + "_" + job.group_identifiers[k]
+            for s, k, m in campaign_keys
+        ], dtype=object)
+        default_bids = np.array([
+            DataFormatter.format_amount(settings.bids[match_type]) for match_type in match_types
+        ], dtype=object)
+        columns['Ad Group Default Bid'][ad_group_pos] = default_bids[campaign_match]
+
+        # Bidding Adjustment rows
+        if has_adjustment:
+            columns['Placement'][adjustment_pos] = settings.placement
+            columns['Percentage'][adjustment_pos] = settings.bid_adjustment
+
+        # Product Ad rows
+        columns['SKU'][product_ad_pos] = job.all_skus[
+            _concat_ranges(job.sku_offsets[campaign_sku], campaign_sku_sizes)
+        ]
+
+        # Keyword rows
+        keyword_index = _concat_ranges(job.keyword_offsets[campaign_keyword], campaign_keyword_sizes)
+        keyword_match = np.repeat(campaign_match, campaign_keyword_sizes)
+        columns['Keyword Text'][keyword_pos] = job.keywords.keywords[keyword_index]
+        columns['Match Type'][keyword_pos] = np.array(match_types, dtype=object)[keyword_match]
+        columns['Bid'][keyword_pos] = job.keywords.bid_strings[keyword_index, keyword_match]
+
+        # Same empty-string handling as _format_dataframe
+        for header in ('SKU', 'Keyword Text'):
+            column = columns[header]
+            column[column == ''] = None
+
+        return columns
+
     def _format_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Format the DataFrame for proper display and export"""
+        """Format the DataFrame for proper display and export (in place; returns df)"""
+        numeric_columns = ['Daily Budget', 'Bid', 'Ad Group Default Bid']
+
         # Convert empty strings to None for better Excel export
-        df = df.replace('', None)
+        for col in df.columns:
+            if col in numeric_columns or df[col].dtype != object:
+                continue
+            values = df[col].to_numpy()
+            empty = values == ''
+            if empty.any():
+                values = values.copy()
+                values[empty] = None
+                df[col] = values
         
-        # Format numeric columns
-        numeric_columns = ['Daily Budget', 'Bid', 'Ad Group Default Bid']
+        # Format numeric columns, formatting each distinct amount once
         for col in numeric_columns:
-            df[col] = pd.to_numeric(df[col], errors='ignore')
-            df[col] = df[col].map(lambda x: f'{x:.2f}' if pd.notnull(x) else None)
+            df[col] = DataFormatter.format_amount_column(df[col])
         
         return df
 
+    def _compact_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Store low-cardinality and always-empty columns as categoricals.
+
+        Values are unchanged (missing values stay missing), so CSV/XLSX exports are
+        identical; each row costs a small integer code instead of an object pointer.
+        """
+        with self.profiler.span('generate.compact', rows=len(df)):
+            for col in self.LOW_CARDINALITY_COLUMNS + self.EMPTY_COLUMNS:
+                if col in df.columns:
+                    df[col] = df[col].astype('category')
+        return df
+
     def get_example_data(self) -> Dict[str, List[str]]:
         """Get example data for demonstration"""
         return {
@@ -327,13 +781,19 @@ class BulkSheetGenerator:
         - Keyword: The exact keyword text
         - Bid: The bid amount for that keyword
         
+        Only these two columns are read, as text (with the pyarrow CSV reader when
+        it is installed), so keywords such as 'NA' or 'null' keep their text; bids
+        are then converted to floats.
+        
         Returns:
             Dict[str, float]: Dictionary mapping keywords to their specific bids
         """
-        df = pd.read_csv(csv_path)
-        if 'Keyword' not in df.columns or 'Bid' not in df.columns:
+        header = pd.read_csv(csv_path, nrows=0).columns
+        if 'Keyword' not in header or 'Bid' not in header:
             raise ValueError("CSV must contain 'Keyword' and 'Bid' columns")
         
+        df = read_text_columns(csv_path, ['Keyword', 'Bid'])
+        
         # Convert bids to float
         df['Bid'] = pd.to_numeric(df['Bid'], errors='coerce')
         
@@ -342,3 +802,31 @@ class BulkSheetGenerator:
         
         # Create dictionary with keyword as key and bid as float value
         return dict(zip(df['Keyword'], df['Bid'].astype(float)))
+
+    @staticmethod
+    def load_keyword_bid_table(csv_path: str, normalize: bool = True, chunk_rows: Optional[int] = None,
+                               cache_dir: Optional[str] = None) -> KeywordBidTable:
+        """Load keyword-specific bids from a large CSV file as a KeywordBidTable.
+        
+        Besides 'Keyword', the file may have a 'Bid' column and/or per-match-type
+        columns ('Exact Bid', 'Phrase Bid', 'Broad Bid'). Pass the table as
+        CampaignSettings.keyword_bids. With cache_dir, the parsed table is kept on
+        disk and reused while the CSV is unchanged (see KeywordBidTable.from_csv).
+        
+        Returns:
+            KeywordBidTable: Bids keyed by (normalized) keyword
+        """
+        return KeywordBidTable.from_csv(csv_path, normalize=normalize, chunk_rows=chunk_rows, cache_dir=cache_dir)
+
+# Per-process state for the parallel engine, set once per worker by _init_parallel_worker
+_worker_state: Dict[str, Any] = {}
+
+def _init_parallel_worker(generator: BulkSheetGenerator, job: _GenerationJob, settings: CampaignSettings) -> None:
+    """Process pool initializer: keep the job in the worker so tasks only carry campaign ranges"""
+    _worker_state['job'] = (generator, job, settings)
+
+def _build_compact_tile(campaigns: range) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Process pool task: build one tile of campaigns as dictionary-encoded columns"""
+    generator, job, settings = _worker_state['job']
+    columns = generator._build_columns(job, settings, campaigns)
+    return {header: _compact_column(values) for header, values in columns.items()}
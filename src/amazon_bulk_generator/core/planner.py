@@ -0,0 +1,385 @@
+"""
+Job size planning for bulk sheet generation.
+
+The generator takes the full cross product of SKU groups x keyword groups x
+match types, so row counts are known exactly before any row is built. This
+module computes them, estimates memory and output size, checks them against
+configurable limits and splits oversized jobs at SKU group / keyword group
+boundaries.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import os
+
+import numpy as np
+import pandas as pd
+
+from .bids import as_bid_table
+from .templates import (
+    TOKEN_DATE, TOKEN_KEYWORD, TOKEN_MATCH_TYPE, TOKEN_ROOT, TOKEN_SKU, TOKEN_TEXT,
+    clean_name_part, format_sku_display, keyword_root, tokenize_template
+)
+from ..utils.formatters import DataFormatter
+
+# Entity names, in bulk sheet order (same values as BulkSheetGenerator.ENTITY_*)
+ENTITY_CAMPAIGN = "Campaign"
+ENTITY_AD_GROUP = "Ad Group"
+ENTITY_BIDDING_ADJUSTMENT = "Bidding Adjustment"
+ENTITY_PRODUCT_AD = "Product Ad"
+ENTITY_KEYWORD = "Keyword"
+
+# Bytes of the constant fields every row carries in CSV output:
+# Product ("Sponsored Products"), Operation ("Create"), State ("enabled"),
+# 26 delimiters and the line terminator
+ROW_CONSTANT_BYTES = len("Sponsored Products") + len("Create") + len("enabled") + 26 + len(os.linesep)
+# Entity-specific constant fields (Entity plus fixed values such as Targeting Type)
+ENTITY_CONSTANT_BYTES = {
+    ENTITY_CAMPAIGN: len(ENTITY_CAMPAIGN) + len("MANUAL") + len("Dynamic bids - down only") + 8,  # + Start Date
+    ENTITY_AD_GROUP: len(ENTITY_AD_GROUP),
+    ENTITY_BIDDING_ADJUSTMENT: len(ENTITY_BIDDING_ADJUSTMENT),
+    ENTITY_PRODUCT_AD: len(ENTITY_PRODUCT_AD),
+    ENTITY_KEYWORD: len(ENTITY_KEYWORD)
+}
+COLUMN_COUNT = 27  # len(BulkSheetGenerator.headers)
+POINTER_BYTES = 8  # One object reference per cell in an object-dtype DataFrame
+STRING_OVERHEAD_BYTES = 49  # CPython str object header (ASCII)
+
+# Limit violations
+ROWS_LIMIT_ERROR = "Job would generate {:,} rows (limit {:,})"
+CAMPAIGNS_LIMIT_ERROR = "Job would generate {:,} campaigns (limit {:,})"
+MEMORY_LIMIT_ERROR = "Job needs an estimated {:,} bytes of memory (limit {:,})"
+OUTPUT_LIMIT_ERROR = "Job output is estimated at {:,} bytes (limit {:,})"
+UNSPLITTABLE_ERROR = (
+    "A single SKU group and keyword group has {:,} rows across all match types, "
+    "above the split limit of {:,}"
+)
+
+
+class JobTooLargeError(ValueError):
+    """Raised when a job exceeds the configured JobLimits"""
+
+
+@dataclass
+class JobLimits:
+    """Hard limits checked before generation starts (None = unlimited)"""
+    max_rows: Optional[int] = None
+    max_campaigns: Optional[int] = None
+    max_memory_bytes: Optional[int] = None
+    max_output_bytes: Optional[int] = None
+
+
+@dataclass
+class JobPlan:
+    """Exact row counts and size estimates for one generation job"""
+    sku_groups: int
+    keyword_groups: int
+    match_types: int
+    campaigns: int
+    rows_by_entity: Dict[str, int]
+    total_rows: int
+    estimated_memory_bytes: int  # Object-dtype DataFrame from generate_bulk_sheet
+    estimated_output_bytes: int  # CSV export (unquoted)
+    violations: List[str] = field(default_factory=list)  # Limits exceeded, filled by check_limits
+    parts: int = 1  # Sub-jobs needed to stay within the limits (0 if the job cannot be split)
+    sku_group_sizes: np.ndarray = field(default=None, repr=False, compare=False)
+    keyword_group_sizes: np.ndarray = field(default=None, repr=False, compare=False)
+    keyword_bids: np.ndarray = field(default=None, repr=False, compare=False)  # Resolved bid per (keyword, match type)
+
+    @property
+    def block_rows_fixed(self) -> int:
+        """Campaign, Ad Group and optional Bidding Adjustment rows of each campaign"""
+        return 2 + int(self.rows_by_entity[ENTITY_BIDDING_ADJUSTMENT] > 0)
+
+    @property
+    def within_limits(self) -> bool:
+        return not self.violations
+
+
+def _group_sizes(count: int, group_size: Optional[int]) -> np.ndarray:
+    """Sizes of the groups BulkSheetGenerator forms from `count` items"""
+    if not group_size or group_size <= 0:
+        return np.ones(count, dtype=np.int64)
+    sizes = np.full(count // group_size, group_size, dtype=np.int64)
+    if count % group_size:
+        sizes = np.append(sizes, count % group_size)
+    return sizes
+
+
+def _group_starts(count: int, group_size: Optional[int]) -> range:
+    """Index of the first item of each group"""
+    return range(0, count, group_size if group_size and group_size > 0 else 1)
+
+
+def _name_lengths(template: str, sku_displays: List[str], match_types: List[str],
+                  identifiers: List[str], roots: List[str]) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+    """Separable parts of a rendered name's length: constant, per SKU group, per match type, per keyword group"""
+    counts = {kind: 0 for kind in (TOKEN_SKU, TOKEN_MATCH_TYPE, TOKEN_KEYWORD, TOKEN_ROOT)}
+    constant = 0
+    for kind, text in tokenize_template(template):
+        if kind == TOKEN_TEXT:
+            constant += len(text)
+        elif kind == TOKEN_DATE:
+            constant += len(text)  # Each example date renders to a date of the same length
+        else:
+            counts[kind] += 1
+    per_sku = counts[TOKEN_SKU] * np.array([len(s) for s in sku_displays], dtype=np.int64)
+    per_match = counts[TOKEN_MATCH_TYPE] * np.array([len(m) for m in match_types], dtype=np.int64)
+    per_keyword = (
+        counts[TOKEN_KEYWORD] * np.array([len(i) for i in identifiers], dtype=np.int64)
+        + counts[TOKEN_ROOT] * np.array([len(r) for r in roots], dtype=np.int64)
+    )
+    return constant, per_sku, per_match, per_keyword
+
+
+def plan_job(keywords: List[str], skus: List[str], settings) -> JobPlan:
+    """
+    Compute exact row counts and size estimates without generating rows
+
+    Args:
+        keywords: Keywords of the job
+        skus: SKUs of the job
+        settings: CampaignSettings of the job
+
+    Returns:
+        JobPlan for the job
+    """
+    match_types = [match_type.lower() for match_type in settings.match_types]
+    sku_sizes = _group_sizes(len(skus), settings.sku_group_size)
+    keyword_sizes = _group_sizes(len(keywords), settings.keyword_group_size)
+    n_sku_groups, n_keyword_groups, n_match_types = sku_sizes.size, keyword_sizes.size, len(match_types)
+    has_adjustment = bool(settings.placement and settings.bid_adjustment)
+
+    campaigns = n_sku_groups * n_keyword_groups * n_match_types
+    rows_by_entity = {
+        ENTITY_CAMPAIGN: campaigns,
+        ENTITY_AD_GROUP: campaigns,
+        ENTITY_BIDDING_ADJUSTMENT: campaigns if has_adjustment else 0,
+        ENTITY_PRODUCT_AD: len(skus) * n_keyword_groups * n_match_types,
+        ENTITY_KEYWORD: len(keywords) * n_sku_groups * n_match_types
+    }
+    total_rows = sum(rows_by_entity.values())
+
+    # Per-group string lengths; every campaign-level sum below is separable over
+    # (SKU group, keyword group, match type), so nothing is summed per campaign
+    sku_starts = _group_starts(len(skus), settings.sku_group_size)
+    combined_skus = ["_".join(skus[start:start + size]) for start, size in zip(sku_starts, sku_sizes.tolist())]
+    keyword_firsts = [keywords[start] for start in _group_starts(len(keywords), settings.keyword_group_size)]
+    identifiers = [clean_name_part(keyword) for keyword in keyword_firsts]
+    roots = [keyword_root(keyword) for keyword in keyword_firsts]
+    sku_id_lengths = np.array([len(s) for s in combined_skus], dtype=np.int64)
+    match_lengths = np.array([len(m) for m in match_types], dtype=np.int64)
+    identifier_lengths = np.array([len(i) for i in identifiers], dtype=np.int64)
+
+    def campaign_sum(per_sku: np.ndarray, per_match: np.ndarray, per_keyword: np.ndarray) -> int:
+        """Sum over all campaigns of per_sku[s] + per_match[m] + per_keyword[k]"""
+        return int(
+            n_keyword_groups * n_match_types * per_sku.sum()
+            + n_sku_groups * n_keyword_groups * per_match.sum()
+            + n_sku_groups * n_match_types * per_keyword.sum()
+        )
+
+    # Campaign ID appears on every row of its block, Ad Group ID on all but the campaign row
+    block_rows_fixed = 2 + int(has_adjustment)
+    id_lengths_sum = campaign_sum(sku_id_lengths + 2, match_lengths, identifier_lengths)
+    sku_rows_by_group = n_match_types * (n_keyword_groups * (block_rows_fixed + sku_sizes) + len(keywords))
+    keyword_rows_by_group = n_match_types * (n_sku_groups * (block_rows_fixed + keyword_sizes) + len(skus))
+    id_bytes = (
+        # Sum over campaigns of block_rows * id_length, split into its separable parts
+        int((sku_rows_by_group * (sku_id_lengths + 2)).sum())
+        + int((keyword_rows_by_group * identifier_lengths).sum())
+        + int(match_lengths.sum()) * (total_rows // max(n_match_types, 1))
+    ) * 2 - id_lengths_sum
+
+    name_bytes = 0
+    sku_displays = [format_sku_display(s) for s in combined_skus]
+    for template in (settings.campaign_name_template, settings.ad_group_name_template):
+        constant, per_sku, per_match, per_keyword = _name_lengths(
+            template, sku_displays, match_types, identifiers, roots
+        )
+        name_bytes += campaigns * (constant + 1) + campaign_sum(per_sku, per_match, per_keyword + identifier_lengths)
+
+    def amount_length(value) -> int:
+        return len(DataFormatter.format_amount(value) or '')
+
+    default_bid_lengths = [amount_length(settings.bids[match_type]) for match_type in match_types]
+    bids = as_bid_table(settings.keyword_bids).resolve(keywords, match_types, settings.bids)
+    keyword_bid_bytes = int(pd.Series(DataFormatter.format_amount_column(bids.ravel())).str.len().sum())
+
+    entity_bytes = sum(ENTITY_CONSTANT_BYTES[entity] * count for entity, count in rows_by_entity.items())
+    value_bytes = (
+        rows_by_entity[ENTITY_CAMPAIGN] * amount_length(settings.daily_budget)  # Daily Budget
+        + n_sku_groups * n_keyword_groups * sum(default_bid_lengths)  # Ad Group Default Bid
+        + rows_by_entity[ENTITY_BIDDING_ADJUSTMENT] * (len(settings.placement or '') + len(settings.bid_adjustment or ''))
+        + n_keyword_groups * n_match_types * sum(len(sku) for sku in skus)  # SKU
+        + n_sku_groups * n_match_types * sum(len(keyword) for keyword in keywords)  # Keyword Text
+        + n_sku_groups * keyword_bid_bytes  # Bid
+        + n_sku_groups * len(keywords) * int(match_lengths.sum())  # Match Type
+    )
+    output_bytes = total_rows * ROW_CONSTANT_BYTES + entity_bytes + id_bytes + name_bytes + value_bytes
+
+    # Object DataFrame: one pointer per cell plus the strings created per campaign
+    # (ID and names); other values are shared objects
+    memory_bytes = (
+        total_rows * COLUMN_COUNT * POINTER_BYTES
+        + campaigns * 3 * STRING_OVERHEAD_BYTES + id_lengths_sum + name_bytes
+    )
+
+    return JobPlan(
+        sku_groups=n_sku_groups,
+        keyword_groups=n_keyword_groups,
+        match_types=n_match_types,
+        campaigns=campaigns,
+        rows_by_entity=rows_by_entity,
+        total_rows=total_rows,
+        estimated_memory_bytes=int(memory_bytes),
+        estimated_output_bytes=int(output_bytes),
+        sku_group_sizes=sku_sizes,
+        keyword_group_sizes=keyword_sizes,
+        keyword_bids=bids
+    )
+
+
+def _row_ceiling(plan: JobPlan, limits: JobLimits) -> Optional[int]:
+    """Largest row count per part that keeps every limit, using the plan's per-row averages"""
+    ceilings = []
+    if limits.max_rows is not None:
+        ceilings.append(limits.max_rows)
+    if plan.total_rows:
+        if limits.max_campaigns is not None:
+            ceilings.append(limits.max_campaigns * plan.total_rows // max(plan.campaigns, 1))
+        if limits.max_memory_bytes is not None:
+            ceilings.append(limits.max_memory_bytes * plan.total_rows // max(plan.estimated_memory_bytes, 1))
+        if limits.max_output_bytes is not None:
+            ceilings.append(limits.max_output_bytes * plan.total_rows // max(plan.estimated_output_bytes, 1))
+    return min(ceilings) if ceilings else None
+
+
+def check_limits(plan: JobPlan, limits: Optional[JobLimits]) -> JobPlan:
+    """
+    Record which limits a plan exceeds and how many parts a split would need
+
+    Args:
+        plan: Plan from plan_job
+        limits: Limits to check, or None for no limits
+
+    Returns:
+        The same plan with violations and parts filled in
+    """
+    plan.violations = []
+    plan.parts = 1
+    if limits is None:
+        return plan
+
+    checks = [
+        (plan.total_rows, limits.max_rows, ROWS_LIMIT_ERROR),
+        (plan.campaigns, limits.max_campaigns, CAMPAIGNS_LIMIT_ERROR),
+        (plan.estimated_memory_bytes, limits.max_memory_bytes, MEMORY_LIMIT_ERROR),
+        (plan.estimated_output_bytes, limits.max_output_bytes, OUTPUT_LIMIT_ERROR)
+    ]
+    for value, limit, message in checks:
+        if limit is not None and value > limit:
+            plan.violations.append(message.format(value, limit))
+
+    ceiling = _row_ceiling(plan, limits)
+    if plan.violations and ceiling:
+        try:
+            plan.parts = len(_part_bounds(plan, ceiling))
+        except JobTooLargeError as error:
+            plan.violations.append(str(error))
+            plan.parts = 0
+    return plan
+
+
+def enforce_limits(plan: JobPlan, limits: Optional[JobLimits]) -> JobPlan:
+    """
+    Check a plan against limits and reject it if any is exceeded
+
+    Raises:
+        JobTooLargeError: If the plan exceeds a limit
+    """
+    check_limits(plan, limits)
+    if plan.violations:
+        raise JobTooLargeError("; ".join(plan.violations))
+    return plan
+
+
+def split_job(keywords: List[str], skus: List[str], settings,
+              limits: JobLimits) -> List[Tuple[List[str], List[str]]]:
+    """
+    Split a job into sub-jobs that each stay within the limits
+
+    Parts are cut at SKU group boundaries, and a single SKU group that is still
+    too large is cut at keyword group boundaries, so each part groups its inputs
+    exactly as the whole job would. Generating the parts in order and
+    concatenating them gives the same rows as generating the whole job.
+
+    Args:
+        keywords: Keywords of the job
+        skus: SKUs of the job
+        settings: CampaignSettings of the job
+        limits: Limits each part must respect
+
+    Returns:
+        List of (keywords, skus) pairs, in generation order
+
+    Raises:
+        JobTooLargeError: If one keyword group of one SKU group is larger than the limits allow
+    """
+    plan = plan_job(keywords, skus, settings)
+    ceiling = _row_ceiling(plan, limits)
+    if ceiling is None or plan.total_rows <= ceiling:
+        return [(keywords, skus)]
+    return [
+        (keywords[keyword_start:keyword_end], skus[sku_start:sku_end])
+        for sku_start, sku_end, keyword_start, keyword_end in _part_bounds(plan, ceiling)
+    ]
+
+
+def _part_bounds(plan: JobPlan, ceiling: int) -> List[Tuple[int, int, int, int]]:
+    """
+    Cut a job into parts of at most `ceiling` rows
+
+    Parts are cut at SKU group boundaries, and a single SKU group that is still
+    too large is cut at keyword group boundaries.
+
+    Returns:
+        (sku_start, sku_end, keyword_start, keyword_end) input index ranges of each part
+
+    Raises:
+        JobTooLargeError: If one keyword group of one SKU group is larger than the ceiling
+    """
+    n_match_types, block_rows_fixed = plan.match_types, plan.block_rows_fixed
+    sku_sizes = plan.sku_group_sizes.tolist()
+    keyword_sizes = plan.keyword_group_sizes.tolist()
+    n_keywords = sum(keyword_sizes)
+
+    bounds = []
+    pending_start, pending_rows, sku_start = 0, 0, 0
+    for sku_size in sku_sizes:
+        group_rows = n_match_types * (len(keyword_sizes) * (block_rows_fixed + sku_size) + n_keywords)
+        if pending_rows and pending_rows + group_rows > ceiling:
+            bounds.append((pending_start, sku_start, 0, n_keywords))
+            pending_start, pending_rows = sku_start, 0
+
+        if group_rows <= ceiling:
+            pending_rows += group_rows
+        else:
+            # Split this SKU group's keyword groups
+            sku_end = sku_start + sku_size
+            keyword_start, chunk_start, chunk_rows = 0, 0, 0
+            for keyword_size in keyword_sizes:
+                block_rows = n_match_types * (block_rows_fixed + sku_size + keyword_size)
+                if block_rows > ceiling:
+                    raise JobTooLargeError(UNSPLITTABLE_ERROR.format(block_rows, ceiling))
+                if chunk_rows + block_rows > ceiling:
+                    bounds.append((sku_start, sku_end, chunk_start, keyword_start))
+                    chunk_start, chunk_rows = keyword_start, 0
+                chunk_rows += block_rows
+                keyword_start += keyword_size
+            bounds.append((sku_start, sku_end, chunk_start, n_keywords))
+            pending_start = sku_end
+        sku_start += sku_size
+
+    if pending_rows:
+        bounds.append((pending_start, sku_start, 0, n_keywords))
+    return bounds
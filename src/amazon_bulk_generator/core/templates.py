@@ -0,0 +1,121 @@
+"""
+Campaign and ad group name templates.
+
+A template is literal text with placeholders substituted per campaign:
+
+- ``[SKU]``: the SKU, or ``first+N`` for a group of N+1 SKUs
+- ``match_type``: the match type
+- ``[KW]``: the campaign's keyword identifier (first keyword of the group, cleaned)
+- ``[Root]``: the root term of that keyword (its first word, cleaned)
+- date tokens (``250423``, ``04/23/2025``, ``23-04-2025``, ``Apr 23, 2025``): the
+  campaign start date in the same format as the example date
+
+Templates are tokenized once and compiled per job into a ``str.format`` call,
+with the date tokens already rendered.
+"""
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Tuple
+import re
+
+# Token kinds (placeholder kinds double as str.format field names)
+TOKEN_TEXT = "text"
+TOKEN_DATE = "date"
+TOKEN_SKU = "sku"
+TOKEN_MATCH_TYPE = "match_type"
+TOKEN_KEYWORD = "keyword"
+TOKEN_ROOT = "root"
+
+# Placeholders and the token kind they produce
+PLACEHOLDERS = {
+    '[SKU]': TOKEN_SKU,
+    'match_type': TOKEN_MATCH_TYPE,
+    '[KW]': TOKEN_KEYWORD,
+    '[Root]': TOKEN_ROOT
+}
+
+# Example start dates inserted by the UI and the strftime format each one stands for
+DATE_TOKENS = {
+    '250423': '%d%m%y',
+    '04/23/2025': '%m/%d/%Y',
+    '23-04-2025': '%d-%m-%Y',
+    'Apr 23, 2025': '%b %d, %Y'
+}
+
+# Start date format passed to compile_name_template (BulkSheetGenerator.DATE_FORMAT)
+START_DATE_FORMAT = "%Y%m%d"
+
+_TOKEN_PATTERN = re.compile('|'.join(
+    re.escape(token) for token in sorted(list(DATE_TOKENS) + list(PLACEHOLDERS), key=len, reverse=True)
+))
+_NAME_PART_PATTERN = re.compile(r'[^a-zA-Z0-9]')
+
+Token = Tuple[str, str]  # (kind, text)
+
+
+def clean_name_part(text: str) -> str:
+    """Reduce text to a lowercase identifier usable in campaign IDs and names"""
+    return _NAME_PART_PATTERN.sub('_', text).lower()
+
+
+def keyword_root(keyword: str) -> str:
+    """Root term of a keyword (its first word), cleaned like clean_name_part"""
+    words = keyword.split()
+    return clean_name_part(words[0]) if words else ''
+
+
+def format_sku_display(combined_sku: str) -> str:
+    """SKU as shown in names: grouped SKUs become first SKU + count of the others"""
+    sku_parts = combined_sku.split('_')
+    if len(sku_parts) > 1:
+        return f"{sku_parts[0]}+{len(sku_parts)-1}"
+    return combined_sku
+
+
+@lru_cache(maxsize=256)
+def tokenize_template(template: str) -> Tuple[Token, ...]:
+    """
+    Split a name template into (kind, text) tokens
+
+    Args:
+        template: Campaign or ad group name template
+
+    Returns:
+        Tuple of tokens; text tokens hold literal text, the others hold the
+        placeholder or date token they were matched from
+    """
+    tokens = []
+    position = 0
+    for match in _TOKEN_PATTERN.finditer(template):
+        if match.start() > position:
+            tokens.append((TOKEN_TEXT, template[position:match.start()]))
+        text = match.group()
+        tokens.append((PLACEHOLDERS.get(text, TOKEN_DATE), text))
+        position = match.end()
+    if position < len(template):
+        tokens.append((TOKEN_TEXT, template[position:]))
+    return tuple(tokens)
+
+
+@lru_cache(maxsize=256)
+def compile_name_template(template: str, start_date: str) -> Callable[..., str]:
+    """
+    Compile a name template for one job
+
+    Args:
+        template: Campaign or ad group name template
+        start_date: Campaign start date in START_DATE_FORMAT
+
+    Returns:
+        Render function called as render(sku=..., match_type=..., keyword=..., root=...)
+    """
+    date_obj = datetime.strptime(start_date, START_DATE_FORMAT)
+    parts = []
+    for kind, text in tokenize_template(template):
+        if kind == TOKEN_TEXT:
+            parts.append(text.replace('{', '{{').replace('}', '}}'))
+        elif kind == TOKEN_DATE:
+            parts.append(date_obj.strftime(DATE_TOKENS[text]).replace('{', '{{').replace('}', '}}'))
+        else:
+            parts.append('{' + kind + '}')
+    return ''.join(parts).format
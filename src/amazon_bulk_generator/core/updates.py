@@ -0,0 +1,187 @@
+"""
+Bid updates for existing campaigns.
+
+Joins a table of new bids against a BulkSheetIndex and produces Update rows
+for the keywords and ad groups whose bid actually changes. No campaign
+structure is generated: each output row only carries the IDs that locate the
+entity and the new bid.
+"""
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .bulk_index import ENTITY_AD_GROUP, ENTITY_KEYWORD, BulkSheetIndex, normalize_keyword_column
+from ..utils.formatters import DataFormatter
+
+OPERATION_UPDATE = "Update"
+
+# Optional bid table columns that restrict a bid to one campaign / ad group
+SCOPE_COLUMNS = ['Campaign ID', 'Ad Group ID']
+# Columns that locate an ad group by name; ad group names repeat across campaigns
+AD_GROUP_NAME_COLUMNS = ['Campaign Name', 'Ad Group Name']
+
+# Bid table errors
+MISSING_COLUMNS_ERROR = "{} bids need the column(s) {}"
+AD_GROUP_KEY_ERROR = "Ad group bids need an 'Ad Group ID' column, or 'Campaign Name' and 'Ad Group Name' columns"
+AMBIGUOUS_AD_GROUP_ERROR = "{:,} ad group bid(s) match several ad groups, e.g. {}; add an 'Ad Group ID' column"
+
+
+def _cents(values: pd.Series) -> np.ndarray:
+    """Amounts as whole cents (NaN for empty or non-numeric values)"""
+    numeric = pd.to_numeric(pd.Series(values, copy=False), errors='coerce')
+    return np.round(numeric.to_numpy(dtype=float, na_value=np.nan) * 100)
+
+
+def _require_columns(bids: pd.DataFrame, columns: List[str], kind: str) -> None:
+    """Raise ValueError if a bid table lacks any of the columns"""
+    missing = [column for column in columns if column not in bids.columns]
+    if missing:
+        raise ValueError(MISSING_COLUMNS_ERROR.format(kind, ", ".join(repr(column) for column in missing)))
+
+
+def _scope_columns(bids: pd.DataFrame) -> List[str]:
+    """Scope columns present in a bid table"""
+    return [column for column in SCOPE_COLUMNS if column in bids.columns]
+
+
+def _changed(joined: pd.DataFrame, current: str, new: str) -> pd.DataFrame:
+    """Rows of a join whose new amount differs from the current one"""
+    current_cents = _cents(joined[current])
+    new_cents = _cents(joined[new])
+    return joined[~np.isnan(new_cents) & (current_cents != new_cents)]
+
+
+def keyword_bid_updates(index: BulkSheetIndex, bids: pd.DataFrame) -> pd.DataFrame:
+    """
+    Join new keyword bids against the indexed keywords
+
+    Args:
+        index: Index of the existing bulk sheet
+        bids: Table with 'Keyword Text' and 'Bid' columns, plus optional 'Match Type'
+            (otherwise the bid applies to every match type) and SCOPE_COLUMNS.
+            Keyword text is matched case- and spacing-insensitively; for duplicate
+            keys the last row wins.
+
+    Returns:
+        Positions in index.keywords ('position') and new bids ('New Bid') of the changed keywords
+
+    Raises:
+        ValueError: If 'Keyword Text' or 'Bid' is missing
+    """
+    _require_columns(bids, ['Keyword Text', 'Bid'], 'Keyword')
+    keys = ['normalized'] + (['match_type'] if 'Match Type' in bids.columns else []) + _scope_columns(bids)
+    table = pd.DataFrame({'normalized': normalize_keyword_column(bids['Keyword Text']), 'New Bid': bids['Bid']})
+    if 'Match Type' in bids.columns:
+        table['match_type'] = bids['Match Type'].astype(str).str.strip().str.lower()
+    for column in _scope_columns(bids):
+        table[column] = bids[column].astype(str).str.strip()
+    table = table.drop_duplicates(subset=keys, keep='last')
+
+    keywords = index.keywords
+    existing = pd.DataFrame({
+        'position': np.arange(len(keywords)),
+        'normalized': keywords['normalized'],
+        'match_type': keywords['Match Type'].astype(str).str.lower(),
+        'Bid': keywords['Bid']
+    })
+    for column in _scope_columns(bids):
+        existing[column] = keywords[column].astype(str)
+
+    joined = existing.merge(table, on=keys, how='inner', sort=False)
+    return _changed(joined, 'Bid', 'New Bid')[['position', 'New Bid']].sort_values('position')
+
+
+def ad_group_bid_updates(index: BulkSheetIndex, bids: pd.DataFrame) -> pd.DataFrame:
+    """
+    Join new ad group default bids against the indexed ad groups
+
+    Args:
+        index: Index of the existing bulk sheet
+        bids: Table with 'Ad Group Default Bid' and either 'Ad Group ID' (optionally
+            with 'Campaign ID') or 'Campaign Name' and 'Ad Group Name'; for duplicate
+            keys the last row wins
+
+    Returns:
+        Positions in index.ad_groups ('position') and new bids ('New Bid') of the changed ad groups
+
+    Raises:
+        ValueError: If the key or bid columns are missing, or a name pair matches
+            more than one ad group
+    """
+    _require_columns(bids, ['Ad Group Default Bid'], 'Ad group')
+    if 'Ad Group ID' in bids.columns:
+        keys = _scope_columns(bids)
+    elif all(column in bids.columns for column in AD_GROUP_NAME_COLUMNS):
+        keys = AD_GROUP_NAME_COLUMNS
+    else:
+        raise ValueError(AD_GROUP_KEY_ERROR)
+    table = bids[keys].astype(str).apply(lambda column: column.str.strip())
+    table['New Bid'] = bids['Ad Group Default Bid']
+    table = table.drop_duplicates(subset=keys, keep='last')
+
+    ad_groups = index.ad_groups
+    existing = pd.DataFrame({'position': np.arange(len(ad_groups))})
+    for column in keys:
+        if column == 'Campaign Name':
+            # Ad group rows carry the campaign by ID; take the name from the parent campaign
+            # (position -1, a campaign missing from the file, picks the trailing '')
+            names = index.campaigns['Campaign Name'].astype(str).to_numpy(dtype=object)
+            existing[column] = np.append(names, '')[ad_groups['campaign'].to_numpy()]
+        else:
+            existing[column] = ad_groups[column].astype(str).to_numpy(dtype=object)
+    existing['Ad Group Default Bid'] = ad_groups['Ad Group Default Bid'].to_numpy(dtype=object)
+
+    joined = existing.merge(table, on=keys, how='inner', sort=False)
+    if keys == AD_GROUP_NAME_COLUMNS:
+        ambiguous = joined[joined.duplicated(subset=keys, keep=False)].drop_duplicates(subset=keys)
+        if len(ambiguous):
+            example = " / ".join(ambiguous.iloc[0][keys])
+            raise ValueError(AMBIGUOUS_AD_GROUP_ERROR.format(len(ambiguous), repr(example)))
+    return _changed(joined, 'Ad Group Default Bid', 'New Bid')[['position', 'New Bid']].sort_values('position')
+
+
+def build_update_rows(index: BulkSheetIndex, headers: List[str], product: str,
+                      keyword_bids: Optional[pd.DataFrame] = None,
+                      ad_group_bids: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Build Update rows for changed bids
+
+    Args:
+        index: Index of the existing bulk sheet
+        headers: Bulk sheet column headers
+        product: Product column value
+        keyword_bids: New keyword bids (see keyword_bid_updates)
+        ad_group_bids: New ad group default bids (see ad_group_bid_updates)
+
+    Returns:
+        DataFrame in bulk sheet layout: Ad Group rows, then Keyword rows, in index order
+    """
+    frames = []
+    if ad_group_bids is not None:
+        changes = ad_group_bid_updates(index, ad_group_bids)
+        ad_groups = index.ad_groups.iloc[changes['position'].to_numpy()]
+        frames.append(pd.DataFrame({
+            'Entity': ENTITY_AD_GROUP,
+            'Campaign ID': ad_groups['Campaign ID'].astype(str).to_numpy(dtype=object),
+            'Ad Group ID': ad_groups['Ad Group ID'].astype(str).to_numpy(dtype=object),
+            'Ad Group Default Bid': DataFormatter.format_amount_column(changes['New Bid'])
+        }))
+    if keyword_bids is not None:
+        changes = keyword_bid_updates(index, keyword_bids)
+        keywords = index.keywords.iloc[changes['position'].to_numpy()]
+        frames.append(pd.DataFrame({
+            'Entity': ENTITY_KEYWORD,
+            'Campaign ID': keywords['Campaign ID'].astype(str).to_numpy(dtype=object),
+            'Ad Group ID': keywords['Ad Group ID'].astype(str).to_numpy(dtype=object),
+            'Keyword ID': keywords['Keyword ID'].to_numpy(dtype=object),
+            'Keyword Text': keywords['Keyword Text'].to_numpy(dtype=object),
+            'Match Type': keywords['Match Type'].astype(str).to_numpy(dtype=object),
+            'Bid': DataFormatter.format_amount_column(changes['New Bid'])
+        }))
+
+    rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['Entity'])
+    rows.insert(0, 'Product', product)
+    rows.insert(2, 'Operation', OPERATION_UPDATE)
+    rows = rows.reindex(columns=headers).astype(object)
+    return rows.where(rows.notna() & (rows != ''), None)
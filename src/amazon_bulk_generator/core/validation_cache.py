@@ -0,0 +1,219 @@
+"""
+Validation results cached by input content.
+
+Streamlit reruns the whole script on every widget interaction, so the pasted
+keywords/SKUs would be parsed and validated again each time although they
+rarely change. A ValidationCache keys parsed lists and ValidationReports by a
+BLAKE2 hash of the input, keeps the most recently used entries up to a fixed
+count and is safe to share between sessions (one lock around the LRU; the
+work itself runs outside it).
+
+Cached reports are shared, so they are treated as read-only: their arrays are
+made non-writeable and parsed lists are handed out as copies.
+
+An IncrementalValidator serves one text area of one session instead: it keeps
+a hash and the result of every line of the previous input, and validates only
+the lines between the unchanged beginning and end of the list, so editing,
+adding or deleting a line of a long list does not re-validate the rest. Lines
+are compared by their 64-bit string hash.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Any, Callable, Hashable, List, Optional, Sequence
+import threading
+
+import numpy as np
+
+from .validators import ValidationReport, as_text, validate_keywords_batch, validate_skus_batch
+from ..utils.formatters import TextFormatter
+
+# Cached inputs (parsed texts and validated lists) kept before the least recently used is dropped
+DEFAULT_MAX_ENTRIES = 32
+
+_DIGEST_SIZE = 16
+
+# Batch validator per input kind
+BATCH_VALIDATORS = {
+    'keywords': validate_keywords_batch,
+    'skus': validate_skus_batch
+}
+
+# Reason code stored for lines that passed
+_VALID = -1
+
+def content_hash(text: str) -> bytes:
+    """Fast 128-bit hash of a text"""
+    return blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=_DIGEST_SIZE).digest()
+
+
+def list_content_hash(values: List[str]) -> bytes:
+    """Fast 128-bit hash of a list of strings (the item lengths keep item boundaries unambiguous)"""
+    digest = blake2b(digest_size=_DIGEST_SIZE)
+    digest.update(np.fromiter(map(len, values), dtype=np.int64, count=len(values)).tobytes())
+    digest.update(''.join(values).encode('utf-8', 'surrogatepass'))
+    return digest.digest()
+
+
+@dataclass
+class CacheStats:
+    """Counters of a ValidationCache"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ValidationCache:
+    """Bounded LRU of parsed and validated keyword/SKU inputs, keyed by content hash"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def clean_text_input(self, text: str) -> List[str]:
+        """TextFormatter.clean_text_input, cached"""
+        items = self._get(('text', content_hash(text)), lambda: tuple(TextFormatter.clean_text_input(text)))
+        return list(items)
+
+    def validate_keywords(self, keywords: Sequence[Any]) -> ValidationReport:
+        """validate_keywords_batch, cached"""
+        values = as_text(keywords)
+        return self._get(('keywords', list_content_hash(values)),
+                         lambda: _freeze(validate_keywords_batch(values)))
+
+    def validate_skus(self, skus: Sequence[Any]) -> ValidationReport:
+        """validate_skus_batch, cached"""
+        values = as_text(skus)
+        return self._get(('skus', list_content_hash(values)), lambda: _freeze(validate_skus_batch(values)))
+
+    def stats(self) -> CacheStats:
+        """Snapshot of the hit/miss/eviction counters"""
+        with self._lock:
+            return CacheStats(hits=self._stats.hits, misses=self._stats.misses,
+                              evictions=self._stats.evictions, entries=len(self._entries))
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._stats = CacheStats()
+
+    def _get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return self._entries[key]
+            self._stats.misses += 1
+
+        # Computed without the lock so other sessions are not held up; two sessions
+        # missing the same input at once both compute it and store equal values
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+        return value
+
+
+def _freeze(report: ValidationReport) -> ValidationReport:
+    """Make a report's arrays read-only before it is shared"""
+    report.invalid_indexes.flags.writeable = False
+    report.reason_codes.flags.writeable = False
+    return report
+
+
+class IncrementalValidator:
+    """Validates successive versions of one keyword or SKU list, re-checking only edited lines"""
+
+    def __init__(self, kind: str):
+        """
+        Initialize IncrementalValidator
+        
+        Args:
+            kind: 'keywords' or 'skus' (a key of BATCH_VALIDATORS)
+        """
+        if kind not in BATCH_VALIDATORS:
+            raise ValueError(f"Unsupported validation kind: {kind}")
+        self.kind = kind
+        self.last_validated = 0  # Lines validated by the latest update
+        self._validate = BATCH_VALIDATORS[kind]
+        self._empty_report = self._validate([])  # Field names and limits, and the empty list error
+        self._hashes = np.empty(0, dtype=np.int64)  # Hash of every line of the previous input
+        self._codes = np.empty(0, dtype=np.int8)  # Reason code of every line, _VALID if it passed
+        self._values: Optional[List[str]] = None
+        self._report: Optional[ValidationReport] = None
+
+    def update(self, items: Sequence[Any]) -> ValidationReport:
+        """
+        Validate the current version of the list
+        
+        Args:
+            items: All keywords or SKUs, e.g. from TextFormatter.clean_text_input
+            
+        Returns:
+            Report equal to validate_keywords_batch / validate_skus_batch over items
+        """
+        values = as_text(items)
+        if values == self._values:
+            self.last_validated = 0
+            return self._report
+
+        hashes = np.fromiter(map(hash, values), dtype=np.int64, count=len(values))
+        old_hashes, old_codes = self._hashes, self._codes
+        prefix = _common_length(old_hashes, hashes)
+        suffix = _common_length(old_hashes[prefix:][::-1], hashes[prefix:][::-1])
+        changed = values[prefix:len(values) - suffix]
+
+        changed_codes = np.full(len(changed), _VALID, dtype=np.int8)
+        if changed:
+            report = self._validate(changed)
+            changed_codes[report.invalid_indexes] = report.reason_codes
+        self.last_validated = len(changed)
+        codes = np.concatenate([old_codes[:prefix], changed_codes, old_codes[len(old_codes) - suffix:]])
+
+        if values:
+            invalid_indexes = np.flatnonzero(codes != _VALID)
+            template = self._empty_report
+            report = ValidationReport(
+                field_name=template.field_name,
+                plural=template.plural,
+                max_length=template.max_length,
+                total=len(values),
+                invalid_indexes=invalid_indexes,
+                reason_codes=codes[invalid_indexes],
+                invalid_values=[values[i] for i in invalid_indexes]
+            )
+        else:
+            report = self._empty_report
+
+        self._hashes, self._codes = hashes, codes
+        self._values, self._report = list(values), report
+        return report
+
+    def reset(self) -> None:
+        """Forget the previous input"""
+        self.__init__(self.kind)
+
+
+def _common_length(old: np.ndarray, new: np.ndarray) -> int:
+    """Length of the common prefix of two hash arrays"""
+    shortest = min(len(old), len(new))
+    differ = old[:shortest] != new[:shortest]
+    return int(differ.argmax()) if differ.any() else shortest
+
+
+# Cache shared by every session of the app process
+VALIDATION_CACHE = ValidationCache()
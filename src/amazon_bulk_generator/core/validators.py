@@ -1,7 +1,14 @@
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional, Union
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import compress
+from typing import Any, List, Dict, Sequence, Tuple, Optional, Union
 import re
 
+import numpy as np
+
+from .templates import TOKEN_MATCH_TYPE, TOKEN_SKU, tokenize_template
+
 # Amazon's validation limits
 MAX_KEYWORD_LENGTH = 80  # Maximum allowed length for keywords
 MAX_SKU_LENGTH = 40  # Maximum allowed length for SKUs
@@ -28,6 +35,8 @@ EMPTY_ITEM_ERROR = "Empty value found in {}"
 LENGTH_ERROR = "Invalid length for {}: '{}' exceeds maximum length of {}"
 INVALID_CHARS_ERROR = "Invalid characters in {}: {}"
 TEMPLATE_LENGTH_ERROR = "{} exceeds maximum length"
+TEMPLATE_CUSTOM_TEXT_ERROR = "Invalid characters in custom text: {}. Only letters, numbers, hyphens, and underscores are allowed."
+TEMPLATE_MISSING_PARTS_ERROR = "Missing required parts in {} template: {}"
 BID_ADJUSTMENT_RANGE_ERROR = "Bid adjustment must be between {}% and {}%"
 
 # Field names and formats
@@ -80,6 +89,24 @@ VALID_TEMPLATE_PARTS = {
     'AG': 'AG'
 }
 
+# Template parts accepted as they are (compared lowercase), per template type
+TEMPLATE_KNOWN_PARTS = {
+    CAMPAIGN_TEMPLATE_TYPE: frozenset(
+        [part.lower() for part in VALID_TEMPLATE_PARTS.values()] + [
+            # Common variations and aliases
+            'type', 'kw', '[kw]', 'match', 'keyword', 'sp', 'sponsored', 'products',
+            'root', 'group', 'category', 'ag'
+        ]
+    ),
+    AD_GROUP_TEMPLATE_TYPE: frozenset(part.lower() for part in VALID_TEMPLATE_PARTS.values())
+}
+
+# Placeholders every name template needs, and their token kind in core.templates
+TEMPLATE_REQUIRED_PLACEHOLDERS = {
+    VALID_TEMPLATE_PARTS['SKU']: TOKEN_SKU,
+    VALID_TEMPLATE_PARTS['MATCH_TYPE']: TOKEN_MATCH_TYPE
+}
+
 # Settings dictionary keys
 SETTINGS_MATCH_TYPES_KEY = "match_types"
 SETTINGS_DAILY_BUDGET_KEY = "daily_budget"
@@ -89,9 +116,13 @@ SETTINGS_PLACEMENT_KEY = "placement"
 SETTINGS_START_DATE_KEY = "start_date"
 
 # Regex patterns for validation
-KEYWORD_PATTERN = r'^[\w\s\-\']+$'  # Allows alphanumeric, spaces, hyphens, and apostrophes
-SKU_PATTERN = r'^[a-zA-Z0-9_\-.,></":\;+=]+$'  # Allows alphanumeric and specified special characters
+KEYWORD_CHARS = r'[\w\s\-\']'  # Allows alphanumeric, spaces, hyphens, and apostrophes
+SKU_CHARS = r'[a-zA-Z0-9_\-.,></":\;+=]'  # Allows alphanumeric and specified special characters
+KEYWORD_PATTERN = f'^{KEYWORD_CHARS}+$'
+SKU_PATTERN = f'^{SKU_CHARS}+$'
 TEMPLATE_PATTERN = r'^[\w\-_]*$'  # Allows alphanumeric, hyphens, and underscores
+TEMPLATE_DATE_REGEX = re.compile(r'\d{6}|\d{2}-\d{2}-\d{4}|\d{2}/\d{2}/\d{4}|[A-Za-z]{3}\s\d{2},\s\d{4}')  # Template parts starting with a date
+TEMPLATE_CUSTOM_TEXT_REGEX = re.compile(r'^[A-Za-z0-9\-_]+$')  # Custom text in templates
 
 def validate_numeric_input(value: Union[float, str], field_name: str, min_value: float = DEFAULT_MIN_VALUE) -> Tuple[bool, Optional[str]]:
     """Validate numeric inputs for campaign settings"""
@@ -114,35 +145,169 @@ def validate_date(date: datetime) -> Tuple[bool, Optional[str]]:
     except ValueError:
         return VALIDATION_FAILURE(f"Invalid value: {date} specified for field: {START_DATE_FIELD}, the correct date format is {DATE_FORMAT}")
 
+# Batch validation reasons, in the order items are checked (an item reports the first that fails)
+REASON_EMPTY = 0
+REASON_TOO_LONG = 1
+REASON_INVALID_CHARS = 2
+REASON_NAMES = ['empty', 'too long', 'invalid characters']
+
+# Columns of a rejects file (see ValidationReport.rejects)
+REJECT_COLUMNS = ['Field', 'Line', 'Value', 'Reason', 'Error']
+
+# Code points covered by the per-character lookup tables (ASCII, so building a table
+# is cheap); other code points are checked once per distinct code point
+CHAR_TABLE_SIZE = 0x80
+
+@dataclass
+class ValidationReport:
+    """Every failing item of a validated keyword or SKU list"""
+    field_name: str  # KEYWORD_FIELD or SKU_FIELD
+    plural: str  # KEYWORDS_PLURAL or SKUS_PLURAL
+    max_length: int
+    total: int  # Items validated
+    invalid_indexes: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))  # Ascending
+    reason_codes: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int8))  # REASON_* per failing item
+    invalid_values: List[str] = field(default_factory=list)  # Text of each failing item
+    list_error: Optional[str] = None  # Error about the list as a whole (empty list)
+
+    @property
+    def valid(self) -> bool:
+        return self.list_error is None and not len(self.invalid_indexes)
+
+    @property
+    def error_count(self) -> int:
+        return len(self.invalid_indexes)
+
+    def reason(self, position: int) -> str:
+        """Error message of the position-th failing item, worded like validate_keywords / validate_skus"""
+        code = self.reason_codes[position]
+        value = self.invalid_values[position]
+        if code == REASON_EMPTY:
+            return EMPTY_ITEM_ERROR.format(self.plural)
+        if code == REASON_TOO_LONG:
+            return LENGTH_ERROR.format(self.field_name, value, self.max_length)
+        return INVALID_CHARS_ERROR.format(self.field_name, value)
+
+    def errors(self, limit: Optional[int] = None) -> List[Tuple[int, str]]:
+        """(index in the input, message) of the failing items, optionally only the first `limit`"""
+        count = self.error_count if limit is None else min(limit, self.error_count)
+        return [(int(self.invalid_indexes[i]), self.reason(i)) for i in range(count)]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of failing items per reason"""
+        codes, counts = np.unique(self.reason_codes, return_counts=True)
+        return {REASON_NAMES[code]: int(count) for code, count in zip(codes, counts)}
+
+    def valid_mask(self) -> np.ndarray:
+        """Boolean mask over the input, True for items that passed"""
+        mask = np.ones(self.total, dtype=bool)
+        mask[self.invalid_indexes] = False
+        return mask
+
+    def partition(self, items: Sequence[Any]) -> List[Any]:
+        """The items that passed, in input order (items must be the validated list)"""
+        if not self.error_count:
+            return list(items)
+        return list(compress(items, self.valid_mask()))
+
+    def rejects(self) -> Dict[str, List[Any]]:
+        """The failing items as rejects file columns (REJECT_COLUMNS); Line is 1-based"""
+        return {
+            'Field': [self.field_name] * self.error_count,
+            'Line': (self.invalid_indexes + 1).tolist(),
+            'Value': list(self.invalid_values),
+            'Reason': [REASON_NAMES[code] for code in self.reason_codes],
+            'Error': [self.reason(i) for i in range(self.error_count)]
+        }
+
+    def as_result(self) -> Tuple[bool, Optional[str]]:
+        """The (valid, first error) pair returned by validate_keywords / validate_skus"""
+        if self.list_error is not None:
+            return VALIDATION_FAILURE(self.list_error)
+        if self.error_count:
+            return VALIDATION_FAILURE(self.reason(0))
+        return VALIDATION_SUCCESS
+
+@lru_cache(maxsize=None)
+def _char_table(char_class: str) -> np.ndarray:
+    """Which of the first CHAR_TABLE_SIZE code points match a one-character regex class"""
+    char_regex = re.compile(char_class)
+    return np.array([char_regex.match(chr(code)) is not None for code in range(CHAR_TABLE_SIZE)], dtype=bool)
+
+def _match_char_class(values: List[str], lengths: np.ndarray, char_class: str) -> np.ndarray:
+    """Vectorized re.match(f'^{char_class}+$', value) is not None for non-empty values.
+
+    All values are laid out as one array of code points and looked up in a
+    per-character table, so no regex runs per value.
+    """
+    code_points = np.frombuffer(''.join(values).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    table = _char_table(char_class)
+    if code_points.size and code_points.max() >= CHAR_TABLE_SIZE:
+        rare = code_points >= CHAR_TABLE_SIZE
+        bad = ~table[np.where(rare, 0, code_points)]
+        char_regex = re.compile(char_class)
+        codes, inverse = np.unique(code_points[rare], return_inverse=True)
+        bad[rare] = ~np.array([char_regex.match(chr(code)) is not None for code in codes], dtype=bool)[inverse]
+    else:
+        bad = ~table[code_points]
+
+    ends = np.cumsum(lengths)
+    bad_positions = np.flatnonzero(bad)
+    # '$' also matches before a single trailing newline
+    value_index = np.searchsorted(ends, bad_positions, side='right')
+    trailing_newline = (
+        (bad_positions == ends[value_index] - 1)
+        & (lengths[value_index] > 1)
+        & (code_points[bad_positions] == ord('\n'))
+    )
+    matches = lengths > 0
+    matches[value_index[~trailing_newline]] = False
+    return matches
+
+def as_text(items: Sequence[Any]) -> List[str]:
+    """Items as strings; None and NaN become empty strings"""
+    if all(type(item) is str for item in items):
+        return items if isinstance(items, list) else list(items)
+    return [EMPTY_STRING if item is None or item != item else str(item) for item in items]
+
+def _validate_list(items: Sequence[Any], field_name: str, singular: str, plural: str,
+                   max_length: int, char_class: str) -> ValidationReport:
+    """Check every item for emptiness, length and characters in one vectorized pass"""
+    report = ValidationReport(field_name=field_name, plural=plural, max_length=max_length, total=len(items))
+    if not len(items):
+        report.list_error = EMPTY_LIST_ERROR.format(singular)
+        return report
+
+    values = as_text(items)
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    # str.isspace covers exactly the characters str.strip removes
+    empty = (lengths == 0) | np.fromiter(map(str.isspace, values), dtype=bool, count=len(values))
+    too_long = lengths > max_length
+    bad_chars = ~_match_char_class(values, lengths, char_class)
+    reasons = np.select([empty, too_long, bad_chars],
+                        [REASON_EMPTY, REASON_TOO_LONG, REASON_INVALID_CHARS], default=-1)
+
+    report.invalid_indexes = np.flatnonzero(reasons >= 0)
+    report.reason_codes = reasons[report.invalid_indexes].astype(np.int8)
+    report.invalid_values = [values[i] for i in report.invalid_indexes]
+    return report
+
+def validate_keywords_batch(keywords: Sequence[Any]) -> ValidationReport:
+    """Validate a whole keyword list and report every invalid keyword with its reason"""
+    return _validate_list(keywords, KEYWORD_FIELD, KEYWORD_SINGULAR, KEYWORDS_PLURAL,
+                          MAX_KEYWORD_LENGTH, KEYWORD_CHARS)
+
+def validate_skus_batch(skus: Sequence[Any]) -> ValidationReport:
+    """Validate a whole SKU list and report every invalid SKU with its reason"""
+    return _validate_list(skus, SKU_FIELD, SKU_SINGULAR, SKUS_PLURAL, MAX_SKU_LENGTH, SKU_CHARS)
+
 def validate_keywords(keywords: List[str]) -> Tuple[bool, Optional[str]]:
-    """Validate keywords list"""
-    if not keywords:
-        return VALIDATION_FAILURE(EMPTY_LIST_ERROR.format(KEYWORD_SINGULAR))
-    
-    for keyword in keywords:
-        if not keyword.strip():
-            return VALIDATION_FAILURE(EMPTY_ITEM_ERROR.format(KEYWORDS_PLURAL))
-        if len(keyword) > MAX_KEYWORD_LENGTH:
-            return VALIDATION_FAILURE(LENGTH_ERROR.format(KEYWORD_FIELD, keyword, MAX_KEYWORD_LENGTH))
-        if not re.match(KEYWORD_PATTERN, keyword):
-            return VALIDATION_FAILURE(INVALID_CHARS_ERROR.format(KEYWORD_FIELD, keyword))
-    
-    return VALIDATION_SUCCESS
+    """Validate keywords list (first error only; see validate_keywords_batch)"""
+    return validate_keywords_batch(keywords).as_result()
 
 def validate_skus(skus: List[str]) -> Tuple[bool, Optional[str]]:
-    """Validate SKUs list"""
-    if not skus:
-        return VALIDATION_FAILURE(EMPTY_LIST_ERROR.format(SKU_SINGULAR))
-    
-    for sku in skus:
-        if not sku.strip():
-            return VALIDATION_FAILURE(EMPTY_ITEM_ERROR.format(SKUS_PLURAL))
-        if len(sku) > MAX_SKU_LENGTH:
-            return VALIDATION_FAILURE(LENGTH_ERROR.format(SKU_FIELD, sku, MAX_SKU_LENGTH))
-        if not re.match(SKU_PATTERN, sku):
-            return VALIDATION_FAILURE(INVALID_CHARS_ERROR.format(SKU_FIELD, sku))
-    
-    return VALIDATION_SUCCESS
+    """Validate SKUs list (first error only; see validate_skus_batch)"""
+    return validate_skus_batch(skus).as_result()
 
 def validate_match_types(match_types: List[str]) -> Tuple[bool, Optional[str]]:
     """Validate match types"""
@@ -162,6 +327,7 @@ def validate_match_types(match_types: List[str]) -> Tuple[bool, Optional[str]]:
     
     return VALIDATION_SUCCESS
 
+@lru_cache(maxsize=256)
 def validate_name_template(template: str, template_type: str) -> Tuple[bool, Optional[str]]:
     """Validate campaign or ad group name template"""
     if not template:
@@ -170,95 +336,23 @@ def validate_name_template(template: str, template_type: str) -> Tuple[bool, Opt
     if len(template) > MAX_TEMPLATE_LENGTH:
         return VALIDATION_FAILURE(TEMPLATE_LENGTH_ERROR.format(TEMPLATE_NAME_FORMAT.format(template_type, NAME_TEMPLATE_SUFFIX)))
     
-    # Different validation for campaign and ad group templates
-    if template_type == CAMPAIGN_TEMPLATE_TYPE:
-        # Campaign template can contain any valid parts and dates
-        template_parts = template.split('_')
-        
-        # Common variations and aliases
-        valid_variations = {
-            'type': True, 'kw': True, '[kw]': True, 'match': True, 'keyword': True,
-            'sp': True, 'sponsored': True, 'products': True,
-            'root': True, 'group': True, 'category': True,
-            'ag': True  # For ad group templates
-        }
-        
-        # Required parts for campaign template
-        required_parts = {'[SKU]': False, 'match_type': False}
-        
-        # Check each part
-        for part in template_parts:
-            if not part:  # Skip empty parts
-                continue
-                
-            part_lower = part.lower()
-            
-            # Check for SKU
-            if '[sku]' in part_lower:
-                required_parts['[SKU]'] = True
-                
-            # Check for match type
-            if 'match_type' in part_lower or 'match' in part_lower:
-                required_parts['match_type'] = True
-            
-            # Skip valid parts (case-insensitive)
-            if part in VALID_TEMPLATE_PARTS.values() or part.lower() in [v.lower() for v in VALID_TEMPLATE_PARTS.values()]:
-                continue
-                
-            # Skip date formats
-            if re.match(r'\d{6}|\d{2}-\d{2}-\d{4}|\d{2}/\d{2}/\d{4}|[A-Za-z]{3}\s\d{2},\s\d{4}', part):
-                continue
-                
-            # Skip common variations
-            if part_lower in valid_variations:
-                continue
-                
-            # Allow custom text that contains letters, numbers, hyphens, and underscores
-            if not re.match(r'^[A-Za-z0-9\-_]+$', part):
-                return VALIDATION_FAILURE(f"Invalid characters in custom text: {part}. Only letters, numbers, hyphens, and underscores are allowed.")
-        
-        # Check if all required parts are present
-        missing_parts = [part for part, found in required_parts.items() if not found]
-        if missing_parts:
-            return VALIDATION_FAILURE(f"Missing required parts in campaign template: {', '.join(missing_parts)}")
-    else:
-        # Ad group template validation
-        template_parts = template.split('_')
-        
-        # Required parts for ad group template
-        required_parts = {'[SKU]': False, 'match_type': False}
-        
-        # Check each part
-        for part in template_parts:
-            if not part:  # Skip empty parts
-                continue
-                
-            part_lower = part.lower()
-            
-            # Check for SKU
-            if '[sku]' in part_lower:
-                required_parts['[SKU]'] = True
-                
-            # Check for match type
-            if 'match_type' in part_lower or 'match' in part_lower:
-                required_parts['match_type'] = True
-            
-            # Skip valid parts (case-insensitive)
-            if part in VALID_TEMPLATE_PARTS.values() or part.lower() in [v.lower() for v in VALID_TEMPLATE_PARTS.values()]:
-                continue
-                
-            # Skip date formats
-            if re.match(r'\d{6}|\d{2}-\d{2}-\d{4}|\d{2}/\d{2}/\d{4}|[A-Za-z]{3}\s\d{2},\s\d{4}', part):
-                continue
-                
-            # Allow custom text that contains letters, numbers, hyphens, and underscores
-            if not re.match(r'^[A-Za-z0-9\-_]+$', part):
-                return VALIDATION_FAILURE(f"Invalid characters in custom text: {part}. Only letters, numbers, hyphens, and underscores are allowed.")
-        
-        # Check if all required parts are present
-        missing_parts = [part for part, found in required_parts.items() if not found]
-        if missing_parts:
-            return VALIDATION_FAILURE(f"Missing required parts in ad group template: {', '.join(missing_parts)}")
+    # Any type other than campaign is checked as an ad group template
+    if template_type != CAMPAIGN_TEMPLATE_TYPE:
+        template_type = AD_GROUP_TEMPLATE_TYPE
+    known_parts = TEMPLATE_KNOWN_PARTS[template_type]
+    
+    # Parts between underscores must be known parts, dates or custom text
+    for part in template.split('_'):
+        if not part or part.lower() in known_parts or TEMPLATE_DATE_REGEX.match(part):
+            continue
+        if not TEMPLATE_CUSTOM_TEXT_REGEX.match(part):
+            return VALIDATION_FAILURE(TEMPLATE_CUSTOM_TEXT_ERROR.format(part))
+    
+    # Required placeholders, found the way the generator substitutes them when rendering names
+    token_kinds = {kind for kind, _ in tokenize_template(template)}
+    missing_parts = [part for part, kind in TEMPLATE_REQUIRED_PLACEHOLDERS.items() if kind not in token_kinds]
+    if missing_parts:
+        return VALIDATION_FAILURE(TEMPLATE_MISSING_PARTS_ERROR.format(template_type, LIST_SEPARATOR.join(missing_parts)))
     
     return VALIDATION_SUCCESS
 
@@ -2,9 +2,21 @@
 
 from .file_handlers import FileHandler
 from .formatters import TextFormatter, DataFormatter
+from .instrumentation import PipelineProfile, Profiler, StageTiming
+from .sharding import ShardManifest
+from .writers import ArrowBulkWriter, CsvBulkWriter, GzipCsvBulkWriter, ParquetBulkWriter, XlsxBulkWriter
 
 __all__ = [
     'FileHandler',
     'TextFormatter',
-    'DataFormatter'
+    'DataFormatter',
+    'CsvBulkWriter',
+    'GzipCsvBulkWriter',
+    'XlsxBulkWriter',
+    'ParquetBulkWriter',
+    'ArrowBulkWriter',
+    'ShardManifest',
+    'Profiler',
+    'PipelineProfile',
+    'StageTiming'
 ]
@@ -0,0 +1,175 @@
+"""
+Single-pass multi-format export.
+
+Consumes a bulk sheet row stream once and hands every chunk to one writer
+thread per output format (CSV, gzipped CSV, XLSX, Parquet, Arrow), so the
+formats are serialized side by side instead of one after the other. Each
+writer has a small bounded queue: memory stays at a few chunks per format,
+and the producer waits for the slowest writer rather than buffering the job.
+
+zlib and pyarrow release the GIL while compressing and encoding, so the
+gzip, Parquet and Arrow writers run alongside the others; the pure-Python
+csv/xlsxwriter work shares one interpreter, so total time approaches the
+slowest writer plus whatever CPU the others need.
+"""
+import logging
+import os
+import queue
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from .instrumentation import NULL_PROFILER, Profiler
+from .writers import (
+    ArrowBulkWriter,
+    CsvBulkWriter,
+    GzipCsvBulkWriter,
+    ParquetBulkWriter,
+    XlsxBulkWriter,
+    iter_dataframe_batches,
+    iter_row_chunks
+)
+
+logger = logging.getLogger(__name__)
+
+# Output format -> (writer class, file extension)
+FANOUT_WRITERS = {
+    'csv': (CsvBulkWriter, 'csv'),
+    'csv.gz': (GzipCsvBulkWriter, 'csv.gz'),
+    'xlsx': (XlsxBulkWriter, 'xlsx'),
+    'parquet': (ParquetBulkWriter, 'parquet'),
+    'arrow': (ArrowBulkWriter, 'arrow')
+}
+
+# Writers that take column batches without converting them to rows
+COLUMNAR_WRITERS = (ParquetBulkWriter, ArrowBulkWriter)
+
+# Chunks queued per writer before the producer waits
+DEFAULT_QUEUE_CHUNKS = 4
+
+_DONE = object()
+
+
+class _WriterThread:
+    """One output format: a writer fed from a bounded queue by its own thread"""
+
+    def __init__(self, format: str, output_path: str, headers: List[str], queue_chunks: int,
+                 profiler: Profiler, parent_stage: Optional[str]):
+        writer_class, _ = FANOUT_WRITERS[format]
+        self.format = format
+        self.output_path = output_path
+        self.columnar = issubclass(writer_class, COLUMNAR_WRITERS)
+        self.error: Optional[BaseException] = None
+        self._writer = writer_class(output_path, headers)
+        self._profiler = profiler
+        self._parent_stage = parent_stage  # Stage of the calling thread the write belongs to
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=queue_chunks)
+        self._thread = threading.Thread(target=self._run, name=f"fanout-{format}", daemon=True)
+        self._thread.start()
+
+    def put(self, rows: Optional[List[Sequence]], columns: Optional[Dict[str, Any]]) -> None:
+        """Queue one chunk, waiting while the writer is queue_chunks behind"""
+        self._queue.put((rows, columns))
+
+    def finish(self) -> None:
+        """Close the writer after the queued chunks and wait for the thread"""
+        self._queue.put(_DONE)
+        self._thread.join()
+
+    def remove(self) -> None:
+        """Delete the (partial) output file"""
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
+
+    def _run(self) -> None:
+        done = False
+        with self._profiler.span(f"write.{self.format}", parent=self._parent_stage) as span:
+            try:
+                with self._writer:
+                    while True:
+                        item = self._queue.get()
+                        if item is _DONE:
+                            done = True
+                            break
+                        rows, columns = item
+                        if self.columnar and columns is not None:
+                            self._writer.write_columns(columns)
+                        else:
+                            self._writer.write_rows(rows)
+            except BaseException as e:
+                self.error = e
+                # Drain what is left so neither put() nor finish() blocks on a full queue
+                while not done:
+                    done = self._queue.get() is _DONE
+                return
+            span.record(rows=self._writer.rows_written, bytes_written=os.path.getsize(self.output_path))
+
+
+def write_fanout(rows: Iterable[Any], headers: List[str], output_dir: str, basename: str,
+                 formats: Sequence[str] = ('xlsx', 'csv'), queue_chunks: int = DEFAULT_QUEUE_CHUNKS,
+                 profiler: Optional[Profiler] = None) -> Dict[str, str]:
+    """
+    Write one row stream to several formats concurrently
+
+    Args:
+        rows: Rows, row chunks or column batches in header order (see
+            writers.iter_row_chunks), or a bulk sheet DataFrame
+        headers: Column headers
+        output_dir: Directory for the output files
+        basename: File name without extension
+        formats: Keys of FANOUT_WRITERS
+        queue_chunks: Chunks queued per writer before the producer waits
+        profiler: Records a 'write.<format>' stage per writer thread, nested under the caller's open stage
+
+    Returns:
+        Path of each written file, keyed by format
+
+    Raises:
+        ValueError: If a format is not supported
+        Exception: The first writer error (e.g. the Excel row limit); the files
+            of all formats are removed in that case
+    """
+    unknown = [format for format in formats if format not in FANOUT_WRITERS]
+    if unknown:
+        raise ValueError(f"Unsupported format(s): {', '.join(unknown)}")
+    if isinstance(rows, pd.DataFrame):
+        rows = iter_dataframe_batches(rows[headers])
+    profiler = profiler or NULL_PROFILER
+    parent_stage = profiler.current_stage()
+
+    writers = []
+    try:
+        for format in dict.fromkeys(formats):
+            path = os.path.join(output_dir, f"{basename}.{FANOUT_WRITERS[format][1]}")
+            writers.append(_WriterThread(format, path, headers, queue_chunks, profiler, parent_stage))
+        row_writers = [writer for writer in writers if not writer.columnar]
+
+        for chunk in iter_row_chunks(rows, keep_column_batches=True):
+            if isinstance(chunk, dict):
+                columns = chunk
+                # Converted once and shared by every row-based writer
+                chunk = list(zip(*columns.values())) if row_writers else None
+            else:
+                columns = None
+            for writer in writers:
+                writer.put(chunk, columns)
+            if any(writer.error is not None for writer in writers):
+                break
+    except BaseException:
+        # The row stream or a writer constructor failed
+        for writer in writers:
+            writer.finish()
+            writer.remove()
+        raise
+
+    for writer in writers:
+        writer.finish()
+    failed = [writer for writer in writers if writer.error is not None]
+    if failed:
+        for writer in writers:
+            writer.remove()
+        raise failed[0].error
+
+    logger.info(f"Wrote {', '.join(writer.format for writer in writers)} files for {basename}")
+    return {writer.format: writer.output_path for writer in writers}
@@ -1,24 +1,37 @@
 import pandas as pd
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
 import os
 from datetime import datetime
 import logging
 from pathlib import Path
 import pkg_resources
 
+from .fanout import write_fanout
+from .instrumentation import NULL_PROFILER, Profiler
+from .sharding import ShardManifest, write_sharded
+from .writers import ArrowBulkWriter, CsvBulkWriter, ParquetBulkWriter, XlsxBulkWriter, iter_row_chunks
+
 logger = logging.getLogger(__name__)
 
 class FileHandler:
     """Class to handle file operations for the bulk campaign generator"""
     
-    def __init__(self, base_dir: Optional[str] = None):
+    # Columnar formats written with pyarrow: format -> (writer class, file extension)
+    COLUMNAR_FORMATS = {
+        'parquet': (ParquetBulkWriter, 'parquet'),
+        'arrow': (ArrowBulkWriter, 'arrow')
+    }
+    
+    def __init__(self, base_dir: Optional[str] = None, profiler: Optional[Profiler] = None):
         """
         Initialize FileHandler
         
         Args:
             base_dir: Base directory for file operations. Defaults to current directory.
+            profiler: Records a 'write.<format>' stage per saved file (disabled by default)
         """
         self.base_dir = base_dir or os.getcwd()
+        self.profiler = profiler or NULL_PROFILER
         self._ensure_directories()
 
     def _ensure_directories(self) -> None:
@@ -64,7 +77,7 @@ class FileHandler:
         
         Args:
             df: DataFrame containing bulk sheet data
-            format: Output format ('xlsx' or 'csv')
+            format: Output format ('xlsx', 'csv', 'parquet' or 'arrow')
             
         Returns:
             Path to the saved file
@@ -76,9 +89,117 @@ class FileHandler:
             return self._save_excel(df, output_dir, timestamp)
         elif format.lower() == 'csv':
             return self._save_csv(df, output_dir, timestamp)
+        elif format.lower() in self.COLUMNAR_FORMATS:
+            return self._save_columnar(df, output_dir, timestamp, format.lower())
         else:
             raise ValueError(f"Unsupported format: {format}")
 
+    def save_bulk_sheet_stream(self, rows: Iterable[Any], headers: List[str], format: str = 'csv') -> str:
+        """
+        Save a bulk sheet from a row stream without building a DataFrame
+        
+        Args:
+            rows: Rows or row chunks, e.g. from BulkSheetGenerator.iter_bulk_rows, or column
+                batches from BulkSheetGenerator.iter_bulk_columns (the cheapest input for
+                Parquet/Arrow)
+            headers: Column headers in row order (BulkSheetGenerator.headers)
+            format: Output format ('xlsx', 'csv', 'parquet' or 'arrow')
+            
+        Returns:
+            Path to the saved file
+        """
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_dir = os.path.join(self.base_dir, 'output')
+        
+        if format.lower() == 'xlsx':
+            return self._stream_excel(rows, headers, output_dir, timestamp)
+        elif format.lower() == 'csv':
+            return self._stream_csv(rows, headers, output_dir, timestamp)
+        elif format.lower() in self.COLUMNAR_FORMATS:
+            return self._stream_columnar(rows, headers, output_dir, timestamp, format.lower())
+        else:
+            raise ValueError(f"Unsupported streaming format: {format}")
+
+    def save_bulk_sheet_formats(self, rows: Union[pd.DataFrame, Iterable[Any]], formats: Sequence[str] = ('xlsx', 'csv'),
+                                headers: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        Save a bulk sheet in several formats with a single pass over its rows
+        
+        Every chunk is handed to one writer thread per format (see utils.fanout),
+        so the formats are written concurrently instead of one after another.
+        
+        Args:
+            rows: Bulk sheet DataFrame, or rows / row chunks / column batches, e.g. from
+                BulkSheetGenerator.iter_bulk_rows or iter_bulk_columns
+            formats: Output formats ('xlsx', 'csv', 'csv.gz', 'parquet', 'arrow')
+            headers: Column headers in row order; required unless rows is a DataFrame
+            
+        Returns:
+            Path to each saved file, keyed by format
+        """
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_dir = os.path.join(self.base_dir, 'output')
+        if headers is None:
+            if not isinstance(rows, pd.DataFrame):
+                raise ValueError("headers are required when saving a row stream")
+            headers = list(rows.columns)
+        
+        with self.profiler.span('write.fanout') as span:
+            paths = write_fanout(rows, headers, output_dir, f"amazon_bulk_upload_{timestamp}",
+                                 formats=formats, profiler=self.profiler)
+            span.record(bytes_written=sum(os.path.getsize(path) for path in paths.values()))
+        return paths
+
+    def save_rejects(self, rejects: Iterable[Dict[str, List[Any]]]) -> str:
+        """
+        Save quarantined keywords/SKUs with the reason each was rejected
+        
+        Args:
+            rejects: Column dicts from ValidationReport.rejects, one per validated list
+            
+        Returns:
+            Path to the saved CSV file
+        """
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_path = os.path.join(self.base_dir, 'output', f"amazon_bulk_rejects_{timestamp}.csv")
+        
+        df = pd.concat([pd.DataFrame(columns) for columns in rejects], ignore_index=True)
+        with self.profiler.span('write.rejects', rows=len(df)) as span:
+            df.to_csv(output_path, index=False)
+            span.record(bytes_written=os.path.getsize(output_path))
+        logger.info(f"Saved {len(df)} rejected entries: {output_path}")
+        return output_path
+
+    def save_bulk_sheet_sharded(self, rows: Iterable[Any], headers: List[str], format: str = 'csv',
+                                max_rows: Optional[int] = None, max_bytes: Optional[int] = None,
+                                max_workers: Optional[int] = None) -> ShardManifest:
+        """
+        Save a bulk sheet as several files split at campaign boundaries
+        
+        Args:
+            rows: Rows or row chunks, e.g. from BulkSheetGenerator.iter_bulk_rows, or a
+                bulk sheet DataFrame (compact frames included; missing values stay empty)
+            headers: Column headers in row order (BulkSheetGenerator.headers)
+            format: Output format ('xlsx' or 'csv')
+            max_rows: Data rows per file (XLSX is always capped at the Excel sheet limit)
+            max_bytes: Bytes per file
+            max_workers: Files written concurrently
+            
+        Returns:
+            ShardManifest with the shard paths, row counts and checksums; the same
+            information is written next to the shards as a JSON manifest
+        """
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        output_dir = os.path.join(self.base_dir, 'output')
+        
+        with self.profiler.span(f"write.{format.lower()}.sharded") as span:
+            manifest = write_sharded(
+                rows, headers, output_dir, f"amazon_bulk_upload_{timestamp}",
+                format=format, max_rows=max_rows, max_bytes=max_bytes, max_workers=max_workers
+            )
+            span.record(rows=manifest.total_rows, bytes_written=sum(shard.bytes for shard in manifest.shards))
+        return manifest
+
     def _save_excel(self, df: pd.DataFrame, output_dir: str, timestamp: str) -> str:
         """
         Save DataFrame to Excel file
@@ -94,24 +215,26 @@ class FileHandler:
         filename = f"amazon_bulk_upload_{timestamp}.xlsx"
         output_path = os.path.join(output_dir, filename)
         
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Sponsored Products', index=False)
-            
-            # Get the worksheet
-            worksheet = writer.sheets['Sponsored Products']
-            
-            # Auto-adjust columns' width
-            for column in worksheet.columns:
-                max_length = 0
-                column = [cell for cell in column]
-                try:
-                    max_length = max(
-                        len(str(cell.value)) for cell in column if cell.value
-                    )
-                except ValueError:
+        with self.profiler.span('write.xlsx', rows=len(df)) as span:
+            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+                df.to_excel(writer, sheet_name='Sponsored Products', index=False)
+                
+                # Get the worksheet
+                worksheet = writer.sheets['Sponsored Products']
+                
+                # Auto-adjust columns' width
+                for column in worksheet.columns:
                     max_length = 0
-                adjusted_width = (max_length + 2)
-                worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
+                    column = [cell for cell in column]
+                    try:
+                        max_length = max(
+                            len(str(cell.value)) for cell in column if cell.value
+                        )
+                    except ValueError:
+                        max_length = 0
+                    adjusted_width = (max_length + 2)
+                    worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
+            span.record(bytes_written=os.path.getsize(output_path))
         
         logger.info(f"Saved Excel file: {output_path}")
         return output_path
@@ -131,10 +254,118 @@ class FileHandler:
         filename = f"amazon_bulk_upload_{timestamp}.csv"
         output_path = os.path.join(output_dir, filename)
         
-        df.to_csv(output_path, index=False)
+        with self.profiler.span('write.csv', rows=len(df)) as span:
+            df.to_csv(output_path, index=False)
+            span.record(bytes_written=os.path.getsize(output_path))
+        logger.info(f"Saved CSV file: {output_path}")
+        return output_path
+
+    def _save_columnar(self, df: pd.DataFrame, output_dir: str, timestamp: str, format: str) -> str:
+        """
+        Save DataFrame to a Parquet or Arrow IPC file with dictionary-encoded repeated columns
+        
+        Args:
+            df: DataFrame to save
+            output_dir: Output directory
+            timestamp: Timestamp for filename
+            format: Key of COLUMNAR_FORMATS
+            
+        Returns:
+            Path to the saved file
+        """
+        writer_class, extension = self.COLUMNAR_FORMATS[format]
+        filename = f"amazon_bulk_upload_{timestamp}.{extension}"
+        output_path = os.path.join(output_dir, filename)
+        
+        with self.profiler.span(f"write.{format}", rows=len(df)) as span:
+            with writer_class(output_path, list(df.columns)) as writer:
+                writer.write_dataframe(df)
+            span.record(bytes_written=os.path.getsize(output_path))
+        
+        logger.info(f"Saved {writer_class.FORMAT_NAME} file: {output_path}")
+        return output_path
+
+    def _stream_excel(self, rows: Iterable[Any], headers: List[str], output_dir: str, timestamp: str) -> str:
+        """
+        Write a row stream to an Excel file in constant memory
+        
+        Args:
+            rows: Rows or row chunks in header order
+            headers: Column headers
+            output_dir: Output directory
+            timestamp: Timestamp for filename
+            
+        Returns:
+            Path to the saved file
+        """
+        filename = f"amazon_bulk_upload_{timestamp}.xlsx"
+        output_path = os.path.join(output_dir, filename)
+        
+        with self.profiler.span('write.xlsx') as span:
+            with XlsxBulkWriter(output_path, headers) as writer:
+                for chunk in iter_row_chunks(rows):
+                    writer.write_rows(chunk)
+            span.record(rows=writer.rows_written, bytes_written=os.path.getsize(output_path))
+        
+        logger.info(f"Saved Excel file: {output_path}")
+        return output_path
+
+    def _stream_csv(self, rows: Iterable[Any], headers: List[str], output_dir: str, timestamp: str) -> str:
+        """
+        Write a row stream to a CSV file, one chunk at a time
+        
+        Args:
+            rows: Rows or row chunks in header order
+            headers: Column headers
+            output_dir: Output directory
+            timestamp: Timestamp for filename
+            
+        Returns:
+            Path to the saved file
+        """
+        filename = f"amazon_bulk_upload_{timestamp}.csv"
+        output_path = os.path.join(output_dir, filename)
+        
+        with self.profiler.span('write.csv') as span:
+            with CsvBulkWriter(output_path, headers) as writer:
+                for chunk in iter_row_chunks(rows):
+                    writer.write_rows(chunk)
+            span.record(rows=writer.rows_written, bytes_written=os.path.getsize(output_path))
+        
         logger.info(f"Saved CSV file: {output_path}")
         return output_path
 
+    def _stream_columnar(self, rows: Iterable[Any], headers: List[str], output_dir: str, timestamp: str,
+                         format: str) -> str:
+        """
+        Write a row or column batch stream to a Parquet or Arrow IPC file
+        
+        Args:
+            rows: Rows, row chunks or column batches in header order
+            headers: Column headers
+            output_dir: Output directory
+            timestamp: Timestamp for filename
+            format: Key of COLUMNAR_FORMATS
+            
+        Returns:
+            Path to the saved file
+        """
+        writer_class, extension = self.COLUMNAR_FORMATS[format]
+        filename = f"amazon_bulk_upload_{timestamp}.{extension}"
+        output_path = os.path.join(output_dir, filename)
+        
+        with self.profiler.span(f"write.{format}") as span:
+            with writer_class(output_path, headers) as writer:
+                for chunk in iter_row_chunks(rows, keep_column_batches=True):
+                    if isinstance(chunk, dict):
+                        writer.write_columns(chunk)
+                    else:
+                        writer.write_rows(chunk)
+            span.record(rows=writer.rows_written, bytes_written=os.path.getsize(output_path))
+        
+        logger.info(f"Saved {writer_class.FORMAT_NAME} file: {output_path}")
+        return output_path
+
     def get_template_path(self, template_type: str) -> str:
         """
         Get path to template file
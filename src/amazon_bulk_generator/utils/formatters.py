@@ -1,6 +1,7 @@
-from typing import List, Dict, Any
+from typing import List, Any, Optional
 import re
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
 class TextFormatter:
@@ -75,6 +76,44 @@ class DataFormatter:
         """
         return f"${value:.2f}"
 
+    @staticmethod
+    def format_amount(value: Any) -> Optional[str]:
+        """
+        Format a budget or bid value for the bulk sheet (two decimals, no symbol)
+        
+        Args:
+            value: Numeric value, numeric string, or an empty value
+            
+        Returns:
+            Formatted amount, or None for empty values
+        """
+        if value is None or (isinstance(value, str) and value == '') or pd.isnull(value):
+            return None
+        return f'{float(value):.2f}'
+
+    @staticmethod
+    def format_amount_column(values: Any) -> np.ndarray:
+        """
+        Vectorized format_amount for a whole column
+        
+        Each distinct amount is formatted once and the strings are broadcast back
+        through the factorized codes, so there is no per-cell Python call.
+        
+        Args:
+            values: Column of numbers, numeric strings and empty values
+            
+        Returns:
+            Object array of formatted amounts, None for empty values
+            
+        Raises:
+            ValueError: If the column holds non-numeric text
+        """
+        numeric = pd.to_numeric(pd.Series(values, copy=False).replace('', None), errors='raise')
+        codes, uniques = pd.factorize(numeric.to_numpy(dtype=float, na_value=np.nan), use_na_sentinel=True)
+        # Code -1 (missing) picks the trailing None
+        strings = np.array([f'{value:.2f}' for value in uniques] + [None], dtype=object)
+        return strings[codes]
+
     @staticmethod
     def format_date(date: datetime) -> str:
         """
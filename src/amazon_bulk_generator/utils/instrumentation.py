@@ -0,0 +1,279 @@
+"""
+Per-stage timing and memory instrumentation.
+
+A Profiler records a StageTiming for every ``with profiler.span(name):`` block:
+wall time, optional row and byte counts, the process peak RSS after the stage
+and, with trace_memory, the peak Python/numpy allocation during the stage.
+Finished stages are logged as key=value lines (and as ``extra`` fields for
+structured log handlers) and collected in a PipelineProfile.
+
+Spans nest per thread. A span opened in a worker thread on behalf of a stage
+of another thread is given that stage as its parent explicitly (see
+current_stage), so it is not counted as a separate top-level stage.
+
+A disabled Profiler hands out one shared no-op span, so instrumented code
+costs a method call and an attribute check per stage when profiling is off.
+"""
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the process so far (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+@dataclass
+class StageTiming:
+    """Measurements of one pipeline stage"""
+    name: str
+    seconds: float = 0.0
+    rows: Optional[int] = None
+    bytes_written: Optional[int] = None
+    peak_rss_mb: Optional[float] = None  # Process peak RSS after the stage
+    peak_traced_mb: Optional[float] = None  # Peak allocation during the stage (trace_memory only)
+    parent: Optional[str] = None  # Enclosing stage, for nested spans
+    error: Optional[str] = None  # Exception type if the stage failed
+
+    @property
+    def rows_per_sec(self) -> Optional[float]:
+        """Throughput of the stage"""
+        if self.rows is None or not self.seconds:
+            return None
+        return self.rows / self.seconds
+
+
+@dataclass
+class PipelineProfile:
+    """Stages recorded by a Profiler, in the order they started"""
+    stages: List[StageTiming] = field(default_factory=list)
+
+    @property
+    def total_seconds(self) -> float:
+        """Wall time of the top-level stages"""
+        return sum(stage.seconds for stage in self.stages if stage.parent is None)
+
+    def stage(self, name: str) -> Optional[StageTiming]:
+        """Most recent stage with the given name"""
+        for stage in reversed(self.stages):
+            if stage.name == name:
+                return stage
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Profile as plain data, e.g. for JSON logging"""
+        return {
+            'total_seconds': self.total_seconds,
+            'stages': [asdict(stage) for stage in self.stages]
+        }
+
+    def summary(self) -> str:
+        """One line per stage, indented by nesting depth"""
+        depths = {}
+        lines = []
+        for stage in self.stages:
+            depth = depths.get(stage.parent, -1) + 1
+            depths[stage.name] = depth
+            line = f"{'  ' * depth}{stage.name}: {stage.seconds:.3f}s"
+            if stage.rows is not None:
+                line += f", {stage.rows:,} rows"
+            if stage.bytes_written is not None:
+                line += f", {stage.bytes_written / 1024 / 1024:.1f} MB written"
+            if stage.peak_traced_mb is not None:
+                line += f", peak {stage.peak_traced_mb:.1f} MB allocated"
+            if stage.error:
+                line += f" (failed: {stage.error})"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+class _NullSpan:
+    """Span handed out by a disabled Profiler; every operation is a no-op"""
+
+    __slots__ = ()
+
+    def record(self, rows: Optional[int] = None, bytes_written: Optional[int] = None) -> None:
+        pass
+
+    def __enter__(self) -> '_NullSpan':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Context manager measuring one stage for a Profiler"""
+
+    def __init__(self, profiler: 'Profiler', name: str, rows: Optional[int], parent: Optional[str]):
+        self._profiler = profiler
+        self.timing = StageTiming(name=name, rows=rows, parent=parent)
+        self._start = 0.0
+        self._traced_start = 0
+        self._traced_peak = 0  # Highest traced allocation seen, including nested spans
+
+    def record(self, rows: Optional[int] = None, bytes_written: Optional[int] = None) -> None:
+        """
+        Attach counts known only once the stage has run
+
+        Args:
+            rows: Rows produced or written by the stage
+            bytes_written: Bytes the stage wrote to disk
+        """
+        if rows is not None:
+            self.timing.rows = rows
+        if bytes_written is not None:
+            self.timing.bytes_written = bytes_written
+
+    def __enter__(self) -> '_Span':
+        self._profiler._enter(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.timing.seconds = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.timing.error = exc_type.__name__
+        self._profiler._exit(self)
+
+
+class Profiler:
+    """Collects per-stage timings for a generation run"""
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = False,
+                 log_level: int = logging.INFO):
+        """
+        Initialize Profiler
+
+        Args:
+            enabled: Record stages; a disabled profiler only hands out no-op spans
+            trace_memory: Also measure the peak Python/numpy allocation of every
+                stage with tracemalloc (noticeably slows allocation-heavy code)
+            log_level: Level of the per-stage log lines
+        """
+        self.enabled = enabled
+        self.trace_memory = trace_memory and enabled
+        self.log_level = log_level
+        self.profile = PipelineProfile()
+        self._lock = threading.Lock()
+        self._local = threading.local()  # Stack of open spans per thread
+        self._open_spans = 0
+        self._started_tracing = False  # Whether tracemalloc was started by this profiler
+
+    def span(self, name: str, rows: Optional[int] = None, parent: Optional[str] = None):
+        """
+        Measure a stage
+
+        Args:
+            name: Stage name, e.g. 'generate.build' or 'write.csv'
+            rows: Row count, if already known
+            parent: Enclosing stage of a span opened in a worker thread (from
+                current_stage in the calling thread); defaults to the innermost
+                open span of the current thread
+
+        Returns:
+            Context manager whose ``record(rows=..., bytes_written=...)`` attaches
+            counts known only after the stage has run
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, rows, parent)
+
+    def current_stage(self) -> Optional[str]:
+        """Name of the innermost open span of the calling thread"""
+        if not self.enabled:
+            return None
+        stack = self._stack()
+        return stack[-1].timing.name if stack else None
+
+    def reset(self) -> PipelineProfile:
+        """
+        Start a new profile
+
+        Returns:
+            The profile recorded so far
+        """
+        with self._lock:
+            profile, self.profile = self.profile, PipelineProfile()
+        return profile
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes get a disabled profiler: their spans could not reach this profile
+        return {'enabled': False, 'trace_memory': False, 'log_level': self.log_level}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def _stack(self) -> List[_Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, span: _Span) -> None:
+        stack = self._stack()
+        if stack and span.timing.parent is None:
+            span.timing.parent = stack[-1].timing.name
+        with self._lock:
+            self.profile.stages.append(span.timing)
+            self._open_spans += 1
+            if self.trace_memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # Resetting the peak for this span would hide the enclosing span's peak so far
+            if stack:
+                stack[-1]._traced_peak = max(stack[-1]._traced_peak, peak)
+            if hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+; earlier peaks are process-wide
+                tracemalloc.reset_peak()
+            span._traced_start = span._traced_peak = current
+        stack.append(span)
+
+    def _exit(self, span: _Span) -> None:
+        stack = self._stack()
+        stack.pop()
+        timing = span.timing
+        if self.trace_memory:
+            peak = max(span._traced_peak, tracemalloc.get_traced_memory()[1])
+            timing.peak_traced_mb = (peak - span._traced_start) / 1024 / 1024
+            if stack:
+                stack[-1]._traced_peak = max(stack[-1]._traced_peak, peak)
+        timing.peak_rss_mb = peak_rss_mb()
+        with self._lock:
+            self._open_spans -= 1
+            # Tracing slows every allocation, so it only runs while spans are open
+            if self._started_tracing and not self._open_spans:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+        fields = {key: value for key, value in asdict(timing).items() if value is not None}
+        logger.log(
+            self.log_level,
+            "stage " + " ".join(f"{key}={round(value, 4) if isinstance(value, float) else value}"
+                                for key, value in fields.items()),
+            extra={'stage': fields}
+        )
+
+
+# Shared disabled profiler used when none is passed in
+NULL_PROFILER = Profiler(enabled=False)
@@ -0,0 +1,179 @@
+import os
+from typing import Any, Iterator, List, Optional
+
+import pandas as pd
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover - openpyxl is a hard dependency of the Excel export
+    openpyxl = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional until Parquet/Arrow files are read
+    pyarrow = None
+
+# Rows per DataFrame chunk when streaming a bulk file
+DEFAULT_READ_CHUNK_ROWS = 50000
+
+# Worksheet picked from multi-sheet Amazon downloads when no sheet is given
+SPONSORED_PRODUCTS_SHEET = 'Sponsored Products'
+
+
+def _source_extension(source: Any) -> str:
+    """Lowercase file extension of a path or named file-like object"""
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    return os.path.splitext(str(name))[1].lower()
+
+
+def _cell_text(value: Any) -> str:
+    """Excel cell value as the text a CSV export would hold"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        # IDs and whole amounts come back from Excel as floats
+        return str(int(value))
+    return str(value)
+
+
+def iter_csv_chunks(source: Any, chunk_rows: int = DEFAULT_READ_CHUNK_ROWS,
+                    usecols: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV bulk file as DataFrame chunks
+
+    Args:
+        source: Path or file-like object
+        chunk_rows: Rows per chunk
+        usecols: Columns to read (all when None); missing columns are skipped
+
+    Returns:
+        Iterator over DataFrames of strings ('' for empty cells)
+    """
+    columns = None
+    if usecols is not None:
+        header = pd.read_csv(source, nrows=0).columns
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        columns = [column for column in header if column in usecols]
+    reader = pd.read_csv(source, dtype=str, keep_default_na=False, usecols=columns, chunksize=chunk_rows)
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+
+def iter_xlsx_chunks(source: Any, chunk_rows: int = DEFAULT_READ_CHUNK_ROWS,
+                     usecols: Optional[List[str]] = None, sheet_name: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream an XLSX bulk file as DataFrame chunks using openpyxl's read-only mode
+
+    Args:
+        source: Path or file-like object
+        chunk_rows: Rows per chunk
+        usecols: Columns to read (all when None); missing columns are skipped
+        sheet_name: Worksheet to read; defaults to the first Sponsored Products sheet
+
+    Returns:
+        Iterator over DataFrames of strings ('' for empty cells)
+
+    Raises:
+        ImportError: If openpyxl is not installed
+    """
+    if openpyxl is None:
+        raise ImportError("Reading XLSX bulk files requires openpyxl: pip install openpyxl")
+
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        if sheet_name is None:
+            sheet_name = next(
+                (sheet for sheet in workbook.sheetnames if SPONSORED_PRODUCTS_SHEET in sheet),
+                workbook.sheetnames[0]
+            )
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = [_cell_text(value) for value in next(rows, ())]
+        # Trailing empty header cells are formatting, not columns
+        while header and not header[-1]:
+            header.pop()
+        positions = [i for i, column in enumerate(header) if usecols is None or column in usecols]
+        columns = [header[i] for i in positions]
+
+        chunk = []
+        for row in rows:
+            row_length = len(row)
+            chunk.append([_cell_text(row[i]) if i < row_length else '' for i in positions])
+            if len(chunk) >= chunk_rows:
+                yield pd.DataFrame(chunk, columns=columns)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=columns)
+    finally:
+        workbook.close()
+
+
+def iter_arrow_chunks(source: Any, chunk_rows: int = DEFAULT_READ_CHUNK_ROWS,
+                      usecols: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream a Parquet or Arrow IPC bulk file (see writers.ParquetBulkWriter) as DataFrame chunks
+
+    Args:
+        source: Path or file-like object; Parquet unless the extension is '.arrow'
+        chunk_rows: Rows per chunk
+        usecols: Columns to read (all when None); missing columns are skipped
+
+    Returns:
+        Iterator over DataFrames of strings ('' for empty cells)
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    if pyarrow is None:
+        raise ImportError("Reading Parquet/Arrow bulk files requires pyarrow: pip install pyarrow")
+
+    if _source_extension(source) == '.arrow':
+        reader = pyarrow.ipc.open_file(source)
+        schema = reader.schema
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    else:
+        parquet_file = pyarrow.parquet.ParquetFile(source)
+        schema = parquet_file.schema_arrow
+        batches = None
+    columns = [name for name in schema.names if usecols is None or name in usecols]
+    if batches is None:
+        batches = parquet_file.iter_batches(batch_size=chunk_rows, columns=columns)
+
+    for batch in batches:
+        batch = batch.select(columns)
+        for start in range(0, batch.num_rows, chunk_rows):
+            chunk = batch.slice(start, chunk_rows)
+            yield pd.DataFrame({
+                name: chunk.column(name).cast(pyarrow.string()).fill_null('').to_numpy(zero_copy_only=False)
+                for name in columns
+            }, columns=columns)
+
+
+def iter_bulk_file(source: Any, chunk_rows: int = DEFAULT_READ_CHUNK_ROWS,
+                   usecols: Optional[List[str]] = None, sheet_name: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV, XLSX, Parquet or Arrow IPC bulk file as DataFrame chunks
+
+    Args:
+        source: Path or file-like object; the format is taken from its extension
+            ('.csv', '.parquet', '.arrow', anything else is read as XLSX)
+        chunk_rows: Rows per chunk
+        usecols: Columns to read (all when None); missing columns are skipped
+        sheet_name: Worksheet to read from an XLSX file
+
+    Returns:
+        Iterator over DataFrames of strings ('' for empty cells)
+
+    Raises:
+        ImportError: If a Parquet or Arrow file is read without pyarrow, or an
+            XLSX file without openpyxl
+    """
+    extension = _source_extension(source)
+    if extension == '.csv':
+        return iter_csv_chunks(source, chunk_rows, usecols)
+    if extension in ('.parquet', '.arrow'):
+        return iter_arrow_chunks(source, chunk_rows, usecols)
+    return iter_xlsx_chunks(source, chunk_rows, usecols, sheet_name)
@@ -0,0 +1,241 @@
+"""
+Sharded bulk sheet export.
+
+Splits a bulk sheet row stream into several files at campaign boundaries, so a
+campaign is never separated from its ad groups, product ads and keywords, and
+writes a JSON manifest listing each shard with its row count and SHA-256 checksum.
+"""
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+from .writers import (
+    EXCEL_MAX_ROWS, NUMERIC_COLUMNS, XlsxBulkWriter, format_rows, iter_row_chunks
+)
+
+logger = logging.getLogger(__name__)
+
+# Entity value of the row that opens a campaign block
+CAMPAIGN_ENTITY = 'Campaign'
+
+# Shards written at the same time when max_workers is not given
+DEFAULT_SHARD_WORKERS = 4
+
+_HASH_BLOCK_BYTES = 1 << 20
+
+
+@dataclass
+class ShardInfo:
+    """One file of a sharded export"""
+    path: str
+    rows: int  # Data rows, excluding the header
+    campaigns: int
+    bytes: int  # File size on disk
+    sha256: str
+
+
+@dataclass
+class ShardManifest:
+    """Result of a sharded export"""
+    manifest_path: str
+    format: str
+    total_rows: int
+    shards: List[ShardInfo] = field(default_factory=list)
+
+    @property
+    def paths(self) -> List[str]:
+        """Shard file paths, in row order"""
+        return [shard.path for shard in self.shards]
+
+
+@dataclass
+class _CampaignBlock:
+    """Rows of one campaign and its children"""
+    rows: List[Sequence]
+    size: int  # Bytes the rows take in the output (CSV) or an estimate of it (XLSX)
+    payload: Optional[bytes] = None  # Encoded CSV text of the rows
+
+
+def iter_campaign_blocks(rows: Iterable[Any], headers: List[str]) -> Iterator[List[Sequence]]:
+    """
+    Group a bulk sheet row stream into campaign blocks
+
+    Args:
+        rows: Rows or row chunks in header order, e.g. from BulkSheetGenerator.iter_bulk_rows,
+            or a bulk sheet DataFrame (missing values become None)
+        headers: Column headers
+
+    Returns:
+        Iterator over lists of rows, each starting with a Campaign row (rows before
+        the first Campaign row form a block of their own)
+    """
+    if isinstance(rows, pd.DataFrame):
+        rows = rows[headers]
+    entity_index = headers.index('Entity')
+    block = []
+    for chunk in iter_row_chunks(rows):
+        for row in chunk:
+            if row[entity_index] == CAMPAIGN_ENTITY and block:
+                yield block
+                block = []
+            block.append(row)
+    if block:
+        yield block
+
+
+def _estimate_row_bytes(row: Sequence) -> int:
+    """Unquoted CSV size of a row"""
+    return sum(len(str(value)) for value in row if value is not None) + len(row) - 1 + len(os.linesep)
+
+
+def _encode_csv(rows: List[Sequence]) -> bytes:
+    """Rows as CSV text, encoded as CsvBulkWriter writes them"""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator=os.linesep).writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+
+def _file_sha256(path: str) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_BYTES), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_csv_shard(path: str, header: bytes, blocks: List[_CampaignBlock]) -> ShardInfo:
+    """Write a CSV shard from pre-encoded campaign blocks"""
+    digest = hashlib.sha256(header)
+    size = len(header)
+    with open(path, 'wb') as f:
+        f.write(header)
+        for block in blocks:
+            f.write(block.payload)
+            digest.update(block.payload)
+            size += len(block.payload)
+    return ShardInfo(
+        path=path,
+        rows=sum(len(block.rows) for block in blocks),
+        campaigns=len(blocks),
+        bytes=size,
+        sha256=digest.hexdigest()
+    )
+
+
+def _write_xlsx_shard(path: str, headers: List[str], blocks: List[_CampaignBlock]) -> ShardInfo:
+    """Write an XLSX shard"""
+    with XlsxBulkWriter(path, headers) as writer:
+        for block in blocks:
+            writer.write_rows(block.rows)
+    return ShardInfo(
+        path=path,
+        rows=writer.rows_written,
+        campaigns=len(blocks),
+        bytes=os.path.getsize(path),
+        sha256=_file_sha256(path)
+    )
+
+
+def write_sharded(rows: Iterable[Any], headers: List[str], output_dir: str, basename: str,
+                  format: str = 'csv', max_rows: Optional[int] = None, max_bytes: Optional[int] = None,
+                  max_workers: Optional[int] = None) -> ShardManifest:
+    """
+    Write a bulk sheet row stream as several files split at campaign boundaries
+
+    Shards are filled campaign by campaign until the next campaign would cross a
+    ceiling, then handed to a thread pool and written while the stream continues.
+    At most max_workers shards are buffered at a time.
+
+    Args:
+        rows: Rows or row chunks in header order, or a bulk sheet DataFrame
+        headers: Column headers
+        output_dir: Directory for the shards and the manifest
+        basename: File name prefix; shards are named {basename}_part001.{format}
+        format: Output format ('csv' or 'xlsx')
+        max_rows: Data rows per shard. Defaults to the Excel sheet limit for XLSX.
+        max_bytes: Bytes per shard. Exact for CSV; for XLSX it caps the uncompressed
+            cell text, which is larger than the zipped file.
+        max_workers: Shards written concurrently
+
+    Returns:
+        ShardManifest describing the written files
+
+    Raises:
+        ValueError: If the format is unsupported or a single campaign exceeds a ceiling
+    """
+    format = format.lower()
+    if format not in ('csv', 'xlsx'):
+        raise ValueError(f"Unsupported sharding format: {format}")
+    if format == 'xlsx':
+        max_rows = min(max_rows or EXCEL_MAX_ROWS - 1, EXCEL_MAX_ROWS - 1)
+
+    headers = list(headers)
+    numeric_indexes = [i for i, header in enumerate(headers) if header in NUMERIC_COLUMNS]
+    header_bytes = _encode_csv([headers])
+    max_workers = max_workers or DEFAULT_SHARD_WORKERS
+
+    def write_shard(index: int, blocks: List[_CampaignBlock]) -> ShardInfo:
+        path = os.path.join(output_dir, f"{basename}_part{index:03d}.{format}")
+        if format == 'csv':
+            return _write_csv_shard(path, header_bytes, blocks)
+        return _write_xlsx_shard(path, headers, blocks)
+
+    shards = []
+    pending: List[Future] = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        def submit(blocks: List[_CampaignBlock]) -> None:
+            if len(pending) >= max_workers:
+                shards.append(pending.pop(0).result())
+            pending.append(executor.submit(write_shard, len(shards) + len(pending) + 1, blocks))
+
+        blocks, shard_rows, shard_bytes = [], 0, len(header_bytes)
+        for block_rows in iter_campaign_blocks(rows, headers):
+            block_rows = list(format_rows(block_rows, numeric_indexes))
+            if format == 'csv':
+                payload = _encode_csv(block_rows)
+                block = _CampaignBlock(block_rows, len(payload), payload)
+            else:
+                block = _CampaignBlock(block_rows, sum(map(_estimate_row_bytes, block_rows)))
+
+            if ((max_rows is not None and len(block.rows) > max_rows) or
+                    (max_bytes is not None and len(header_bytes) + block.size > max_bytes)):
+                raise ValueError(
+                    f"Campaign {block.rows[0][headers.index('Campaign ID')]!r} has {len(block.rows)} rows "
+                    f"({block.size} bytes) and cannot fit in a single shard"
+                )
+            if blocks and ((max_rows is not None and shard_rows + len(block.rows) > max_rows) or
+                           (max_bytes is not None and shard_bytes + block.size > max_bytes)):
+                submit(blocks)
+                blocks, shard_rows, shard_bytes = [], 0, len(header_bytes)
+            blocks.append(block)
+            shard_rows += len(block.rows)
+            shard_bytes += block.size
+
+        if blocks or not (shards or pending):
+            submit(blocks)
+        shards.extend(future.result() for future in pending)
+
+    manifest = ShardManifest(
+        manifest_path=os.path.join(output_dir, f"{basename}_manifest.json"),
+        format=format,
+        total_rows=sum(shard.rows for shard in shards),
+        shards=shards
+    )
+    with open(manifest.manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'format': manifest.format,
+            'total_rows': manifest.total_rows,
+            'shards': [dict(asdict(shard), path=os.path.basename(shard.path)) for shard in shards]
+        }, f, indent=2)
+
+    logger.info(f"Wrote {manifest.total_rows} rows in {len(shards)} {format.upper()} shards: {manifest.manifest_path}")
+    return manifest
@@ -0,0 +1,464 @@
+import csv
+import gzip
+import os
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .formatters import DataFormatter
+
+try:
+    import xlsxwriter
+except ImportError:  # pragma: no cover - optional until streaming XLSX is used
+    xlsxwriter = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - optional until Parquet/Arrow export is used
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+# Columns formatted with two decimals, as in BulkSheetGenerator._format_dataframe
+NUMERIC_COLUMNS = ['Daily Budget', 'Bid', 'Ad Group Default Bid']
+
+# Rows grouped per chunk when a stream yields single rows
+DEFAULT_CHUNK_ROWS = 10000
+
+# Excel worksheet limits
+EXCEL_MAX_ROWS = 1048576  # Including the header row
+EXCEL_SHEET_NAME = 'Sponsored Products'
+
+# Columns with a distinct value per campaign, stored as plain strings in Parquet/Arrow
+# output; every other column repeats values across rows and is dictionary-encoded
+UNIQUE_VALUE_COLUMNS = ['Campaign ID', 'Ad Group ID', 'Campaign Name', 'Ad Group Name']
+
+# Compression of Parquet / Arrow IPC output
+ARROW_COMPRESSION = 'zstd'
+
+# Rows per Parquet row group
+PARQUET_ROW_GROUP_ROWS = 131072
+
+
+def iter_row_chunks(rows: Iterable[Any], keep_column_batches: bool = False) -> Iterator[Any]:
+    """
+    Normalize a row stream into a stream of row chunks
+
+    Args:
+        rows: Iterable of rows (tuples), of chunks (lists of rows) as yielded by
+            BulkSheetGenerator.iter_bulk_rows, or of column batches (dicts of
+            columns in header order) as yielded by BulkSheetGenerator.iter_bulk_columns;
+            or a DataFrame with its columns in header order, streamed in column
+            batches so missing values (NaN in compact/categorical frames) stay empty
+        keep_column_batches: Pass column batches through instead of converting them to rows
+
+    Returns:
+        Iterator over lists of rows (and column batches if keep_column_batches)
+    """
+    if isinstance(rows, pd.DataFrame):
+        rows = iter_dataframe_batches(rows)
+    pending = []
+    for item in rows:
+        if isinstance(item, dict):
+            # A column batch, as yielded by BulkSheetGenerator.iter_bulk_columns
+            if pending:
+                yield pending
+                pending = []
+            yield item if keep_column_batches else list(zip(*item.values()))
+        elif isinstance(item, list):
+            if pending:
+                yield pending
+                pending = []
+            yield item
+        else:
+            pending.append(item)
+            if len(pending) >= DEFAULT_CHUNK_ROWS:
+                yield pending
+                pending = []
+    if pending:
+        yield pending
+
+
+def iter_dataframe_batches(df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Split a bulk sheet DataFrame into column batches
+
+    Args:
+        df: Bulk sheet DataFrame (categorical columns are fine)
+        chunk_rows: Rows per batch
+
+    Returns:
+        Iterator over dicts of object arrays in column order, None for missing values
+    """
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        batch = {}
+        for column in df.columns:
+            values = chunk[column].to_numpy(dtype=object)
+            missing = pd.isna(values)
+            if missing.any():
+                # to_numpy may return a view of the DataFrame's own data
+                values = values.copy()
+                values[missing] = None
+            batch[column] = values
+        yield batch
+
+
+def format_rows(rows: Iterable[Sequence], numeric_indexes: List[int]) -> Iterator[Sequence]:
+    """
+    Format numeric budget/bid values with two decimals
+
+    Args:
+        rows: Rows in header order
+        numeric_indexes: Positions of the NUMERIC_COLUMNS in a row
+
+    Returns:
+        Iterator over the rows; rows whose amounts are already strings are passed through
+    """
+    for row in rows:
+        if any(row[i] is not None and not isinstance(row[i], str) for i in numeric_indexes):
+            row = list(row)
+            for i in numeric_indexes:
+                if not isinstance(row[i], str):
+                    row[i] = DataFormatter.format_amount(row[i])
+        yield row
+
+
+class CsvBulkWriter:
+    """Class to write bulk sheet rows to a CSV file as they are produced"""
+
+    def __init__(self, output_path: str, headers: List[str]):
+        """
+        Initialize CsvBulkWriter and write the header row
+
+        Args:
+            output_path: Path of the CSV file to create
+            headers: Column headers, in output order
+        """
+        self.output_path = output_path
+        self.headers = list(headers)
+        self.rows_written = 0
+        self._numeric_indexes = [i for i, header in enumerate(self.headers) if header in NUMERIC_COLUMNS]
+        # Match DataFrame.to_csv defaults: utf-8, minimal quoting, os.linesep line endings
+        self._file = self._open(output_path)
+        self._writer = csv.writer(self._file, lineterminator=os.linesep)
+        self._writer.writerow(self.headers)
+
+    def _open(self, output_path: str):
+        return open(output_path, 'w', newline='', encoding='utf-8')
+
+    def write_rows(self, rows: Iterable[Sequence]) -> None:
+        """
+        Write a batch of rows
+
+        Args:
+            rows: Rows in header order. Numeric values in the budget/bid columns are
+                formatted with two decimals; already formatted strings are kept as is.
+        """
+        count = 0
+        for row in format_rows(rows, self._numeric_indexes):
+            self._writer.writerow(row)
+            count += 1
+        self.rows_written += count
+
+    def close(self) -> None:
+        """Flush and close the output file"""
+        if not self._file.closed:
+            self._file.close()
+            logger.info(f"Wrote {self.rows_written} rows to CSV file: {self.output_path}")
+
+    def __enter__(self) -> 'CsvBulkWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class GzipCsvBulkWriter(CsvBulkWriter):
+    """Class to write bulk sheet rows to a gzip-compressed CSV file as they are produced"""
+
+    # zlib level 6: most of level 9's ratio at a fraction of its cost
+    COMPRESS_LEVEL = 6
+
+    def _open(self, output_path: str):
+        return gzip.open(output_path, 'wt', compresslevel=self.COMPRESS_LEVEL, newline='', encoding='utf-8')
+
+
+class XlsxBulkWriter:
+    """Class to write bulk sheet rows to an XLSX file in constant memory"""
+
+    def __init__(self, output_path: str, headers: List[str], sheet_name: str = EXCEL_SHEET_NAME):
+        """
+        Initialize XlsxBulkWriter and write the header row
+
+        Rows are flushed to disk as they are written (xlsxwriter constant_memory
+        mode). Column widths are tracked as running per-column maxima and applied
+        on close, matching the auto-sizing of FileHandler._save_excel.
+
+        Args:
+            output_path: Path of the XLSX file to create
+            headers: Column headers, in output order
+            sheet_name: Worksheet name
+
+        Raises:
+            ImportError: If xlsxwriter is not installed
+        """
+        if xlsxwriter is None:
+            raise ImportError("Streaming XLSX export requires xlsxwriter: pip install xlsxwriter")
+
+        self.output_path = output_path
+        self.headers = list(headers)
+        self.rows_written = 0
+        self._numeric_indexes = [i for i, header in enumerate(self.headers) if header in NUMERIC_COLUMNS]
+        self._workbook = xlsxwriter.Workbook(output_path, {
+            'constant_memory': True,
+            'strings_to_numbers': False,
+            'strings_to_formulas': False,
+            'strings_to_urls': False
+        })
+        self._worksheet = self._workbook.add_worksheet(sheet_name)
+        # Same header style pandas applies in DataFrame.to_excel
+        header_format = self._workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+        self._worksheet.write_row(0, 0, self.headers, header_format)
+        self._max_lengths = [len(str(header)) for header in self.headers]
+        self._closed = False
+
+    def write_rows(self, rows: Iterable[Sequence]) -> None:
+        """
+        Write a batch of rows
+
+        Args:
+            rows: Rows in header order. Numeric values in the budget/bid columns are
+                formatted with two decimals; already formatted strings are kept as is.
+
+        Raises:
+            ValueError: If the rows would exceed Excel's worksheet row limit
+        """
+        rows = list(rows)
+        if not rows:
+            return
+        if self.rows_written + len(rows) + 1 > EXCEL_MAX_ROWS:
+            raise ValueError(
+                f"Bulk sheet exceeds Excel's limit of {EXCEL_MAX_ROWS} rows per sheet; "
+                "export as CSV or split the job"
+            )
+
+        worksheet = self._worksheet
+        row_idx = self.rows_written + 1
+        rows = list(format_rows(rows, self._numeric_indexes))
+        for row in rows:
+            worksheet.write_row(row_idx, 0, row)
+            row_idx += 1
+
+        # Update running column widths from the written values, one column at a time
+        for i, column in enumerate(zip(*rows)):
+            longest = max((len(str(value)) for value in column if value is not None), default=0)
+            if longest > self._max_lengths[i]:
+                self._max_lengths[i] = longest
+
+        self.rows_written += len(rows)
+
+    def close(self) -> None:
+        """Apply column widths and close the workbook"""
+        if self._closed:
+            return
+        for i, max_length in enumerate(self._max_lengths):
+            self._worksheet.set_column(i, i, max_length + 2)
+        self._workbook.close()
+        self._closed = True
+        logger.info(f"Wrote {self.rows_written} rows to Excel file: {self.output_path}")
+
+    def __enter__(self) -> 'XlsxBulkWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class _ArrowBulkWriter:
+    """Base class of the Parquet and Arrow IPC writers
+
+    Rows and column batches are converted to Arrow record batches. Repeated
+    columns use dictionary<int32, string>; each column keeps one dictionary that
+    only grows, so later batches extend it instead of replacing it.
+    """
+
+    FORMAT_NAME = ''
+
+    def __init__(self, output_path: str, headers: List[str]):
+        if pyarrow is None:
+            raise ImportError(f"{self.FORMAT_NAME} export requires pyarrow: pip install pyarrow")
+
+        self.output_path = output_path
+        self.headers = list(headers)
+        self.rows_written = 0
+        self._numeric_indexes = [i for i, header in enumerate(self.headers) if header in NUMERIC_COLUMNS]
+        self.schema = pyarrow.schema([
+            (header, pyarrow.string() if header in UNIQUE_VALUE_COLUMNS
+             else pyarrow.dictionary(pyarrow.int32(), pyarrow.string()))
+            for header in self.headers
+        ])
+        # Distinct values seen so far per dictionary column, as an index and as the Arrow dictionary
+        self._values = {header: pd.Index([], dtype=object) for header in self.headers
+                        if header not in UNIQUE_VALUE_COLUMNS}
+        self._dictionaries = {header: pyarrow.array([], type=pyarrow.string()) for header in self._values}
+        self._closed = False
+
+    def _encode(self, header: str, values: np.ndarray) -> 'pyarrow.Array':
+        """Convert one column of a batch, extending the column's dictionary with new values"""
+        if header not in self._values:
+            return pyarrow.array(values, type=pyarrow.string(), from_pandas=True)
+
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        known = self._values[header]
+        positions = known.get_indexer(uniques)
+        new = positions < 0
+        if new.any():
+            positions[new] = np.arange(len(known), len(known) + int(new.sum()))
+            added = [str(value) for value in uniques[new]]
+            self._values[header] = known.append(pd.Index(added, dtype=object))
+            self._dictionaries[header] = pyarrow.concat_arrays([
+                self._dictionaries[header], pyarrow.array(added, type=pyarrow.string())
+            ])
+        # Code -1 (missing) picks the trailing 0 and is masked out
+        indices = np.append(positions, 0)[codes].astype(np.int32)
+        return pyarrow.DictionaryArray.from_arrays(
+            pyarrow.array(indices, mask=codes < 0), self._dictionaries[header]
+        )
+
+    def write_columns(self, columns: Dict[str, Sequence]) -> None:
+        """
+        Write a batch of columns
+
+        Args:
+            columns: Column values keyed by header, already formatted (as built by
+                BulkSheetGenerator.iter_bulk_columns); None or NaN for empty cells
+        """
+        arrays = [self._encode(header, np.asarray(columns[header], dtype=object)) for header in self.headers]
+        batch = pyarrow.RecordBatch.from_arrays(arrays, schema=self.schema)
+        if batch.num_rows:
+            self._write_batch(batch)
+            self.rows_written += batch.num_rows
+
+    def write_rows(self, rows: Iterable[Sequence]) -> None:
+        """
+        Write a batch of rows
+
+        Args:
+            rows: Rows in header order. Numeric values in the budget/bid columns are
+                formatted with two decimals; already formatted strings are kept as is.
+        """
+        rows = list(format_rows(rows, self._numeric_indexes))
+        if rows:
+            self.write_columns(dict(zip(self.headers, zip(*rows))))
+
+    def write_dataframe(self, df: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> None:
+        """
+        Write a bulk sheet DataFrame, as returned by BulkSheetGenerator.generate_bulk_sheet
+
+        Args:
+            df: DataFrame with the bulk sheet headers (categorical columns are fine)
+            chunk_rows: Rows converted per batch
+        """
+        for batch in iter_dataframe_batches(df[self.headers], chunk_rows):
+            self.write_columns(batch)
+
+    def _write_batch(self, batch: 'pyarrow.RecordBatch') -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Finish and close the output file"""
+        if self._closed:
+            return
+        self._close()
+        self._closed = True
+        logger.info(f"Wrote {self.rows_written} rows to {self.FORMAT_NAME} file: {self.output_path}")
+
+    def __enter__(self) -> '_ArrowBulkWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class ParquetBulkWriter(_ArrowBulkWriter):
+    """Class to write bulk sheet rows to a Parquet file as they are produced"""
+
+    FORMAT_NAME = 'Parquet'
+
+    def __init__(self, output_path: str, headers: List[str], row_group_rows: int = PARQUET_ROW_GROUP_ROWS):
+        """
+        Initialize ParquetBulkWriter
+
+        Batches are buffered into row groups of row_group_rows rows. The Arrow
+        schema is stored in the file, so repeated columns read back as
+        dictionary (categorical) columns.
+
+        Args:
+            output_path: Path of the Parquet file to create
+            headers: Column headers, in output order
+            row_group_rows: Rows per row group
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        super().__init__(output_path, headers)
+        self.row_group_rows = row_group_rows
+        self._pending: List['pyarrow.RecordBatch'] = []
+        self._pending_rows = 0
+        self._writer = pyarrow.parquet.ParquetWriter(output_path, self.schema, compression=ARROW_COMPRESSION)
+
+    def _write_batch(self, batch: 'pyarrow.RecordBatch') -> None:
+        self._pending.append(batch)
+        self._pending_rows += batch.num_rows
+        if self._pending_rows >= self.row_group_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._pending:
+            table = pyarrow.Table.from_batches(self._pending, schema=self.schema)
+            self._writer.write_table(table, row_group_size=self.row_group_rows)
+            self._pending = []
+            self._pending_rows = 0
+
+    def _close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+class ArrowBulkWriter(_ArrowBulkWriter):
+    """Class to write bulk sheet rows to an Arrow IPC (Feather v2) file as they are produced"""
+
+    FORMAT_NAME = 'Arrow'
+
+    def __init__(self, output_path: str, headers: List[str]):
+        """
+        Initialize ArrowBulkWriter
+
+        Each batch becomes one record batch; dictionaries are written once and
+        then extended with delta batches. The file can be memory-mapped with
+        pyarrow.ipc.open_file or read with pandas.read_feather.
+
+        Args:
+            output_path: Path of the Arrow file to create
+            headers: Column headers, in output order
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        super().__init__(output_path, headers)
+        options = pyarrow.ipc.IpcWriteOptions(compression=ARROW_COMPRESSION, emit_dictionary_deltas=True)
+        self._writer = pyarrow.ipc.new_file(output_path, self.schema, options=options)
+
+    def _write_batch(self, batch: 'pyarrow.RecordBatch') -> None:
+        self._writer.write_batch(batch)
+
+    def _close(self) -> None:
+        self._writer.close()
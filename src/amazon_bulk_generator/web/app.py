@@ -8,14 +8,18 @@ import re
 
 from amazon_bulk_generator.auth.wordpress_auth import WordPressAuth
 from amazon_bulk_generator.core.generator import BulkSheetGenerator, CampaignSettings
+from amazon_bulk_generator.core.diff import BulkSheetIdentityIndex
+from amazon_bulk_generator.core.planner import JobLimits, JobTooLargeError
+from amazon_bulk_generator.core.templates import compile_name_template
+from amazon_bulk_generator.core.validation_cache import VALIDATION_CACHE, IncrementalValidator
 from amazon_bulk_generator.core.validators import (
-    validate_keywords,
-    validate_skus,
+    ValidationReport,
     validate_campaign_settings,
     validate_name_template
 )
 from amazon_bulk_generator.utils.file_handlers import FileHandler
 from amazon_bulk_generator.utils.formatters import TextFormatter, DataFormatter
+from amazon_bulk_generator.utils.instrumentation import Profiler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,11 +27,18 @@ logger = logging.getLogger(__name__)
 
 class BulkCampaignApp:
     def __init__(self):
-        self.generator = BulkSheetGenerator()
-        self.file_handler = FileHandler()
+        # Per-stage timings are logged and shown after generation when BULK_PROFILE=true
+        self.profiler = Profiler(enabled=os.environ.get('BULK_PROFILE', 'False').lower() == 'true')
+        # The Excel export holds at most 1,048,575 data rows per sheet
+        self.generator = BulkSheetGenerator(limits=JobLimits(max_rows=1048575), profiler=self.profiler)
+        self.file_handler = FileHandler(profiler=self.profiler)
         self.text_formatter = TextFormatter()
+        # Parsed and validated inputs are reused across reruns and sessions while the text is unchanged
+        self.validation_cache = VALIDATION_CACHE
         self.data_formatter = DataFormatter()
         self.auth = WordPressAuth()
+        # Rejects file columns of the keywords/SKUs quarantined during this run
+        self.rejects = []
         
         self.part_mapping = {
             "SKU": "[SKU]",
@@ -92,6 +103,12 @@ class BulkCampaignApp:
         # Step 1: Keywords + SKUs Input
         if st.session_state.step == 1:
             st.header("Step 1: Enter Keywords and SKUs")
+            st.checkbox(
+                "Quarantine invalid entries",
+                key="quarantine",
+                help="Skip invalid keywords/SKUs instead of blocking the job; they are written to a rejects "
+                     "file with the reason and the bulk sheet is generated from the valid ones"
+            )
 
             col1, col2 = st.columns(2)
             with col1:
@@ -113,6 +130,9 @@ class BulkCampaignApp:
                             st.session_state.skus = skus
                             st.session_state.keyword_group_size = keyword_group_size
                             st.session_state.sku_group_size = sku_group_size
+                            st.session_state.rejects_path = (
+                                self.file_handler.save_rejects(self.rejects) if self.rejects else None
+                            )
                             st.session_state.step = 2
                             st.rerun()
 
@@ -120,6 +140,11 @@ class BulkCampaignApp:
         elif st.session_state.step == 2:
             st.header("Step 2: Configure Campaign Settings")
             settings, settings_error = self.get_campaign_settings()
+            previous_file = st.file_uploader(
+                "Previous bulk file (optional)",
+                type=['xlsx', 'csv'],
+                help="Only campaigns, ad groups, product ads and keywords not already in this file are exported"
+            )
 
             with st.container():
                 st.markdown("---")
@@ -146,11 +171,34 @@ class BulkCampaignApp:
                                 sku_group_size=settings.sku_group_size
                             )
 
-                            self.generate_bulk_sheet(
+                            plan = self.generator.dry_run(
                                 st.session_state.keywords,
                                 st.session_state.skus,
                                 campaign_settings
                             )
+                            st.info(
+                                f"Planned: {plan.campaigns:,} campaigns, {plan.total_rows:,} rows, "
+                                f"~{plan.estimated_output_bytes / 1024 / 1024:.1f} MB"
+                            )
+                            if not plan.within_limits:
+                                for violation in plan.violations:
+                                    st.error(f"❌ {violation}")
+                                if plan.parts:
+                                    st.warning(
+                                        f"Reduce the number of keywords/SKUs or increase the group sizes "
+                                        f"(the job would need {plan.parts} separate bulk sheets)."
+                                    )
+                                else:
+                                    st.warning("Reduce the keyword/SKU group sizes.")
+                                return
+
+                            self.generate_bulk_sheet(
+                                st.session_state.keywords,
+                                st.session_state.skus,
+                                campaign_settings,
+                                previous_file,
+                                plan
+                            )
 
     def get_keywords_input(self) -> Tuple[list, bool, int]:
         """Get and validate keywords input"""
@@ -176,7 +224,7 @@ class BulkCampaignApp:
             )
             
             if keyword_text:
-                keywords = self.text_formatter.clean_text_input(keyword_text)
+                keywords = self.validation_cache.clean_text_input(keyword_text)
         else:
             keyword_file = st.file_uploader(
                 "Upload keywords CSV",
@@ -190,11 +238,18 @@ class BulkCampaignApp:
                     has_error = True
         
         if keywords and not has_error:
-            valid, error = validate_keywords(keywords)
-            if not valid:
-                st.error(error)
+            with self.profiler.span('validate.keywords', rows=len(keywords)):
+                if input_method == "Type/Paste":
+                    # Edits of the text area only re-validate the changed lines
+                    report = self.incremental_validator('keywords').update(keywords)
+                else:
+                    report = self.validation_cache.validate_keywords(keywords)
+            if not report.valid and self.can_quarantine(report):
+                keywords = self.quarantine_invalid(keywords, report)
+            elif not report.valid:
+                self.show_validation_errors(report)
                 has_error = True
-            else:
+            if not has_error:
                 st.success(f"Successfully loaded {len(keywords)} keywords")
                 
                 enable_grouping = st.checkbox(
@@ -243,7 +298,7 @@ class BulkCampaignApp:
             )
             
             if sku_text:
-                skus = self.text_formatter.clean_text_input(sku_text)
+                skus = self.validation_cache.clean_text_input(sku_text)
         else:
             sku_file = st.file_uploader(
                 "Upload SKUs CSV",
@@ -257,11 +312,18 @@ class BulkCampaignApp:
                     has_error = True
         
         if skus and not has_error:
-            valid, error = validate_skus(skus)
-            if not valid:
-                st.error(error)
+            with self.profiler.span('validate.skus', rows=len(skus)):
+                if input_method == "Type/Paste":
+                    # Edits of the text area only re-validate the changed lines
+                    report = self.incremental_validator('skus').update(skus)
+                else:
+                    report = self.validation_cache.validate_skus(skus)
+            if not report.valid and self.can_quarantine(report):
+                skus = self.quarantine_invalid(skus, report)
+            elif not report.valid:
+                self.show_validation_errors(report)
                 has_error = True
-            else:
+            if not has_error:
                 st.success(f"Successfully loaded {len(skus)} SKUs")
                 
                 enable_grouping = st.checkbox(
@@ -286,6 +348,52 @@ class BulkCampaignApp:
         
         return skus, has_error, group_size
 
+    def incremental_validator(self, kind: str) -> IncrementalValidator:
+        """This session's validator for the keywords or SKUs text area"""
+        key = f"{kind}_validator"
+        if key not in st.session_state:
+            st.session_state[key] = IncrementalValidator(kind)
+        return st.session_state[key]
+
+    def show_validation_errors(self, report: ValidationReport, limit: int = 100):
+        """Show every failing keyword/SKU of a batch validation, listing the first `limit`"""
+        if report.list_error:
+            st.error(report.list_error)
+            return
+        if report.error_count == 1:
+            st.error(report.reason(0))
+            return
+
+        counts = ", ".join(f"{count} {reason}" for reason, count in report.counts().items())
+        st.error(f"{report.error_count} of {report.total} {report.plural} are invalid ({counts})")
+        self._list_validation_errors(report, limit, expanded=True)
+
+    def can_quarantine(self, report: ValidationReport) -> bool:
+        """Whether quarantine mode is on and leaves something to generate from"""
+        return (
+            st.session_state.get('quarantine', False)
+            and report.list_error is None
+            and report.error_count < report.total
+        )
+
+    def quarantine_invalid(self, items: list, report: ValidationReport) -> list:
+        """Drop the invalid items of a list and keep them for the rejects file"""
+        valid_items = report.partition(items)
+        self.rejects.append(report.rejects())
+        st.warning(
+            f"⚠️ {report.error_count} invalid {report.plural} quarantined; "
+            f"continuing with {len(valid_items)} (they are saved to a rejects file on continue)"
+        )
+        self._list_validation_errors(report)
+        return valid_items
+
+    def _list_validation_errors(self, report: ValidationReport, limit: int = 100, expanded: bool = False):
+        """List the first `limit` failing items of a report"""
+        with st.expander(f"Invalid {report.plural}", expanded=expanded):
+            st.text("\n".join(f"Line {index + 1}: {message}" for index, message in report.errors(limit)))
+            if report.error_count > limit:
+                st.caption(f"... and {report.error_count - limit} more")
+
     def _arrange_template_parts(self, title: str, available_parts: List[str], default_parts: List[str]) -> str:
         """Create a user-friendly interface for arranging template parts"""
         st.markdown(f"### 📝 {title}")
@@ -365,7 +473,8 @@ class BulkCampaignApp:
         
         if template:
             st.markdown("##### Example Output")
-            example = template.replace("[SKU]", "ABC123").replace("match_type", "exact").replace("[KW]", "keyword")
+            render = compile_name_template(template, datetime.today().strftime(BulkSheetGenerator.DATE_FORMAT))
+            example = render(sku="ABC123", match_type="exact", keyword="gaming_keyboard", root="gaming")
             st.code(example)
         
         return template
@@ -434,23 +543,48 @@ class BulkCampaignApp:
             sku_group_size=st.session_state.get('sku_group_size')
         )
         
-        valid, error = validate_campaign_settings(settings)
+        with self.profiler.span('validate.settings'):
+            valid, error = validate_campaign_settings(settings)
         if not valid:
             st.error(error)
             has_error = True
         
         return settings, has_error
 
-    def generate_bulk_sheet(self, keywords: list, skus: list, settings: CampaignSettings):
-        """Generate and display bulk sheet"""
+    def generate_bulk_sheet(self, keywords: list, skus: list, settings: CampaignSettings, previous_file=None,
+                            plan=None):
+        """Generate and display bulk sheet (plan: the dry run of the same job, reused by the generator)"""
         try:
-            df = self.generator.generate_bulk_sheet(keywords, skus, settings)
-            preview_df = self.data_formatter.prepare_preview_data(df)
-            
-            excel_path = self.file_handler.save_bulk_sheet(df, 'xlsx')
-            csv_path = self.file_handler.save_bulk_sheet(df, 'csv')
+            with self.profiler.span('bulk_sheet') as span:
+                if previous_file is not None:
+                    with self.profiler.span('read.previous'):
+                        previous = BulkSheetIdentityIndex.from_file(previous_file)
+                    df = self.generator.generate_incremental_bulk_sheet(keywords, skus, settings, previous, plan)
+                    st.info(f"{len(df):,} new rows compared to {previous_file.name}")
+                    if df.empty:
+                        st.warning("Everything is already in the previous bulk file. Nothing to export.")
+                        return
+                else:
+                    df = self.generator.generate_bulk_sheet(keywords, skus, settings, plan)
+                span.record(rows=len(df))
+                with self.profiler.span('preview'):
+                    preview_df = self.data_formatter.prepare_preview_data(df)
+                
+                # One pass over the rows feeds the Excel and CSV writers concurrently
+                paths = self.file_handler.save_bulk_sheet_formats(df, ['xlsx', 'csv'])
+                excel_path, csv_path = paths['xlsx'], paths['csv']
             
             st.success("Bulk sheet generated successfully!")
+            if self.profiler.enabled:
+                profile = self.profiler.reset()
+                logger.info(f"Bulk sheet profile: {profile.to_dict()}")
+                with st.expander(f"⏱️ Timings ({profile.total_seconds:.2f}s)"):
+                    st.text(profile.summary())
+                    cache = self.validation_cache.stats()
+                    st.caption(
+                        f"Validation cache: {cache.hits} hits, {cache.misses} misses "
+                        f"({cache.hit_rate:.0%} hit rate), {cache.entries} entries"
+                    )
             
             col1, col2 = st.columns(2)
             with col1:
@@ -471,9 +605,22 @@ class BulkCampaignApp:
                         mime="text/csv"
                     )
             
+            rejects_path = st.session_state.get('rejects_path')
+            if rejects_path and os.path.exists(rejects_path):
+                with open(rejects_path, 'rb') as f:
+                    st.download_button(
+                        "Download Rejected Keywords/SKUs",
+                        f.read(),
+                        file_name=os.path.basename(rejects_path),
+                        mime="text/csv"
+                    )
+            
             st.markdown("### 🔍 Preview")
             st.dataframe(preview_df)
             
+        except JobTooLargeError as e:
+            logger.warning(f"Bulk sheet rejected: {str(e)}")
+            st.error(f"❌ {str(e)}")
         except Exception as e:
             logger.error(f"Error generating bulk sheet: {str(e)}")
             st.error(f"Error generating bulk sheet: {str(e)}")
@@ -0,0 +1,34 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+# Run the tests against the source tree without installing the package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from amazon_bulk_generator.core.generator import CampaignSettings  # noqa: E402
+
+
+@pytest.fixture
+def settings():
+    """Settings with the default name templates, under which campaign names repeat across SKUs"""
+    return CampaignSettings(
+        daily_budget=10.0,
+        start_date=date(2035, 1, 1),
+        match_types=['exact', 'phrase'],
+        bids={'exact': 1.0, 'phrase': 0.5}
+    )
+
+
+@pytest.fixture
+def sku_settings():
+    """Settings with unique campaign and ad group names"""
+    return CampaignSettings(
+        daily_budget=10.0,
+        start_date=date(2035, 1, 1),
+        match_types=['exact', 'phrase'],
+        bids={'exact': 1.0, 'phrase': 0.5},
+        campaign_name_template='SP_[SKU]_match_type_[KW]',
+        ad_group_name_template='AG_[SKU]_match_type'
+    )
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from amazon_bulk_generator.core import bids
+from amazon_bulk_generator.core.bids import KeywordBidTable
+from amazon_bulk_generator.core.generator import BulkSheetGenerator
+
+
+def resolve(table, keywords, default=0.1):
+    return table.resolve(keywords, ['exact'], {'exact': default})[:, 0].tolist()
+
+
+@pytest.fixture
+def colliding_hashes(monkeypatch):
+    """Make every keyword hash collide with the keywords of the same length modulo 3"""
+    def hash_array(values, categorize=False):
+        return np.array([len(str(value)) % 3 for value in values], dtype=np.uint64)
+    monkeypatch.setattr(bids.pd.util, 'hash_array', hash_array)
+
+
+def test_from_dict_matches_exactly():
+    table = KeywordBidTable.from_dict({'Laptop Stand': 1.5, 'usb  hub': 0.8, 5: 9.0})
+    assert resolve(table, ['Laptop Stand', 'laptop stand', 'usb  hub', 'usb hub', '5']) == [1.5, 0.1, 0.8, 0.1, 0.1]
+
+
+def test_normalized_matching_and_last_duplicate_wins():
+    table = KeywordBidTable.from_keywords(['Laptop  Stand', 'laptop stand', 'desk lamp'],
+                                          {'exact': [1.0, 2.0, np.nan], 'any': [np.nan, np.nan, 0.7]})
+    assert len(table) == 2
+    assert table.resolve(['LAPTOP STAND', 'desk lamp', 'other'], ['exact', 'phrase'],
+                         {'exact': 0.1, 'phrase': 0.2}).tolist() == [[2.0, 0.2], [0.7, 0.7], [0.1, 0.2]]
+
+
+def test_hash_collisions_never_apply_another_keywords_bid(colliding_hashes):
+    table = KeywordBidTable.from_keywords(['ab', 'cd', 'ef', 'ab', 'xyz'], {'any': [1, 2, 3, 4, 5]}, normalize=False)
+    assert resolve(table, ['ab', 'cd', 'ef', 'xyz', 'gh', 'uvw']) == [4.0, 2.0, 3.0, 5.0, 0.1, 0.1]
+
+
+def test_missing_keywords_are_dropped():
+    table = KeywordBidTable.from_keywords(['nan', None, float('nan')], {'any': [1.0, 2.0, 3.0]}, normalize=False)
+    assert len(table) == 1
+    assert resolve(table, ['nan', 'None']) == [1.0, 0.1]
+
+
+def test_from_csv_engines_agree(tmp_path):
+    path = tmp_path / 'bids.csv'
+    pd.DataFrame({
+        'Keyword': ['laptop stand', 'Desk Lamp', None, 'usb hub'],
+        'Bid': [1.0, 2.0, 3.0, None],
+        'Exact Bid': [None, 2.5, None, 0.9]
+    }).to_csv(path, index=False)
+
+    tables = [KeywordBidTable.from_csv(str(path)), KeywordBidTable.from_csv(str(path), chunk_rows=2)]
+    for table in tables:
+        assert table.resolve(['desk lamp', 'laptop stand', 'usb hub'], ['exact', 'broad'],
+                             {'exact': 0.1, 'broad': 0.2}).tolist() == [[2.5, 2.0], [1.0, 1.0], [0.9, 0.2]]
+
+
+def test_from_csv_keeps_keyword_text(tmp_path):
+    path = tmp_path / 'bids.csv'
+    path.write_text('Keyword,Bid,Exact Bid\nNA,1.1,\nnull,1.2,2\nNone,1.3,\nshoe,1.4,x\n,1.5,\nnan,1.6,\n007,1.7,\n')
+    keywords = ['NA', 'null', 'None', 'shoe', 'nan', '007', '7', '']
+
+    tables = [KeywordBidTable.from_csv(str(path), normalize=False),
+              KeywordBidTable.from_csv(str(path), normalize=False, chunk_rows=2)]
+    resolved = [table.resolve(keywords, ['exact', 'phrase'], {'exact': 0.1, 'phrase': 0.2}).tolist()
+                for table in tables]
+    assert [len(table) for table in tables] == [6, 6]
+    assert resolved[0] == resolved[1]
+    assert resolved[0] == [[1.1, 1.1], [2.0, 1.2], [1.3, 1.3], [1.4, 1.4], [1.6, 1.6], [1.7, 1.7],
+                           [0.1, 0.2], [0.1, 0.2]]
+
+
+def test_load_keyword_bids_keeps_keyword_text(tmp_path):
+    path = tmp_path / 'bids.csv'
+    path.write_text('Keyword,Bid\nNA,1.1\nnull,1.2\nNone,1.3\n007,1.4\nshoe,x\n')
+    assert BulkSheetGenerator.load_keyword_bids(str(path)) == {'NA': 1.1, 'null': 1.2, 'None': 1.3, '007': 1.4}
+
+
+def test_save_and_load_memory_mapped(tmp_path):
+    table = KeywordBidTable.from_keywords(['laptop stand', 'desk lamp'], {'exact': [1.0, 2.0]})
+    table.save(str(tmp_path))
+
+    loaded = KeywordBidTable.load(str(tmp_path))
+    assert isinstance(loaded.hashes, np.memmap)
+    assert resolve(loaded, ['Desk Lamp', 'laptop stand', 'other']) == [2.0, 1.0, 0.1]
+    assert KeywordBidTable.load(str(tmp_path), normalize=False) is None
+
+
+def test_from_csv_cache_is_invalidated_by_changes(tmp_path):
+    path = tmp_path / 'bids.csv'
+    path.write_text("Keyword,Bid\nlaptop stand,1.5\n")
+    cache = str(tmp_path / 'cache')
+    KeywordBidTable.from_csv(str(path), cache_dir=cache)
+    assert resolve(KeywordBidTable.from_csv(str(path), cache_dir=cache), ['laptop stand']) == [1.5]
+
+    path.write_text("Keyword,Bid\nlaptop stand,2.25\n")
+    assert KeywordBidTable.load(cache, source=str(path)) is None
+    assert resolve(KeywordBidTable.from_csv(str(path), cache_dir=cache), ['laptop stand']) == [2.25]
+
+
+def test_interrupted_save_leaves_no_loadable_table(tmp_path, monkeypatch):
+    KeywordBidTable.from_keywords(['laptop stand'], {'exact': [1.0]}).save(str(tmp_path))
+    loaded = KeywordBidTable.load(str(tmp_path))
+
+    saved = []
+    def failing_save(file, values):
+        if saved:
+            raise OSError("disk full")
+        saved.append(values)
+        np.lib.format.write_array(file, np.asanyarray(values))
+    monkeypatch.setattr(bids.np, 'save', failing_save)
+    with pytest.raises(OSError):
+        KeywordBidTable.from_keywords(['desk lamp', 'usb hub'], {'exact': [2.0, 3.0]}).save(str(tmp_path))
+
+    assert KeywordBidTable.load(str(tmp_path)) is None
+    # Tables already open keep reading their own, intact files
+    assert resolve(loaded, ['laptop stand']) == [1.0]
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from amazon_bulk_generator.core.bulk_index import BulkSheetIndex, normalize_keyword
+from amazon_bulk_generator.core.generator import BulkSheetGenerator
+
+KEYWORDS = ['Laptop Stand', 'usb hub', 'desk lamp']
+SKUS = ['SKU001', 'SKU002', 'SKU003']
+
+
+@pytest.fixture
+def df(sku_settings):
+    sku_settings.sku_group_size = 2
+    sku_settings.placement, sku_settings.bid_adjustment = 'top-of-search', '50%'
+    return BulkSheetGenerator().generate_bulk_sheet(KEYWORDS, SKUS, sku_settings)
+
+
+def test_summary_counts_every_entity(df):
+    index = BulkSheetIndex.from_dataframe(df)
+    assert {entity: count for entity, count in index.summary().items()} == df['Entity'].value_counts().to_dict()
+    assert index.skipped_rows == 0
+
+
+def test_hierarchy_lookups(df):
+    index = BulkSheetIndex.from_dataframe(df)
+    campaign = index.get_campaign('SKU001_SKU002_exact_laptop_stand')
+    assert campaign is not None
+    assert index.get_campaign('missing') is None
+
+    ad_groups = index.ad_groups_of(campaign)
+    assert len(ad_groups) == 1
+    assert index.keywords.iloc[index.keywords_of(ad_groups[0])]['Keyword Text'].tolist() == ['Laptop Stand']
+    assert index.product_ads.iloc[index.product_ads_of(ad_groups[0])]['SKU'].tolist() == ['SKU001', 'SKU002']
+
+    # Every match type of every SKU group has its own keyword row
+    assert len(index.find_keyword('  LAPTOP   stand ')) == 2 * 2
+    assert len(index.find_sku('SKU003')) == len(KEYWORDS) * 2
+    assert len(index.find_sku('SKU999')) == 0
+    assert normalize_keyword(' Desk  Lamp') == 'desk lamp'
+
+
+@pytest.mark.parametrize('extension', ['csv', 'xlsx'])
+def test_file_index_matches_dataframe_index(tmp_path, df, extension):
+    path = str(tmp_path / f"bulk.{extension}")
+    if extension == 'csv':
+        df.to_csv(path, index=False)
+    else:
+        df.to_excel(path, index=False, sheet_name='Sponsored Products')
+    expected = BulkSheetIndex.from_dataframe(df.fillna(''))
+    index = BulkSheetIndex.from_file(path, chunk_rows=7)
+
+    assert index.summary() == expected.summary()
+    for table in ('campaigns', 'ad_groups', 'product_ads', 'keywords', 'bidding_adjustments'):
+        pd.testing.assert_frame_equal(getattr(index, table), getattr(expected, table), check_dtype=False,
+                                      check_categorical=False)
+    assert index.campaign_names().tolist() == expected.campaign_names().tolist()
@@ -0,0 +1,69 @@
+import pytest
+
+from amazon_bulk_generator.core.diff import BulkSheetIdentityIndex, diff_bulk_sheet
+from amazon_bulk_generator.core.generator import BulkSheetGenerator
+
+KEY_COLUMNS = ['Entity', 'Campaign ID', 'Ad Group ID', 'SKU', 'Keyword Text', 'Match Type', 'Placement']
+
+
+def row_keys(df):
+    return set(map(tuple, df[KEY_COLUMNS].astype(str).values))
+
+
+@pytest.fixture(params=['dataframe', 'file'])
+def index_previous(request, tmp_path):
+    def index(df):
+        if request.param == 'dataframe':
+            return BulkSheetIdentityIndex.from_dataframe(df)
+        path = tmp_path / 'previous.csv'
+        df.to_csv(path, index=False)
+        return BulkSheetIdentityIndex.from_file(str(path))
+    return index
+
+
+def test_colliding_campaign_names_are_matched_by_id(settings, index_previous):
+    generator = BulkSheetGenerator()
+    previous = generator.generate_bulk_sheet(['laptop stand'], ['SKU001', 'SKU002'], settings)
+    current = generator.generate_bulk_sheet(['laptop stand', 'usb hub'], ['SKU001', 'SKU002', 'SKU003'], settings)
+    assert current['Campaign Name'].duplicated().any()
+
+    new_rows = diff_bulk_sheet(current, index_previous(previous))
+
+    # Every new row keeps the IDs of its own campaign, e.g. SKU003's product ads stay under SKU003_*
+    assert row_keys(new_rows) == row_keys(current) - row_keys(previous)
+    product_ads = new_rows[new_rows['Entity'] == 'Product Ad']
+    assert (product_ads['Campaign ID'].str.split('_').str[0] == product_ads['SKU']).all()
+
+
+def test_incremental_generation_with_colliding_names(settings):
+    generator = BulkSheetGenerator()
+    previous = generator.generate_bulk_sheet(['laptop stand'], ['SKU001', 'SKU002'], settings)
+    current = generator.generate_bulk_sheet(['laptop stand', 'usb hub'], ['SKU001', 'SKU002'], settings)
+
+    new_rows = generator.generate_incremental_bulk_sheet(
+        ['laptop stand', 'usb hub'], ['SKU001', 'SKU002'], settings, BulkSheetIdentityIndex.from_dataframe(previous)
+    )
+
+    assert row_keys(new_rows) == row_keys(current) - row_keys(previous)
+    assert not new_rows['Campaign ID'].str.contains('laptop_stand').any()
+
+
+def test_unique_names_attach_to_existing_ids(sku_settings, index_previous):
+    generator = BulkSheetGenerator()
+    # One campaign per SKU and match type, holding every keyword of the group
+    sku_settings.campaign_name_template = 'SP_[SKU]_match_type'
+    sku_settings.keyword_group_size = 2
+    previous = generator.generate_bulk_sheet(['laptop stand'], ['SKU001'], sku_settings)
+    # Numeric IDs, as in a bulk file downloaded after the upload
+    previous['Campaign ID'] = previous['Campaign ID'].map(
+        {'SKU001_exact_laptop_stand': '1001', 'SKU001_phrase_laptop_stand': '1002'}
+    )
+    previous['Ad Group ID'] = previous['Ad Group ID'].where(previous['Ad Group ID'].isna(), '2' + previous['Campaign ID'])
+
+    current = generator.generate_bulk_sheet(['laptop stand', 'desk lamp'], ['SKU001'], sku_settings)
+    new_rows = diff_bulk_sheet(current, index_previous(previous))
+
+    assert new_rows['Entity'].tolist() == ['Keyword', 'Keyword']
+    assert new_rows['Keyword Text'].tolist() == ['desk lamp', 'desk lamp']
+    assert new_rows['Campaign ID'].tolist() == ['1001', '1002']
+    assert new_rows['Ad Group ID'].tolist() == ['21001', '21002']
@@ -0,0 +1,78 @@
+import filecmp
+import gzip
+
+import pandas as pd
+import pytest
+
+from amazon_bulk_generator.core.generator import BulkSheetGenerator
+from amazon_bulk_generator.core.validators import REJECT_COLUMNS, validate_keywords_batch, validate_skus_batch
+from amazon_bulk_generator.utils.file_handlers import FileHandler
+from amazon_bulk_generator.utils.readers import iter_bulk_file
+
+KEYWORDS = [f"keyword {i}" for i in range(12)] + ["kid's toy, large"]
+SKUS = [f"SKU{i:03d}" for i in range(5)]
+
+
+@pytest.fixture
+def generator():
+    generator = BulkSheetGenerator(engine=BulkSheetGenerator.ENGINE_COLUMNAR)
+    generator.STREAM_BATCH_ROWS = 17
+    return generator
+
+
+@pytest.fixture
+def job_settings(settings):
+    settings.keyword_bids = {'keyword 3': 1.5}
+    settings.sku_group_size = 2
+    settings.placement, settings.bid_adjustment = 'top-of-search', '50%'
+    return settings
+
+
+@pytest.fixture
+def df(generator, job_settings):
+    return generator.generate_bulk_sheet(KEYWORDS, SKUS, job_settings)
+
+
+def read_back(path):
+    return pd.concat(iter_bulk_file(path, chunk_rows=25), ignore_index=True)
+
+
+@pytest.mark.parametrize('chunk_size', [None, 13])
+def test_streamed_csv_is_identical_to_saved_dataframe(tmp_path, generator, job_settings, df, chunk_size):
+    saved = FileHandler(str(tmp_path / 'frame')).save_bulk_sheet(df, 'csv')
+    rows = generator.iter_bulk_rows(KEYWORDS, SKUS, job_settings, chunk_size=chunk_size)
+    streamed = FileHandler(str(tmp_path / 'stream')).save_bulk_sheet_stream(rows, generator.headers, 'csv')
+    assert filecmp.cmp(saved, streamed, shallow=False)
+
+
+def test_streamed_xlsx_round_trips(tmp_path, generator, job_settings, df):
+    rows = generator.iter_bulk_rows(KEYWORDS, SKUS, job_settings, chunk_size=10)
+    path = FileHandler(str(tmp_path)).save_bulk_sheet_stream(rows, generator.headers, 'xlsx')
+    pd.testing.assert_frame_equal(read_back(path), df.fillna(''))
+    saved = FileHandler(str(tmp_path / 'frame')).save_bulk_sheet(df, 'xlsx')
+    pd.testing.assert_frame_equal(read_back(path), read_back(saved))
+
+
+@pytest.mark.parametrize('format', ['parquet', 'arrow'])
+def test_columnar_formats_round_trip(tmp_path, generator, job_settings, df, format):
+    pytest.importorskip('pyarrow')
+    columns = generator.iter_bulk_columns(KEYWORDS, SKUS, job_settings, batch_rows=20)
+    path = FileHandler(str(tmp_path)).save_bulk_sheet_stream(columns, generator.headers, format)
+    pd.testing.assert_frame_equal(read_back(path), df.fillna(''))
+
+
+def test_fanout_matches_single_format_writers(tmp_path, df):
+    paths = FileHandler(str(tmp_path / 'fanout')).save_bulk_sheet_formats(df, ['xlsx', 'csv', 'csv.gz'])
+    saved_csv = FileHandler(str(tmp_path / 'frame')).save_bulk_sheet(df, 'csv')
+    assert filecmp.cmp(paths['csv'], saved_csv, shallow=False)
+    with gzip.open(paths['csv.gz'], 'rb') as f, open(saved_csv, 'rb') as expected:
+        assert f.read() == expected.read()
+    pd.testing.assert_frame_equal(read_back(paths['xlsx']), df.fillna(''))
+
+
+def test_save_rejects(tmp_path):
+    rejects = [validate_keywords_batch(['ok', 'bad!']).rejects(), validate_skus_batch(['', 'SKU-1', 'x y']).rejects()]
+    path = FileHandler(str(tmp_path)).save_rejects(rejects)
+    saved = pd.read_csv(path, keep_default_na=False)
+    assert list(saved.columns) == REJECT_COLUMNS
+    assert saved[['Field', 'Line', 'Value']].values.tolist() == [['Keyword', 2, 'bad!'], ['SKU', 1, ''], ['SKU', 3, 'x y']]
@@ -0,0 +1,95 @@
+import itertools
+
+import pandas as pd
+import pytest
+
+from amazon_bulk_generator.core.generator import BulkSheetGenerator
+from amazon_bulk_generator.core.planner import JobLimits
+from amazon_bulk_generator.core.templates import (
+    TOKEN_MATCH_TYPE, TOKEN_SKU, TOKEN_TEXT, compile_name_template, tokenize_template
+)
+
+KEYWORDS = ['gaming keyboard', 'wireless mouse', "kid's toy", 'laptop-stand', 'usb c hub']
+SKUS = ['SKU001', 'SKU_002', 'A.B', 'X']
+
+
+@pytest.fixture(params=list(itertools.product([None, 2], [None, 3], [False, True])),
+                ids=lambda p: f"kw{p[0]}-sku{p[1]}-{'adj' if p[2] else 'noadj'}")
+def job_settings(request, settings):
+    keyword_group_size, sku_group_size, adjustment = request.param
+    settings.match_types = ['Exact', 'phrase']
+    settings.keyword_bids = {'wireless mouse': 1.234, 'usb c hub': 2}
+    settings.keyword_group_size = keyword_group_size
+    settings.sku_group_size = sku_group_size
+    settings.campaign_name_template = '[SKU]_SP_match_type_250423_[KW]'
+    settings.ad_group_name_template = 'AG_match_type_[SKU]_[Root]'
+    if adjustment:
+        settings.placement, settings.bid_adjustment = 'top-of-search', '50%'
+    return settings
+
+
+@pytest.fixture
+def expected(job_settings):
+    return BulkSheetGenerator().generate_bulk_sheet(KEYWORDS, SKUS, job_settings)
+
+
+def test_rows_engine_layout(expected, job_settings):
+    assert list(expected.columns) == BulkSheetGenerator().headers
+    assert expected['Entity'].iloc[0] == 'Campaign'
+    assert expected.loc[expected['Keyword Text'] == 'wireless mouse', 'Bid'].unique().tolist() == ['1.23']
+
+
+def test_columnar_engine_matches_rows(expected, job_settings):
+    df = BulkSheetGenerator(engine=BulkSheetGenerator.ENGINE_COLUMNAR).generate_bulk_sheet(KEYWORDS, SKUS, job_settings)
+    pd.testing.assert_frame_equal(df, expected)
+    assert df.to_csv(index=False) == expected.to_csv(index=False)
+
+
+def test_parallel_engine_matches_rows(expected, job_settings):
+    generator = BulkSheetGenerator(engine=BulkSheetGenerator.ENGINE_PARALLEL, max_workers=2)
+    generator.PARALLEL_TILE_ROWS = 7
+    pd.testing.assert_frame_equal(generator.generate_bulk_sheet(KEYWORDS, SKUS, job_settings), expected)
+
+
+def test_compact_storage_writes_the_same_csv(expected, job_settings):
+    df = BulkSheetGenerator(compact_storage=True).generate_bulk_sheet(KEYWORDS, SKUS, job_settings)
+    assert (df.dtypes == 'category').any()
+    assert df.to_csv(index=False) == expected.to_csv(index=False)
+
+
+@pytest.mark.parametrize('chunk_size', [None, 1, 7, 1000])
+def test_iter_bulk_rows_matches_dataframe(expected, job_settings, chunk_size):
+    generator = BulkSheetGenerator()
+    generator.STREAM_BATCH_ROWS = 5
+    rows = list(generator.iter_bulk_rows(KEYWORDS, SKUS, job_settings, chunk_size=chunk_size))
+    if chunk_size:
+        assert all(len(chunk) == chunk_size for chunk in rows[:-1])
+        rows = [row for chunk in rows for row in chunk]
+    assert rows == list(expected.itertuples(index=False, name=None))
+
+
+def test_iter_bulk_columns_matches_dataframe(expected, job_settings):
+    generator = BulkSheetGenerator()
+    batches = list(generator.iter_bulk_columns(KEYWORDS, SKUS, job_settings, batch_rows=10))
+    assert all(list(batch) == generator.headers for batch in batches)
+    df = pd.concat([pd.DataFrame(batch) for batch in batches], ignore_index=True)
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_split_sheets_concatenate_to_the_whole_job(expected, job_settings):
+    generator = BulkSheetGenerator(limits=JobLimits(max_rows=30))
+    sheets = list(generator.generate_bulk_sheets(KEYWORDS, SKUS, job_settings))
+    assert len(sheets) > 1
+    assert all(len(sheet) <= 30 for sheet in sheets)
+    pd.testing.assert_frame_equal(pd.concat(sheets, ignore_index=True), expected)
+
+
+def test_empty_inputs_stream_nothing(settings):
+    assert list(BulkSheetGenerator().iter_bulk_rows([], SKUS, settings)) == []
+
+
+def test_compiled_template_substitutes_every_part():
+    # The example date 250423 (DDMMYY) is rendered as the start date in the same format
+    render = compile_name_template('SP_[SKU]_match_type_250423_[KW]', '20350101')
+    assert render(sku='SKU001', match_type='exact', keyword='usb_hub', root='usb') == 'SP_SKU001_exact_010135_usb_hub'
+    assert {kind for kind, _ in tokenize_template('[SKU]_match_type')} == {TOKEN_SKU, TOKEN_MATCH_TYPE, TOKEN_TEXT}
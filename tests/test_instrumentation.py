@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pandas as pd
+
+from amazon_bulk_generator.utils.fanout import write_fanout
+from amazon_bulk_generator.utils.instrumentation import NULL_PROFILER, Profiler
+
+
+def test_nested_spans_and_total():
+    profiler = Profiler()
+    with profiler.span('outer') as outer:
+        with profiler.span('inner', rows=5):
+            time.sleep(0.01)
+        outer.record(rows=10, bytes_written=100)
+    with profiler.span('second'):
+        pass
+
+    profile = profiler.reset()
+    assert [stage.name for stage in profile.stages] == ['outer', 'inner', 'second']
+    assert profile.stage('inner').parent == 'outer'
+    assert profile.stage('outer').rows == 10
+    assert profile.total_seconds == profile.stage('outer').seconds + profile.stage('second').seconds
+    assert profile.summary().splitlines()[1].startswith('  inner:')
+    assert profiler.profile.stages == []
+
+
+def test_span_records_failures():
+    profiler = Profiler()
+    try:
+        with profiler.span('boom'):
+            raise KeyError('x')
+    except KeyError:
+        pass
+    assert profiler.profile.stage('boom').error == 'KeyError'
+
+
+def test_thread_spans_take_explicit_parent():
+    profiler = Profiler()
+    def work(parent):
+        with profiler.span('worker', parent=parent):
+            pass
+
+    with profiler.span('outer'):
+        thread = threading.Thread(target=work, args=(profiler.current_stage(),))
+        thread.start()
+        thread.join()
+    assert profiler.current_stage() is None
+    assert profiler.profile.stage('worker').parent == 'outer'
+    assert profiler.profile.total_seconds == profiler.profile.stage('outer').seconds
+
+
+def test_fanout_writer_spans_nest_under_caller(tmp_path):
+    profiler = Profiler()
+    df = pd.DataFrame({'a': ['1', '2'], 'b': ['x', None]})
+    with profiler.span('bulk_sheet'):
+        write_fanout(df, ['a', 'b'], str(tmp_path), 'out', formats=('csv', 'xlsx'), profiler=profiler)
+
+    profile = profiler.reset()
+    assert profile.stage('write.csv').parent == 'bulk_sheet'
+    assert profile.stage('write.xlsx').parent == 'bulk_sheet'
+    assert profile.stage('write.csv').rows == 2
+    assert profile.total_seconds == profile.stage('bulk_sheet').seconds
+
+
+def test_disabled_profiler_records_nothing():
+    with NULL_PROFILER.span('x') as span:
+        span.record(rows=1)
+    assert NULL_PROFILER.current_stage() is None
+    assert NULL_PROFILER.profile.stages == []
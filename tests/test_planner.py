@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from amazon_bulk_generator.core.bids import KeywordBidTable
+from amazon_bulk_generator.core.generator import BulkSheetGenerator
+from amazon_bulk_generator.core.planner import (
+    JobLimits, JobTooLargeError, check_limits, enforce_limits, plan_job, split_job
+)
+
+KEYWORDS = [f"keyword {i}" for i in range(23)]
+SKUS = [f"SKU{i:03d}" for i in range(7)]
+
+
+@pytest.fixture
+def grouped(settings):
+    settings.keyword_group_size = 4
+    settings.sku_group_size = 2
+    return settings
+
+
+def test_plan_counts_match_generated_rows(grouped):
+    plan = plan_job(KEYWORDS, SKUS, grouped)
+    df = BulkSheetGenerator().generate_bulk_sheet(KEYWORDS, SKUS, grouped)
+    assert plan.total_rows == len(df)
+    assert {entity: rows for entity, rows in plan.rows_by_entity.items() if rows} == df['Entity'].value_counts().to_dict()
+    assert plan.campaigns == plan.sku_groups * plan.keyword_groups * plan.match_types
+
+
+@pytest.mark.parametrize('max_rows', [40, 75, 100, 150, 250, 400, 1000])
+def test_parts_equal_split_job(grouped, max_rows):
+    limits = JobLimits(max_rows=max_rows)
+    plan = check_limits(plan_job(KEYWORDS, SKUS, grouped), limits)
+    parts = split_job(KEYWORDS, SKUS, grouped, limits)
+    assert plan.parts == len(parts)
+    assert plan.within_limits == (len(parts) == 1)
+
+    generator = BulkSheetGenerator()
+    frames = [generator.generate_bulk_sheet(k, s, grouped) for k, s in parts]
+    assert all(len(frame) <= max_rows for frame in frames)
+    pd.testing.assert_frame_equal(pd.concat(frames, ignore_index=True),
+                                  generator.generate_bulk_sheet(KEYWORDS, SKUS, grouped))
+
+
+def test_parts_count_whole_campaign_blocks(grouped):
+    # Each SKU group needs 12 campaigns x 4 rows (2 SKUs, 4 keywords per campaign)
+    # plus 1 campaign x 3 rows; a row-count division would allow fewer parts
+    plan = plan_job(KEYWORDS, SKUS, grouped)
+    limits = JobLimits(max_rows=plan.total_rows // 3 + 1)
+    assert check_limits(plan, limits).parts == len(split_job(KEYWORDS, SKUS, grouped, limits))
+    assert plan.parts > -(-plan.total_rows // limits.max_rows)
+
+
+def test_unsplittable_job(grouped):
+    limits = JobLimits(max_rows=10)
+    plan = check_limits(plan_job(KEYWORDS, SKUS, grouped), limits)
+    assert plan.parts == 0
+    assert "single SKU group and keyword group has 16 rows" in plan.violations[-1]
+    with pytest.raises(JobTooLargeError):
+        split_job(KEYWORDS, SKUS, grouped, limits)
+    with pytest.raises(JobTooLargeError):
+        enforce_limits(plan, limits)
+
+
+@pytest.mark.parametrize('engine', [BulkSheetGenerator.ENGINE_ROWS, BulkSheetGenerator.ENGINE_COLUMNAR])
+def test_generation_reuses_planned_bids(grouped, engine, monkeypatch):
+    grouped.keyword_bids = {KEYWORDS[0]: 2.5}
+    calls = []
+    resolve = KeywordBidTable.resolve
+    monkeypatch.setattr(KeywordBidTable, 'resolve', lambda self, *args: calls.append(args) or resolve(self, *args))
+
+    generator = BulkSheetGenerator(engine=engine, limits=JobLimits(max_rows=10 ** 6))
+    plan = generator.dry_run(KEYWORDS, SKUS, grouped)
+    df = generator.generate_bulk_sheet(KEYWORDS, SKUS, grouped, plan)
+    assert len(calls) == 1
+    assert df.loc[df['Keyword Text'] == KEYWORDS[0], 'Bid'].unique().tolist() == ['2.50']
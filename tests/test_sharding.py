@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from amazon_bulk_generator.core.bulk_index import BulkSheetIndex
+from amazon_bulk_generator.core.generator import BulkSheetGenerator
+from amazon_bulk_generator.utils.sharding import iter_campaign_blocks, write_sharded
+
+KEYWORDS = [f"keyword {i}" for i in range(6)]
+SKUS = ['SKU001', 'SKU002', 'SKU003']
+
+
+def read_shards(manifest):
+    return pd.concat([pd.read_csv(path, dtype=str, keep_default_na=False) for path in manifest.paths],
+                     ignore_index=True)
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_sharded_csv_matches_to_csv(settings, tmp_path, compact):
+    generator = BulkSheetGenerator(compact_storage=compact)
+    df = generator.generate_bulk_sheet(KEYWORDS, SKUS, settings)
+    df.to_csv(tmp_path / 'whole.csv', index=False)
+
+    manifest = write_sharded(df, generator.headers, str(tmp_path), 'bulk', max_rows=20)
+    assert len(manifest.shards) > 1
+    assert manifest.total_rows == len(df)
+    expected = pd.read_csv(tmp_path / 'whole.csv', dtype=str, keep_default_na=False)
+    pd.testing.assert_frame_equal(read_shards(manifest), expected)
+    assert 'nan' not in read_shards(manifest).to_numpy()
+
+
+def test_sharded_stream_matches_dataframe(settings, tmp_path):
+    generator = BulkSheetGenerator(engine=BulkSheetGenerator.ENGINE_COLUMNAR)
+    df = generator.generate_bulk_sheet(KEYWORDS, SKUS, settings)
+    rows = generator.iter_bulk_rows(KEYWORDS, SKUS, settings, chunk_size=7)
+    streamed = write_sharded(rows, generator.headers, str(tmp_path), 'stream', max_rows=20)
+    whole = write_sharded(df, generator.headers, str(tmp_path), 'frame', max_rows=20)
+    assert [shard.sha256 for shard in streamed.shards] == [shard.sha256 for shard in whole.shards]
+
+
+def test_campaign_blocks_start_at_campaign_rows(settings):
+    generator = BulkSheetGenerator(compact_storage=True)
+    df = generator.generate_bulk_sheet(KEYWORDS, SKUS, settings)
+    blocks = list(iter_campaign_blocks(df, generator.headers))
+    entity = generator.headers.index('Entity')
+    assert len(blocks) == (df['Entity'] == 'Campaign').sum()
+    assert all(block[0][entity] == 'Campaign' for block in blocks)
+    assert all(value is None or value == value for block in blocks for row in block for value in row)
+
+
+def test_campaign_that_cannot_fit_is_rejected(settings, tmp_path):
+    generator = BulkSheetGenerator()
+    df = generator.generate_bulk_sheet(KEYWORDS, SKUS, settings)
+    with pytest.raises(ValueError, match='cannot fit in a single shard'):
+        write_sharded(df, generator.headers, str(tmp_path), 'bulk', max_rows=3)
+
+
+def test_index_keeps_ids_as_strings(settings):
+    df = BulkSheetGenerator().generate_bulk_sheet(KEYWORDS, SKUS, settings)
+    index = BulkSheetIndex.from_dataframe(df)
+    assert index.campaigns['Campaign ID'].dtype == object
+    assert index.keywords['Ad Group ID'].dtype == object
+    assert index.keywords['Match Type'].dtype == 'category'
@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+from amazon_bulk_generator.core.bulk_index import BulkSheetIndex
+from amazon_bulk_generator.core.generator import BulkSheetGenerator
+from amazon_bulk_generator.core.updates import ad_group_bid_updates, build_update_rows, keyword_bid_updates
+
+KEYWORDS = ['laptop stand', 'usb hub']
+SKUS = ['SKU001', 'SKU002']
+
+
+@pytest.fixture
+def generator():
+    return BulkSheetGenerator()
+
+
+def build_index(generator, settings):
+    return BulkSheetIndex.from_dataframe(generator.generate_bulk_sheet(KEYWORDS, SKUS, settings))
+
+
+def test_keyword_bid_updates_skip_unchanged(generator, sku_settings):
+    index = build_index(generator, sku_settings)
+    bids = pd.DataFrame({'Keyword Text': ['Laptop  Stand', 'usb hub'], 'Match Type': ['exact', 'exact'],
+                         'Bid': [2.0, 1.0]})
+    changes = keyword_bid_updates(index, bids)
+    assert index.keywords.iloc[changes['position']]['Keyword Text'].tolist() == ['laptop stand', 'laptop stand']
+    assert changes['New Bid'].tolist() == [2.0, 2.0]
+
+    rows = build_update_rows(index, generator.headers, generator.PRODUCT, keyword_bids=bids)
+    assert rows['Operation'].unique().tolist() == ['Update']
+    assert rows['Bid'].tolist() == ['2.00', '2.00']
+
+
+def test_ad_group_bids_by_id(generator, sku_settings):
+    index = build_index(generator, sku_settings)
+    ad_group_id = index.ad_groups['Ad Group ID'].iloc[0]
+    changes = ad_group_bid_updates(index, pd.DataFrame({'Ad Group ID': [ad_group_id], 'Ad Group Default Bid': [3]}))
+    assert changes['position'].tolist() == [0]
+
+
+def test_ad_group_bids_by_name_are_scoped_to_the_campaign(generator, sku_settings):
+    df = generator.generate_bulk_sheet(KEYWORDS, SKUS, sku_settings)
+    df.loc[df['Entity'] == 'Ad Group', 'Ad Group Name'] = 'Main'  # Same ad group name in every campaign
+    index = BulkSheetIndex.from_dataframe(df)
+    campaign = index.campaigns['Campaign Name'].iloc[2]
+    bids = pd.DataFrame({'Campaign Name': [campaign], 'Ad Group Name': ['Main'], 'Ad Group Default Bid': [3]})
+    assert ad_group_bid_updates(index, bids)['position'].tolist() == [2]
+
+
+def test_ambiguous_ad_group_names_are_rejected(generator, settings):
+    # The default templates repeat campaign and ad group names across SKUs
+    index = build_index(generator, settings)
+    bids = pd.DataFrame({'Campaign Name': [index.campaigns['Campaign Name'].iloc[0]],
+                         'Ad Group Name': [index.ad_groups['Ad Group Name'].iloc[0]],
+                         'Ad Group Default Bid': [3]})
+    with pytest.raises(ValueError, match="match several ad groups"):
+        ad_group_bid_updates(index, bids)
+
+
+@pytest.mark.parametrize('columns, message', [
+    (['Ad Group Name', 'Ad Group Default Bid'], "'Campaign Name' and 'Ad Group Name'"),
+    (['Ad Group Default Bid'], "'Ad Group ID'"),
+    (['Ad Group ID'], "'Ad Group Default Bid'")
+])
+def test_ad_group_bids_need_key_columns(generator, sku_settings, columns, message):
+    index = build_index(generator, sku_settings)
+    with pytest.raises(ValueError, match=message):
+        ad_group_bid_updates(index, pd.DataFrame({column: ['x'] for column in columns}))
+
+
+def test_keyword_bids_need_text_and_bid(generator, sku_settings):
+    index = build_index(generator, sku_settings)
+    with pytest.raises(ValueError, match="'Bid'"):
+        keyword_bid_updates(index, pd.DataFrame({'Keyword Text': ['usb hub']}))
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from amazon_bulk_generator.core.validation_cache import (
+    IncrementalValidator, ValidationCache, content_hash, list_content_hash
+)
+from amazon_bulk_generator.core.validators import validate_keywords_batch, validate_skus_batch
+
+POOL = ['ok', 'bad!', '', ' ', 'x' * 81, 'a-b', "it's", 'é', 'ß!', 'x\n', 'SKU-1', 'a b']
+
+
+def assert_same_report(report, expected):
+    assert (report.list_error, report.total, report.field_name) == (expected.list_error, expected.total,
+                                                                    expected.field_name)
+    assert report.invalid_indexes.tolist() == expected.invalid_indexes.tolist()
+    assert report.reason_codes.tolist() == expected.reason_codes.tolist()
+    assert report.invalid_values == expected.invalid_values
+    assert report.errors() == expected.errors()
+
+
+@pytest.mark.parametrize('kind, batch', [('keywords', validate_keywords_batch), ('skus', validate_skus_batch)])
+def test_incremental_matches_full_validation(kind, batch):
+    rng = random.Random(1)
+    validator, items = IncrementalValidator(kind), []
+    for _ in range(300):
+        operation = rng.random()
+        if operation < 0.4 or not items:
+            items.insert(rng.randrange(len(items) + 1), rng.choice(POOL) + rng.choice(['', '1', '2']))
+        elif operation < 0.7:
+            items[rng.randrange(len(items))] = rng.choice(POOL)
+        elif operation < 0.9:
+            del items[rng.randrange(len(items))]
+        elif rng.random() < 0.3:
+            items = []
+        assert_same_report(validator.update(items), batch(items))
+
+
+def test_incremental_validates_only_edited_lines():
+    items = [f"keyword {i}" for i in range(1000)]
+    validator = IncrementalValidator('keywords')
+    validator.update(items)
+    assert validator.last_validated == 1000
+
+    items[500] = 'edited bad!'
+    report = validator.update(items)
+    assert validator.last_validated == 1
+    assert report.invalid_indexes.tolist() == [500]
+
+    del items[10:20]
+    assert validator.update(items).invalid_indexes.tolist() == [490]
+    assert validator.last_validated == 0
+    validator.update(items)
+    assert validator.last_validated == 0
+
+    validator.reset()
+    validator.update(items)
+    assert validator.last_validated == len(items)
+
+
+def test_incremental_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        IncrementalValidator('campaigns')
+
+
+def test_cache_hits_misses_and_evictions():
+    cache = ValidationCache(max_entries=2)
+    first = cache.validate_keywords(['a', 'b!'])
+    assert cache.validate_keywords(['a', 'b!']) is first
+    cache.validate_skus(['SKU-1'])
+    cache.validate_keywords(['c'])  # Evicts the SKU list, the least recently used entry
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (1, 3, 1, 2)
+    assert stats.hit_rate == 0.25
+
+    cache.clear()
+    assert cache.stats().entries == 0
+
+
+def test_cached_reports_are_read_only_and_lists_are_copies():
+    cache = ValidationCache()
+    report = cache.validate_skus(['x y'])
+    with pytest.raises(ValueError):
+        report.invalid_indexes[0] = 1
+
+    items = cache.clean_text_input("a\nb\n")
+    items.append('c')
+    assert cache.clean_text_input("a\nb\n") == ['a', 'b']
+
+
+def test_content_hashes_keep_item_boundaries():
+    assert list_content_hash(['ab', 'c']) != list_content_hash(['a', 'bc'])
+    assert content_hash('a') == content_hash('a') != content_hash('b')
+    with pytest.raises(ValueError):
+        ValidationCache(max_entries=0)
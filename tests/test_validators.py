@@ -0,0 +1,82 @@
+import random
+import re
+
+import numpy as np
+import pytest
+
+from amazon_bulk_generator.core import validators
+from amazon_bulk_generator.core.validators import (
+    KEYWORD_PATTERN, MAX_KEYWORD_LENGTH, MAX_SKU_LENGTH, SKU_PATTERN,
+    validate_keywords, validate_keywords_batch, validate_name_template, validate_skus, validate_skus_batch
+)
+
+POOL = ['ok', 'bad!', '', ' ', 'x' * 81, 'y' * 41, 'a-b', "it's", 'é', 'ß!', 'x\n', '\n', 'SKU-1', 'a b',
+        'SKU.1,2', 'a/b', '𝔘nicode', 'tab\there']
+
+
+def reference(items, max_length, pattern):
+    """Per-item rules of the scalar validators: (index, reason) of every failing item"""
+    failures = []
+    for i, item in enumerate(items):
+        if not item.strip():
+            failures.append((i, validators.REASON_EMPTY))
+        elif len(item) > max_length:
+            failures.append((i, validators.REASON_TOO_LONG))
+        elif not re.match(pattern, item):
+            failures.append((i, validators.REASON_INVALID_CHARS))
+    return failures
+
+
+@pytest.mark.parametrize('batch, max_length, pattern', [
+    (validate_keywords_batch, MAX_KEYWORD_LENGTH, KEYWORD_PATTERN),
+    (validate_skus_batch, MAX_SKU_LENGTH, SKU_PATTERN)
+])
+def test_batch_matches_per_item_rules(batch, max_length, pattern):
+    rng = random.Random(7)
+    for _ in range(50):
+        items = [rng.choice(POOL) + rng.choice(['', '1', ' 2']) for _ in range(rng.randrange(1, 30))]
+        report = batch(items)
+        expected = reference(items, max_length, pattern)
+        assert list(zip(report.invalid_indexes.tolist(), report.reason_codes.tolist())) == expected
+        assert report.invalid_values == [items[i] for i, _ in expected]
+
+
+def test_scalar_validators_report_the_first_error():
+    assert validate_keywords(['good', 'bad!', '']) == (False, "Invalid characters in Keyword: bad!")
+    assert validate_skus(['SKU-1', 'x' * 41])[0] is False
+    assert validate_keywords([]) == (False, validate_keywords_batch([]).list_error)
+    assert validate_skus(['SKU-1']) == (True, None)
+
+
+def test_report_partition_and_rejects():
+    items = ['ok', 'bad!', 'fine', '']
+    report = validate_keywords_batch(items)
+    assert report.partition(items) == ['ok', 'fine']
+    assert report.valid_mask().tolist() == [True, False, True, False]
+    assert report.rejects()['Line'] == [2, 4]
+    assert report.counts() == {validators.REASON_NAMES[validators.REASON_EMPTY]: 1,
+                               validators.REASON_NAMES[validators.REASON_INVALID_CHARS]: 1}
+    assert [index for index, _ in report.errors(limit=1)] == [1]
+
+
+def test_batch_accepts_non_strings():
+    report = validate_skus_batch(['SKU-1', None, np.nan, 123])
+    assert report.invalid_indexes.tolist() == [1, 2]
+
+
+@pytest.mark.parametrize('template, template_type, valid', [
+    ('SP_[SKU]_match_type_250423', 'campaign', True),
+    ('SP_[SKU]_match_type_[KW]_[Root]', 'campaign', True),
+    ('AG_[SKU]_match_type', 'ad group', True),
+    ('AG_[SKU]_match_type_[KW]', 'ad group', True),
+    ('AG_[SKU]_match_type_a.b', 'ad group', False),
+    ('SP_[SKU]', 'campaign', False),
+    ('SP_[SKU]_match_type_bad!', 'campaign', False),
+    ('', 'campaign', False),
+    ('SP_[SKU]_match_type_' + 'x' * 120, 'campaign', False)
+])
+def test_validate_name_template(template, template_type, valid):
+    validate_name_template.cache_clear()
+    first = validate_name_template(template, template_type)
+    assert first[0] is valid
+    assert validate_name_template(template, template_type) == first  # Served from the cache
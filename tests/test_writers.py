@@ -0,0 +1,20 @@
+import openpyxl
+
+from amazon_bulk_generator.utils.writers import XlsxBulkWriter
+
+
+def column_widths(path):
+    worksheet = openpyxl.load_workbook(path).active
+    # xlsxwriter stores the width plus a fixed cell padding
+    return [int(worksheet.column_dimensions[letter].width) for letter in 'ABC']
+
+
+def test_xlsx_widths_measure_written_values(tmp_path):
+    path = str(tmp_path / 'out.xlsx')
+    with XlsxBulkWriter(path, ['Bid', 'x', 'y']) as writer:
+        # 1.5 is written as '1.50'; a zero counts as a value, None does not
+        writer.write_rows([(1.5, 0.0, None), (None, '', None)])
+
+    worksheet = openpyxl.load_workbook(path).active
+    assert [cell.value for cell in worksheet[2]] == ['1.50', 0, None]
+    assert column_widths(path) == [len('1.50') + 2, len('0.0') + 2, len('y') + 2]